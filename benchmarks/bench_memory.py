@@ -0,0 +1,100 @@
+"""
+VideoProps 테이블의 행당 메모리 사용량 비교 벤치마크
+- before: __dict__를 가진 일반 dataclass, 행마다 ClosetRatio/코덱 문자열을 따로 생성 (이전 구현)
+- after: 현재 VideoProps (__slots__, ClosetRatio 공유, 코덱/폴더 이름 문자열 intern)
+
+실행 (저장소 루트에서): python -m benchmarks.bench_memory [행 수]
+"""
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+from src.utils.ratio import ClosetRatio, get_closet_ratio
+from src.utils.video_prop import VideoProps
+
+_RESOLUTIONS = [(1920, 1080), (1280, 720), (720, 1280), (3840, 2160), (854, 480), (640, 480), (1080, 1080)]
+_CODECS = ["h264", "hevc", "vp9", "av1"]
+_DIRNAMES = [None, "16-9", "rev 16-9", "_비트레이트 최적화", "_키프레임조정"]
+
+
+@dataclass
+class LegacyClosetRatio:
+    type: str
+    value: float
+    real_value: float
+    diff: float
+
+
+@dataclass
+class LegacyVideoProps:
+    filename: str
+    width: int
+    height: int
+    rotate_type: int
+    fps: float
+    vid_kbps: int
+    aud_kbps: int
+    vid_size_MB: float
+    duration: float
+    codec: str
+    ratio: LegacyClosetRatio
+    keyframe_interval: Optional[float] = None
+    moved_dirname: Optional[str] = None
+
+
+def _fresh(s: Optional[str]) -> Optional[str]:
+    """
+    ffprobe json 파싱 결과처럼 값은 같지만 서로 다른 문자열 객체 생성
+    """
+    return None if s is None else "".join(list(s))
+
+
+def _legacy_row(i: int, rng: random.Random) -> LegacyVideoProps:
+    width, height = rng.choice(_RESOLUTIONS)
+    ratio: ClosetRatio = get_closet_ratio(width / height)
+    return LegacyVideoProps(
+        filename=f"video_{i:07d}.mp4", width=width, height=height, rotate_type=0, fps=30.0,
+        vid_kbps=rng.randint(500, 8000), aud_kbps=128, vid_size_MB=rng.uniform(10, 2000), duration=rng.uniform(10, 7200),
+        codec=_fresh(rng.choice(_CODECS)) or "",
+        ratio=LegacyClosetRatio(_fresh(ratio.type) or "", ratio.value, ratio.real_value, ratio.diff),
+        keyframe_interval=rng.choice([None, 1.0, 2.0, 4.0]), moved_dirname=_fresh(rng.choice(_DIRNAMES))
+    )
+
+
+def _current_row(i: int, rng: random.Random) -> VideoProps:
+    width, height = rng.choice(_RESOLUTIONS)
+    return VideoProps(
+        filename=f"video_{i:07d}.mp4", width=width, height=height, rotate_type=0, fps=30.0,
+        vid_kbps=rng.randint(500, 8000), aud_kbps=128, vid_size_MB=rng.uniform(10, 2000), duration=rng.uniform(10, 7200),
+        codec=_fresh(rng.choice(_CODECS)) or "",
+        ratio=get_closet_ratio(width / height),
+        keyframe_interval=rng.choice([None, 1.0, 2.0, 4.0]), moved_dirname=_fresh(rng.choice(_DIRNAMES))
+    )
+
+
+def measure(make_row: Callable[[int, random.Random], Any], rows: int) -> float:
+    """
+    rows개 행을 만들 때 늘어난 메모리를 행당 바이트로 리턴
+    """
+    rng: random.Random = random.Random(0)
+    tracemalloc.start()
+    table: List[Any] = [make_row(i, rng) for i in range(rows)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return current / rows
+
+
+def main() -> None:
+    rows: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    before: float = measure(_legacy_row, rows)
+    after: float = measure(_current_row, rows)
+    print(f"행 수: {rows}")
+    print(f"before (dataclass + 행별 ClosetRatio): {before:8.1f} bytes/row")
+    print(f"after  (slots + 공유 ClosetRatio)    : {after:8.1f} bytes/row")
+    print(f"절감률: {(1 - after / before) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+분석/분류 파이프라인 단계별 벤치마크
+- benchmarks.corpus로 만든 합성 비디오 목록을 여러 크기/워커 수 조합으로 측정
+- 조합마다 새 프로세스에서 실행하므로 프로세스 풀, 캐시, 최대 메모리 사용량(peak RSS)이 서로 섞이지 않음
+- 단계: scan(get_video_prop_table), keyframe(include_keyframe_at), classify_pseudo, print, classify_move, unclassify
+- 결과는 JSON으로 저장하고, --compare로 이전 결과와 단계별 files/sec 비교
+- 조합마다 세부 단계 시간과 느린 파일 목록(src.utils.metrics 측정 결과)도 함께 저장
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_pipeline --sizes 20,60 --workers 1,4 --keyframe
+    python -m benchmarks.bench_pipeline --compare benchmarks/results/pipeline-20250101-000000.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_RESULT_DIR: str = os.path.join(os.path.dirname(__file__), "results")
+_DEFAULT_CORPUS_DIR: str = os.path.join(os.path.dirname(__file__), ".corpus")
+
+
+def _peak_rss_kb() -> Tuple[int, int]:
+    """
+    (현재 프로세스, 종료된 자식 프로세스 중 최대) peak RSS (KB)
+    resource 모듈이 없는 환경(Windows)은 psutil의 peak working set 사용
+    """
+    try:
+        import resource
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) // 1024, 0
+
+    unit: int = 1 if sys.platform.startswith("linux") else 1024 # macOS는 byte 단위
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // unit,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // unit)
+
+
+def run_stages(root_dir: str, keyframe: bool) -> List[Dict[str, Any]]:
+    """
+    root_dir에서 파이프라인 단계를 순서대로 실행하고 단계별 측정값 리턴 (분석 출력은 버림)
+    """
+    import contextlib
+    from src.video_classify import VideoClassifier, Pred
+
+    file_count: int = len([e for e in os.listdir(root_dir) if os.path.isfile(os.path.join(root_dir, e))])
+    results: List[Dict[str, Any]] = []
+    classifier: VideoClassifier = VideoClassifier(root_dir)
+
+    def stage(name: str, fn: Callable[[], None]) -> None:
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            start: float = time.perf_counter()
+            fn()
+            seconds: float = time.perf_counter() - start
+        peak_self, peak_children = _peak_rss_kb()
+        results.append({
+            "stage": name,
+            "seconds": seconds,
+            "files_per_sec": file_count / seconds if seconds > 0 else None,
+            "peak_rss_kb": peak_self,
+            "peak_children_rss_kb": peak_children
+        })
+
+    def enable_keyframe() -> None:
+        classifier.include_keyframe_interval()
+        classifier.print(by=Pred.RATIO, sanitize_emoji=False, summary_only=True)
+
+    def pseudo_classify() -> None:
+        classifier.pseudo_classify_mode()
+        classifier.classify(by=Pred.RATIO)
+
+    def move_classify() -> None:
+        classifier.pseudo_classify_mode(False)
+        classifier.classify(by=Pred.RATIO)
+
+    try:
+        stage("scan", lambda: classifier.print(by=Pred.RATIO, sanitize_emoji=False, summary_only=True))
+        if keyframe: stage("keyframe", enable_keyframe)
+        stage("classify_pseudo", pseudo_classify)
+        stage("print", lambda: classifier.print(by=Pred.ALL, sanitize_emoji=True))
+        classifier.unclassify_files(unmark_pseudo_classified_only=True)
+        stage("classify_move", move_classify)
+        stage("unclassify", lambda: classifier.unclassify_files())
+    finally:
+        classifier.close()
+    return results
+
+
+def _run_child(run_dir: str, workers: int, keyframe: bool) -> Dict[str, Any]:
+    """
+    새 프로세스에서 run_stages 실행 (워커 수는 WORKER_POOL_SIZE, PROBE_CONCURRENCY로 지정)
+    {"stages": 단계별 측정값, "metrics": 세부 단계/파일별 측정값} 리턴
+    """
+    env: Dict[str, str] = {
+        **os.environ,
+        "WORKER_POOL_SIZE": str(workers),
+        "PROBE_CONCURRENCY": str(workers),
+        "PROBE_CACHE_ENABLED": "0", # 디스크 캐시 없이 매번 분석
+        "METRICS_ENABLED": "1"
+    }
+    cmd: List[str] = [sys.executable, "-m", "benchmarks.bench_pipeline", "--child", run_dir] + (["--keyframe"] if keyframe else [])
+    proc: subprocess.CompletedProcess = subprocess.run(cmd, env=env, capture_output=True, text=True, encoding="utf-8",
+                                                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if proc.returncode != 0:
+        raise RuntimeError(f"벤치마크 실행 실패 (size 경로: {run_dir}, workers: {workers}):\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _environment() -> Dict[str, Any]:
+    """
+    결과 비교 시 참고할 실행 환경 정보
+    """
+    import platform
+    import shutil
+
+    def command_output(cmd: List[str]) -> Optional[str]:
+        try: return subprocess.run(cmd, capture_output=True, text=True, check=True).stdout.strip().splitlines()[0]
+        except (OSError, subprocess.CalledProcessError, IndexError): return None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": command_output(["git", "rev-parse", "--short", "HEAD"]),
+        "ffmpeg": command_output([shutil.which("ffmpeg") or "ffmpeg", "-version"]),
+        "ffprobe": command_output([shutil.which("ffprobe") or "ffprobe", "-version"])
+    }
+
+
+def _print_summary(runs: List[Dict[str, Any]], baseline: Optional[Dict[str, Any]]) -> None:
+    """
+    측정 결과 표 출력 (baseline이 있으면 같은 크기/워커 수/단계의 files/sec 비율도 출력)
+    """
+    previous: Dict[Tuple[int, int, str], float] = {}
+    if baseline:
+        for run in baseline["runs"]:
+            for s in run["stages"]:
+                if s["files_per_sec"]: previous[(run["size"], run["workers"], s["stage"])] = s["files_per_sec"]
+
+    print(f"{'size':>6} {'workers':>7} {'stage':<16} {'seconds':>9} {'files/s':>9} {'peak RSS(MB)':>12}" + (f" {'vs base':>8}" if baseline else ""))
+    for run in runs:
+        for s in run["stages"]:
+            line: str = (f"{run['size']:>6} {run['workers']:>7} {s['stage']:<16} {s['seconds']:>9.3f} "
+                         f"{s['files_per_sec'] or 0:>9.1f} {s['peak_rss_kb'] / 1024:>12.1f}")
+            if baseline:
+                base: Optional[float] = previous.get((run["size"], run["workers"], s["stage"]))
+                line += f" {s['files_per_sec'] / base:>7.2f}x" if base and s["files_per_sec"] else f" {'-':>8}"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="분석/분류 파이프라인 단계별 벤치마크")
+    parser.add_argument("--corpus", default=_DEFAULT_CORPUS_DIR, help="합성 비디오 목록 경로 (없으면 생성)")
+    parser.add_argument("--sizes", default="20,60", help="측정할 파일 수 목록 (쉼표 구분)")
+    parser.add_argument("--workers", default="1,4", help="측정할 워커 수 목록 (쉼표 구분)")
+    parser.add_argument("--keyframe", action="store_true", help="키프레임 분석 단계 포함")
+    parser.add_argument("--seed", type=int, default=0, help="목록 생성 seed")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/pipeline-<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS) # 내부용: 지정한 경로에서 단계 실행
+    args = parser.parse_args()
+
+    if args.child:
+        from src.utils.metrics import metrics
+        stages: List[Dict[str, Any]] = run_stages(args.child, args.keyframe)
+        print(json.dumps({"stages": stages, "metrics": metrics.to_json()}, ensure_ascii=False))
+        return
+
+    import tempfile
+    from benchmarks.corpus import CorpusEntry, CorpusOptions, build_corpus, link_subset
+
+    sizes: List[int] = sorted(int(s) for s in args.sizes.split(","))
+    workers_list: List[int] = [int(w) for w in args.workers.split(",")]
+    entries: List[CorpusEntry] = build_corpus(args.corpus, CorpusOptions(count=max(sizes), seed=args.seed))
+
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="video_scripts_bench_") as tmp_dir:
+        for size in sizes:
+            for workers in workers_list:
+                run_dir: str = os.path.join(tmp_dir, f"size{size}_workers{workers}")
+                link_subset(args.corpus, entries[:size], run_dir)
+                print(f"[INFO] 측정 중: 파일 {size}개, 워커 {workers}개")
+                runs.append({"size": size, "workers": workers, **_run_child(run_dir, workers, args.keyframe)})
+
+    result: Dict[str, Any] = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": _environment(),
+        "corpus": {"seed": args.seed, "keyframe": args.keyframe},
+        "runs": runs
+    }
+    output: str = args.output or os.path.join(_RESULT_DIR, f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f: baseline = json.load(f)
+    _print_summary(runs, baseline)
+    print(f"[INFO] 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+벤치마크용 합성 비디오 목록 생성기 (로컬 ffmpeg의 lavfi 테스트 소스 사용)
+- ratio_map의 모든 비율 유형, 회전 메타데이터, 비트레이트, GOP 길이, 컨테이너를 골고루 섞어서 생성
+- 같은 seed/옵션이면 같은 목록을 생성하며, 이미 생성된 파일은 다시 만들지 않음
+
+실행 (저장소 루트에서): python -m benchmarks.corpus <생성 경로> [파일 수]
+"""
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+from src.utils.ratio import ratio_map
+
+MANIFEST_FILENAME: str = "corpus.json"
+
+_ROTATIONS: Tuple[int, ...] = (0, 0, 90, 180, 270) # 회전 없는 파일이 더 많도록 0을 중복
+_BITRATES_KBPS: Tuple[int, ...] = (300, 800, 1500, 3000, 6000)
+_GOP_FRAMES: Tuple[int, ...] = (15, 30, 60, 120, 250)
+_CONTAINERS: Tuple[Tuple[str, str, Optional[str]], ...] = ( # (확장자, 비디오 코덱, 오디오 코덱)
+    (".mp4", "libx264", "aac"),
+    (".mkv", "libx264", "aac"),
+    (".mov", "libx264", "aac"),
+    (".ts", "libx264", "aac"),
+    (".webm", "libvpx-vp9", None),
+    (".avi", "mpeg4", None)
+)
+_ROTATABLE: Tuple[str, ...] = (".mp4", ".mkv", ".mov") # 회전 메타데이터(display matrix)를 저장할 수 있는 컨테이너
+
+
+@dataclass(frozen=True)
+class CorpusEntry:
+    """
+    생성할 비디오 한 개의 조건
+    """
+    filename: str
+    ratio_type: str
+    width: int
+    height: int
+    rotation: int
+    bitrate_kbps: int
+    gop: int
+    container: str
+    video_codec: str
+    audio_codec: Optional[str]
+
+
+@dataclass(frozen=True)
+class CorpusOptions:
+    """
+    목록 전체의 생성 조건 (값이 같으면 같은 목록 생성)
+    """
+    count: int = 60
+    seed: int = 0
+    scale: float = 0.25 # ratio_map 근사 해상도 대비 배율 (생성 시간 단축용)
+    duration: float = 2.0 # 초
+    fps: int = 30
+
+
+def plan_corpus(options: CorpusOptions) -> List[CorpusEntry]:
+    """
+    생성할 비디오 목록 계획 (비율 유형은 순서대로 돌아가며 모두 포함, 나머지 조건은 seed 기반 무작위)
+    """
+    rng: random.Random = random.Random(options.seed)
+    ratio_types: List[str] = list(ratio_map)
+    entries: List[CorpusEntry] = []
+    for i in range(options.count):
+        ratio_type: str = ratio_types[i % len(ratio_types)]
+        approx_width, approx_height = ratio_map[ratio_type]["approx_resolution"]
+        container, video_codec, audio_codec = rng.choice(_CONTAINERS)
+        rotation: int = rng.choice(_ROTATIONS) if container in _ROTATABLE else 0
+        entries.append(CorpusEntry(
+            filename=f"bench_{i:05d}_{ratio_type}{container}",
+            ratio_type=ratio_type,
+            width=max(2, int(approx_width * options.scale) // 2 * 2), # 인코더 제약으로 짝수로 맞춤
+            height=max(2, int(approx_height * options.scale) // 2 * 2),
+            rotation=rotation,
+            bitrate_kbps=rng.choice(_BITRATES_KBPS),
+            gop=rng.choice(_GOP_FRAMES),
+            container=container,
+            video_codec=video_codec,
+            audio_codec=audio_codec
+        ))
+    return entries
+
+
+def _encode(entry: CorpusEntry, options: CorpusOptions, dest_path: str) -> None:
+    """
+    lavfi 테스트 소스로 비디오 한 개 생성 (회전이 있으면 스트림 복사로 회전 메타데이터를 추가)
+    """
+    ffmpeg: str = shutil.which("ffmpeg") or "ffmpeg"
+    encoded_path: str = dest_path + ".encoding" + entry.container
+    cmd: List[str] = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size={entry.width}x{entry.height}:rate={options.fps}:duration={options.duration}"
+    ]
+    if entry.audio_codec:
+        cmd += ["-f", "lavfi", "-i", f"sine=frequency=440:duration={options.duration}", "-c:a", entry.audio_codec, "-b:a", "96k"]
+    cmd += [
+        "-c:v", entry.video_codec, "-b:v", f"{entry.bitrate_kbps}k", "-g", str(entry.gop), "-pix_fmt", "yuv420p",
+        "-threads", "1", "-fflags", "+bitexact", "-map_metadata", "-1", encoded_path
+    ]
+    subprocess.run(cmd, check=True)
+
+    if entry.rotation:
+        subprocess.run([
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+            "-display_rotation", str(entry.rotation), "-i", encoded_path, "-c", "copy", "-map", "0", dest_path
+        ], check=True)
+        os.remove(encoded_path)
+    else:
+        os.replace(encoded_path, dest_path)
+
+
+def build_corpus(dest_dir: str, options: CorpusOptions = CorpusOptions()) -> List[CorpusEntry]:
+    """
+    dest_dir에 비디오 목록을 생성하고 조건을 corpus.json에 기록
+    조건이 같은 목록이 이미 있으면 없는 파일만 생성
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if shutil.which("ffmpeg") is None:
+        raise FileNotFoundError("ffmpeg를 찾을 수 없습니다. 벤치마크 목록 생성에는 로컬 ffmpeg가 필요합니다.")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    manifest_path: str = os.path.join(dest_dir, MANIFEST_FILENAME)
+    entries: List[CorpusEntry] = plan_corpus(options)
+
+    # 조건이 다른 이전 목록은 삭제 후 다시 생성 (파일 수만 다르면 앞쪽 목록이 같으므로 재사용)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous: dict = json.load(f).get("options", {})
+            if {**previous, "count": options.count} != asdict(options):
+                for entry in os.listdir(dest_dir):
+                    if entry.startswith("bench_"): os.remove(os.path.join(dest_dir, entry))
+
+    missing: List[CorpusEntry] = [e for e in entries if not os.path.exists(os.path.join(dest_dir, e.filename))]
+    if missing:
+        print(f"[INFO] 벤치마크용 비디오 {len(missing)}개를 생성합니다. ({dest_dir})")
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as exe:
+            list(exe.map(lambda e: _encode(e, options, os.path.join(dest_dir, e.filename)), missing))
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"options": asdict(options), "entries": [asdict(e) for e in entries]}, f, ensure_ascii=False, indent=2)
+    return entries
+
+
+def link_subset(corpus_dir: str, entries: List[CorpusEntry], dest_dir: str) -> None:
+    """
+    목록의 앞쪽 entries를 dest_dir에 하드 링크로 구성 (하드 링크를 쓸 수 없으면 복사)
+    분류 벤치마크가 파일을 옮기더라도 원본 목록은 유지됨
+    """
+    if os.path.exists(dest_dir): shutil.rmtree(dest_dir)
+    os.makedirs(dest_dir)
+    for entry in entries:
+        src: str = os.path.join(corpus_dir, entry.filename)
+        dst: str = os.path.join(dest_dir, entry.filename)
+        try: os.link(src, dst)
+        except OSError: shutil.copy2(src, dst)
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("사용법: python -m benchmarks.corpus <생성 경로> [파일 수]")
+        sys.exit(1)
+    options: CorpusOptions = CorpusOptions(count=int(sys.argv[2])) if len(sys.argv) > 2 else CorpusOptions()
+    entries: List[CorpusEntry] = build_corpus(sys.argv[1], options)
+    print(f"[INFO] 벤치마크용 비디오 {len(entries)}개 준비 완료: {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
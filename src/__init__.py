@@ -1 +1,9 @@
-from src.video_classify import video_classifier
\ No newline at end of file
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # src.video_classifier는 처음 사용할 때 불러옴 (패키지 import만으로 numpy 등을 불러오지 않도록)
+    if name == "video_classifier":
+        from src.video_classify import video_classifier
+        return video_classifier
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,269 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, TYPE_CHECKING
+from src.utils.video_prop import VideoProps
+from src.utils.worker_pool import get_worker_pool
+from src.utils.metrics import FileSample, file_sample, metrics, timed_step
+
+if TYPE_CHECKING:
+    from src.utils.bitrate_probe import SamplingPlan
+    from src.utils.keyframe_probe import GopStats
+
+T = TypeVar("T")
+
+
+def probe_concurrency() -> int:
+    """
+    동시에 실행할 ffprobe 프로세스 수 (PROBE_CONCURRENCY, 0이면 CPU 수 * 2)
+    """
+    from src.utils.load_env import load_env
+    return int(load_env("PROBE_CONCURRENCY")) or (os.cpu_count() or 1) * 2
+
+
+def run_coroutine(coro: Awaitable[T]) -> T:
+    """
+    코루틴을 끝까지 실행하고 결과 리턴
+    Jupyter처럼 이미 이벤트 루프가 돌고 있는 경우 별도 스레드의 새 루프에서 실행
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro) # type: ignore[arg-type]
+
+    with ThreadPoolExecutor(max_workers=1) as exe:
+        return exe.submit(asyncio.run, coro).result() # type: ignore[arg-type]
+
+
+async def _ffprobe_json(filepath: str, sample: Optional[FileSample] = None) -> Dict[str, Any]:
+    """
+    ffprobe를 직접 실행해 format/streams 정보를 json으로 읽음 (ffmpeg.probe와 같은 결과)
+    sample이 주어지면 ffprobe 실행 시간과 json 해석 시간, 출력 크기를 따로 기록
+    """
+    import json
+    import ffmpeg
+
+    with timed_step(sample, "ffprobe"):
+        proc: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+            "ffprobe", "-show_format", "-show_streams", "-of", "json", filepath,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        out, err = await proc.communicate()
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffprobe", out, err)
+    with timed_step(sample, "json_parse"):
+        probe: Dict[str, Any] = json.loads(out.decode("utf-8"))
+    if sample is not None: sample.output_bytes += len(out)
+    return probe
+
+
+async def _sample_bitrate(filepath: str, plan: "SamplingPlan") -> Tuple[Optional[int], Optional[int]]:
+    """
+    bitrate_probe.sample_bitrate의 asyncio 버전
+    계획된 구간의 패킷 크기를 한 줄씩 읽다가 읽기 예산을 넘으면 ffprobe 종료
+    """
+    from src.utils.bitrate_probe import BitrateCollector, bitrate_probe_args
+
+    collector: BitrateCollector = BitrateCollector(plan)
+    proc: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+        *bitrate_probe_args(filepath, plan),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        assert proc.stdout is not None
+        while line := await proc.stdout.readline():
+            if collector.feed(line.decode("utf-8", errors="replace")): break
+    finally:
+        if proc.returncode is None: proc.kill()
+        await proc.wait()
+
+    return collector.result()
+
+
+async def _profile_gop(filepath: str, windows: Sequence[Tuple[float, float]], budget_bytes: int, timeout: float) -> "GopStats":
+    """
+    keyframe_probe.profile_gop의 asyncio 버전
+    ffprobe 한 번으로 모든 구간의 패킷 출력을 한 줄씩 읽다가 읽기 예산이나 timeout(초)을 넘기면 ffprobe 종료
+    """
+    from src.utils.keyframe_probe import GopProfiler, gop_probe_args
+
+    profiler: GopProfiler = GopProfiler(windows, budget_bytes)
+    if not windows: return profiler.result()
+    proc: asyncio.subprocess.Process = await asyncio.create_subprocess_exec(
+        *gop_probe_args(filepath, windows),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+
+    async def consume() -> None:
+        assert proc.stdout is not None
+        while line := await proc.stdout.readline():
+            if profiler.feed(line.decode("utf-8", errors="replace")): return
+
+    try:
+        await asyncio.wait_for(consume(), timeout)
+    except asyncio.TimeoutError:
+        profiler.stop() # 시간 예산을 넘겨 중간에 멈춘 구간은 판정하지 않음
+    finally:
+        if proc.returncode is None: proc.kill()
+        await proc.wait()
+
+    return profiler.result()
+
+
+async def _gop_stats(filepath: str, duration: float, sample: Optional[FileSample] = None) -> "GopStats":
+    """
+    video_prop._get_gop_stats와 같은 순서로 키프레임 간격 통계를 구함
+    (짧은 영상 → 컨테이너 인덱스 → ffprobe 구간별 패킷 스트리밍)
+    CPU를 쓰는 컨테이너 인덱스 해석은 공유 프로세스 풀에서 실행
+    sample이 주어지면 분석 방식과 세부 단계 시간을 기록
+    """
+    from src.utils.load_env import Config, config
+    from src.utils.container_probe import native_gop_stats
+    from src.utils.keyframe_probe import KEYFRAME_LIMITS, GopStats, profile_windows
+    from src.utils.video_prop import _get_gop_stats
+
+    cfg: Config = config()
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    if duration < KEYFRAME_LIMITS[0]:
+        if sample is not None: sample.keyframe_method = "short"
+        return GopStats.constant(1.0)
+    if cfg.keyframe_probe_mode != "packets":
+        return await loop.run_in_executor(None, _get_gop_stats, filepath, duration, sample)
+
+    if cfg.native_probe_enabled:
+        with timed_step(sample, "keyframe_index"):
+            stats: Optional[GopStats] = await loop.run_in_executor(get_worker_pool(), native_gop_stats, filepath, duration)
+        if stats is not None:
+            if sample is not None: sample.keyframe_method = "native"
+            return stats
+    if sample is not None: sample.keyframe_method = "ffprobe"
+    with timed_step(sample, "keyframe_ffprobe"):
+        return await _profile_gop(
+            filepath,
+            profile_windows(duration, cfg.keyframe_profile_points, cfg.keyframe_profile_window),
+            int(cfg.keyframe_profile_budget_mb * 1024 * 1024),
+            cfg.keyframe_probe_timeout
+        )
+
+
+async def _video_props(filepath: str, filename: str, include_keyframe_interval: bool, sample: Optional[FileSample] = None) -> VideoProps:
+    """
+    video_prop._get_video_props의 asyncio 버전 (헤더 직접 읽기 → ffprobe)
+    CPU를 쓰는 헤더 해석은 공유 프로세스 풀에서 실행
+    sample이 주어지면 분석 방식과 세부 단계 시간을 기록
+    """
+    from src.utils.load_env import load_env_flag
+    from src.utils.container_probe import probe_container
+    from src.utils.video_prop import _apply_gop_stats, _apply_sampled_bitrate, _sampling_plan, _video_props_from_probe
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    props: Optional[VideoProps] = None
+    if load_env_flag("NATIVE_PROBE_ENABLED"):
+        with timed_step(sample, "native_header"):
+            props = await loop.run_in_executor(get_worker_pool(), probe_container, filepath, filename)
+    if sample is not None: sample.method = "native" if props is not None else "ffprobe"
+    if props is None:
+        probe: Dict[str, Any] = await _ffprobe_json(filepath, sample)
+        props = _video_props_from_probe(probe, filepath, filename)
+        if (plan := _sampling_plan(probe, props)) is not None:
+            with timed_step(sample, "bitrate_sample"):
+                _apply_sampled_bitrate(props, await _sample_bitrate(filepath, plan))
+
+    if include_keyframe_interval:
+        with timed_step(sample, "keyframe"):
+            _apply_gop_stats(props, await _gop_stats(filepath, props.duration, sample))
+    return props
+
+
+async def _sampled(stage: str, target_root_dir: str, filename: str, job: Callable[[str, FileSample], Awaitable[T]]) -> T:
+    """
+    job(파일 경로, sample)을 실행하며 파일 한 개의 분석 시간을 측정해 수집기에 반영
+    """
+    filepath: str = os.path.join(target_root_dir, filename)
+    with file_sample(stage, filepath, filename) as sample:
+        result: T = await job(filepath, sample)
+    metrics.record(sample)
+    return result
+
+
+def _largest_first(target_root_dir: str, filenames: List[str]) -> List[str]:
+    """
+    꼬리 지연을 줄이기 위해 큰 파일부터 처리하도록 정렬
+    """
+    def size_of(filename: str) -> int:
+        try: return os.path.getsize(os.path.join(target_root_dir, filename))
+        except OSError: return 0
+    return sorted(filenames, key=size_of, reverse=True)
+
+
+async def _run_as_completed(
+        jobs: List[Tuple[str, Callable[[], Awaitable[T]]]],
+        concurrency: int,
+        on_result: Callable[[str, T], None]) -> None:
+    """
+    (파일이름, 작업) 목록을 최대 concurrency개씩 동시에 실행하며 끝나는 순서대로 on_result 호출
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(filename: str, job: Callable[[], Awaitable[T]]) -> Tuple[str, T]:
+        async with semaphore:
+            return filename, await job()
+
+    pending: List[asyncio.Task] = [asyncio.ensure_future(run(filename, job)) for filename, job in jobs]
+    try:
+        for finished in asyncio.as_completed(pending):
+            filename, result = await finished
+            on_result(filename, result)
+    finally:
+        for task in pending: task.cancel()
+
+
+def probe_video_props(
+        target_root_dir: str,
+        filenames: List[str],
+        include_keyframe_interval: bool,
+        on_result: Callable[[int, VideoProps], None]) -> None:
+    """
+    ffprobe 서브프로세스를 asyncio로 직접 실행해 파일들의 VideoProps를 구함
+    큰 파일부터 시작하고, 끝나는 순서대로 on_result(완료 순번, VideoProps) 호출
+    """
+    counter: List[int] = [0]
+
+    def done(_: str, props: VideoProps) -> None:
+        counter[0] += 1
+        on_result(counter[0], props)
+
+    jobs: List[Tuple[str, Callable[[], Awaitable[VideoProps]]]] = [
+        (filename, lambda filename=filename: _sampled(
+            "scan", target_root_dir, filename, lambda path, sample: _video_props(path, filename, include_keyframe_interval, sample)
+        ))
+        for filename in _largest_first(target_root_dir, filenames)
+    ]
+    run_coroutine(_run_as_completed(jobs, probe_concurrency(), done))
+
+
+def probe_gop_stats(
+        target_root_dir: str,
+        durations: Dict[str, float],
+        on_result: Callable[[int, str, "GopStats"], None]) -> None:
+    """
+    {파일이름: 길이} 목록의 키프레임 간격 통계를 asyncio로 동시에 구함
+    큰 파일부터 시작하고, 끝나는 순서대로 on_result(완료 순번, 파일이름, 키프레임 간격 통계) 호출
+    """
+    counter: List[int] = [0]
+
+    def done(filename: str, stats: "GopStats") -> None:
+        counter[0] += 1
+        on_result(counter[0], filename, stats)
+
+    jobs: List[Tuple[str, Callable[[], Awaitable["GopStats"]]]] = [
+        (filename, lambda filename=filename: _sampled(
+            "keyframe", target_root_dir, filename, lambda path, sample: _gop_stats(path, durations[filename], sample)
+        ))
+        for filename in _largest_first(target_root_dir, list(durations))
+    ]
+    run_coroutine(_run_as_completed(jobs, probe_concurrency(), done))
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# VideoProps.bitrate_method 값 (비디오 비트레이트를 구한 방식)
+BITRATE_STREAM: str = "stream" # 스트림의 비트레이트 (ffprobe bit_rate, MP4 샘플 크기 합)
+BITRATE_TAG: str = "tag" # 스트림 통계 태그 (mkvmerge BPS 태그)
+BITRATE_FORMAT: str = "format" # 컨테이너 전체 비트레이트에서 오디오 비트레이트를 뺀 값
+BITRATE_SAMPLED: str = "sampled" # 몇 개 구간의 패킷 크기 합으로 추정
+BITRATE_UNKNOWN: str = "unknown" # 구하지 못함 (vid_kbps == 0)
+
+
+def stream_bps(stream: Optional[Dict[str, Any]]) -> Tuple[Optional[int], str]:
+    """
+    ffprobe 스트림 정보의 (비트레이트(bps), 방식) 리턴
+    bit_rate가 없으면 MKV 통계 태그(BPS, BPS-eng 등)를 사용하고, 둘 다 없으면 (None, BITRATE_UNKNOWN)
+    """
+    if stream is None: return None, BITRATE_UNKNOWN
+    try:
+        if (bit_rate := int(stream.get("bit_rate", 0))) > 0: return bit_rate, BITRATE_STREAM
+    except (TypeError, ValueError):
+        pass
+    for key, value in (stream.get("tags") or {}).items():
+        if key.upper() != "BPS" and not key.upper().startswith("BPS-"): continue
+        try:
+            if (bps := int(value)) > 0: return bps, BITRATE_TAG
+        except (TypeError, ValueError):
+            continue
+    return None, BITRATE_UNKNOWN
+
+
+def estimate_bitrate(
+        probe: Dict[str, Any],
+        vid_stream: Optional[Dict[str, Any]],
+        aud_stream: Optional[Dict[str, Any]]) -> Tuple[Optional[int], Optional[int], str]:
+    """
+    ffprobe 결과만으로 (비디오 bps, 오디오 bps, 방식) 추정 (파일은 더 읽지 않음)
+    스트림 비트레이트 → 통계 태그 → 컨테이너 비트레이트 - 오디오 순으로 사용하며,
+    오디오 비트레이트를 모르면 컨테이너 비트레이트로 나눌 수 없으므로 BITRATE_UNKNOWN (패킷 샘플링 대상)
+    """
+    vid_bps, method = stream_bps(vid_stream)
+    aud_bps: Optional[int] = stream_bps(aud_stream)[0]
+    if vid_bps is not None: return vid_bps, aud_bps, method
+
+    try: format_bps: int = int((probe.get("format") or {}).get("bit_rate", 0))
+    except (TypeError, ValueError): format_bps = 0
+    if format_bps > 0 and (aud_stream is None or aud_bps is not None):
+        if (estimated := format_bps - (aud_bps or 0)) > 0: return estimated, aud_bps, BITRATE_FORMAT
+    return None, aud_bps, BITRATE_UNKNOWN
+
+
+@dataclass(frozen=True)
+class SamplingPlan:
+    """
+    패킷 샘플링으로 비트레이트를 추정하기 위한 정보
+    """
+    video_index: int # ffprobe 스트림 번호
+    audio_index: Optional[int]
+    fps: float # 패킷 길이를 알 수 없을 때 (패킷 수 / fps)로 구간 길이 계산
+    intervals: Tuple[Tuple[float, float], ...] # (시작 시각, 길이) 구간 목록
+    budget_bytes: int # 이만큼 읽으면 남은 구간은 읽지 않음
+
+
+def sample_intervals(duration: float, windows: int, seconds: float) -> Tuple[Tuple[float, float], ...]:
+    """
+    영상 전체에 고르게 퍼진 windows개의 seconds초 구간 (시작, 길이)
+    영상이 구간 합보다 짧으면 전체 한 구간, 길이를 모르면 앞부분 한 구간
+    """
+    windows = max(1, windows)
+    if duration <= 0: return ((0.0, seconds * windows),)
+    if duration <= seconds * windows: return ((0.0, duration),)
+    step: float = duration / windows
+    return tuple((round(step * i + (step - seconds) / 2, 3), seconds) for i in range(windows))
+
+
+def sampling_plan(vid_stream: Optional[Dict[str, Any]], aud_stream: Optional[Dict[str, Any]], duration: float, fps: float) -> Optional[SamplingPlan]:
+    """
+    BITRATE_SAMPLE_* 설정으로 샘플링 계획 생성 (비디오 스트림 번호를 모르면 None)
+    """
+    from src.utils.load_env import config
+
+    if vid_stream is None or "index" not in vid_stream: return None
+    cfg = config()
+    return SamplingPlan(
+        video_index = int(vid_stream["index"]),
+        audio_index = int(aud_stream["index"]) if aud_stream is not None and "index" in aud_stream else None,
+        fps = fps,
+        intervals = sample_intervals(duration, cfg.bitrate_sample_windows, cfg.bitrate_sample_seconds),
+        budget_bytes = int(cfg.bitrate_sample_budget_mb * 1024 * 1024)
+    )
+
+
+def bitrate_probe_args(filepath: str, plan: SamplingPlan) -> List[str]:
+    """
+    디코딩 없이 구간별 패킷의 (stream_index, duration_time, size)만 한 줄씩 출력하는 ffprobe 명령
+    """
+    return [
+        "ffprobe", "-v", "error",
+        "-show_entries", "packet=stream_index,size,duration_time",
+        "-read_intervals", ",".join(f"{start}%+{length}" for start, length in plan.intervals),
+        "-of", "csv=p=0",
+        filepath
+    ]
+
+
+class BitrateCollector:
+    """
+    ffprobe 패킷 출력을 한 줄씩 받아 스트림별 (바이트 수, 재생 시간)을 모으는 클래스
+    읽은 패킷 크기 합이 예산을 넘으면 바로 종료 가능
+    """
+
+    def __init__(self, plan: SamplingPlan) -> None:
+        self._plan: SamplingPlan = plan
+        self._bytes: Dict[int, int] = {}
+        self._seconds: Dict[int, float] = {}
+        self._packets: Dict[int, int] = {}
+        self._total: int = 0
+
+    def feed(self, line: str) -> bool:
+        """
+        'stream_index,duration_time,size' 한 줄을 반영하고, 읽기 예산을 다 썼으면 True 리턴
+        (ffprobe는 -show_entries 순서와 관계없이 자체 필드 순서로 출력)
+        """
+        parts: List[str] = line.strip().split(",")
+        try: index, size = int(parts[0]), int(parts[-1])
+        except (ValueError, IndexError): return False
+        if index not in (self._plan.video_index, self._plan.audio_index): return False
+
+        self._bytes[index] = self._bytes.get(index, 0) + size
+        self._packets[index] = self._packets.get(index, 0) + 1
+        try: self._seconds[index] = self._seconds.get(index, 0.0) + float(parts[1])
+        except (ValueError, IndexError): pass # 패킷 길이가 N/A인 경우
+        self._total += size
+        return self._total >= self._plan.budget_bytes
+
+    def _bps(self, index: Optional[int], fps: float) -> Optional[int]:
+        if index is None or not self._bytes.get(index): return None
+        seconds: float = self._seconds.get(index, 0.0)
+        if seconds <= 0 and fps > 0: seconds = self._packets[index] / fps # 비디오 패킷 한 개 == 프레임 한 개
+        return round(self._bytes[index] * 8 / seconds) if seconds > 0 else None
+
+    def result(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        지금까지 읽은 패킷으로 구한 (비디오 bps, 오디오 bps), 구할 수 없으면 None
+        """
+        return self._bps(self._plan.video_index, self._plan.fps), self._bps(self._plan.audio_index, 0.0)
+
+
+def sample_bitrate(filepath: str, plan: SamplingPlan) -> Tuple[Optional[int], Optional[int]]:
+    """
+    ffprobe로 계획된 구간의 패킷 크기만 스트리밍으로 읽어 (비디오 bps, 오디오 bps) 추정
+    읽기 예산을 넘으면 ffprobe를 바로 종료
+    """
+    import subprocess
+
+    collector: BitrateCollector = BitrateCollector(plan)
+    proc: subprocess.Popen = subprocess.Popen(
+        bitrate_probe_args(filepath, plan),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=1
+    )
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if collector.feed(line): break
+    finally:
+        if proc.poll() is None: proc.kill()
+        proc.wait()
+
+    return collector.result()
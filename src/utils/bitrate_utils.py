@@ -1,11 +1,27 @@
 # src/utils/bitrate_utils.py
-from src.utils.load_env import load_env
-from src.utils.ratio import ratio_map, get_closet_ratio
+from src.utils.load_env import Config, config
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+from src.utils.ratio import ratio_map, ratio_keys, get_closet_ratio, closet_ratio_index
 
-BASE_WIDTH: int = int(load_env('BASE_RESOLUTION_WIDTH'))
-BASE_HEIGHT: int = int(load_env('BASE_RESOLUTION_HEIGHT'))
-BASE_BITRATE: int = int(load_env('BASE_TARGET_BITRATE'))
-OPTIMAL_BITRATE_RATE: float = float(load_env('THRESHOLD_OPTIMAL_BITRATE_RATE'))
+if TYPE_CHECKING:
+    import numpy as np
+
+# 모듈 상수처럼 사용하는 설정값 → Config 필드 (import 시점에 고정하지 않고 읽을 때마다 현재 설정에서 가져옴)
+_CONFIG_ATTRS: Dict[str, str] = {
+    "BASE_WIDTH": "base_resolution_width",
+    "BASE_HEIGHT": "base_resolution_height",
+    "BASE_BITRATE": "base_target_bitrate",
+    "OPTIMAL_BITRATE_RATE": "threshold_optimal_bitrate_rate"
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    BASE_WIDTH, BASE_HEIGHT, BASE_BITRATE, OPTIMAL_BITRATE_RATE를 현재 설정값으로 리턴
+    (.env가 바뀌면 프로그램 재시작 없이 반영)
+    """
+    if name in _CONFIG_ATTRS: return getattr(config(), _CONFIG_ATTRS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def optimal_bitrate(width: int, height: int) -> int:
@@ -13,7 +29,8 @@ def optimal_bitrate(width: int, height: int) -> int:
     기준 해상도/비트레이트 기반으로 주어진 해상도(width*height)에 
     가장 잘 부합하는 최적 비트레이트 계산
     """
-    return int(BASE_BITRATE * (width * height) / (BASE_WIDTH * BASE_HEIGHT))
+    cfg: Config = config()
+    return int(cfg.base_target_bitrate * (width * height) / (cfg.base_resolution_width * cfg.base_resolution_height))
 
 
 def optimal_resolution_ratio(width: int, height: int) -> float:
@@ -22,7 +39,8 @@ def optimal_resolution_ratio(width: int, height: int) -> float:
     가장 가까운 해상도가 되게 하기 위한 가로 세로 변경 비율 계산
     '''
     # return (target_bitrate / bitrate) ** 0.5
-    return (BASE_WIDTH * BASE_HEIGHT / (width * height)) ** 0.5
+    cfg: Config = config()
+    return (cfg.base_resolution_width * cfg.base_resolution_height / (width * height)) ** 0.5
 
 
 def is_overencoded_sd_video(bitrate: int, width: int, height: int) -> bool:
@@ -36,7 +54,7 @@ def is_overencoded_sd_video(bitrate: int, width: int, height: int) -> bool:
         optimal < target_bitrate and
         (
             target_bitrate < bitrate or
-            bitrate / optimal > OPTIMAL_BITRATE_RATE 
+            bitrate / optimal > config().threshold_optimal_bitrate_rate
         )
     )
 
@@ -53,3 +71,39 @@ def is_overbitrate_hd_video(bitrate: int, width: int, height: int) -> bool:
     )
 
 
+def optimal_bitrate_array(width: "np.ndarray", height: "np.ndarray") -> "np.ndarray":
+    """
+    optimal_bitrate의 벡터화 버전
+    """
+    import numpy as np
+    cfg: Config = config()
+    return np.trunc(cfg.base_target_bitrate * (width * height) / (cfg.base_resolution_width * cfg.base_resolution_height)).astype(np.int64)
+
+
+def optimal_resolution_ratio_array(width: "np.ndarray", height: "np.ndarray") -> "np.ndarray":
+    """
+    optimal_resolution_ratio의 벡터화 버전
+    """
+    import numpy as np
+    cfg: Config = config()
+    with np.errstate(divide="ignore"):
+        return (cfg.base_resolution_width * cfg.base_resolution_height / (width * height)) ** 0.5
+
+
+def bitrate_flags_array(bitrate: "np.ndarray", width: "np.ndarray", height: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    is_overencoded_sd_video, is_overbitrate_hd_video의 벡터화 버전
+    (과도한 비트레이트의 SD 비디오 여부, 높은 비트레이트의 HD 비디오 여부) 배열 리턴
+    """
+    import numpy as np
+
+    optimal: np.ndarray = optimal_bitrate_array(width, height)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio_index, _ = closet_ratio_index(width / height)
+        bitrate_rate: np.ndarray = np.divide(bitrate, optimal, out=np.full(len(bitrate), np.inf), where=optimal != 0)
+    target_bitrates: np.ndarray = np.array([ratio_map[k]["target_bitrate"] for k in ratio_keys], dtype=np.int64)
+    target_bitrate: np.ndarray = target_bitrates[ratio_index]
+
+    overencoded_sd: np.ndarray = (optimal < target_bitrate) & ((target_bitrate < bitrate) | (bitrate_rate > config().threshold_optimal_bitrate_rate))
+    overbitrate_hd: np.ndarray = (target_bitrate <= optimal) & (target_bitrate <= bitrate)
+    return overencoded_sd, overbitrate_hd
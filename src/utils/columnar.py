@@ -0,0 +1,144 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Tuple, TypeVar
+from src.utils.video_prop import VideoProps, keyframe_statistic
+
+if TYPE_CHECKING:
+    import numpy as np
+
+T = TypeVar("T")
+
+
+class VideoPropColumns:
+    """
+    VideoProps 목록을 열(column) 단위 numpy 배열로 보관하는 클래스
+    분류 조건을 파일마다 파이썬으로 계산하지 않고 배열 연산 한 번으로 계산하기 위해 사용
+    배열의 순서는 생성할 때 받은 VideoProps 목록의 순서와 같음
+    """
+
+    def __init__(self, data: List[VideoProps]) -> None:
+        import numpy as np
+        from src.utils.ratio import closet_ratio_index
+
+        self.width: np.ndarray = np.fromiter((vid.width for vid in data), dtype=np.int64, count=len(data))
+        self.height: np.ndarray = np.fromiter((vid.height for vid in data), dtype=np.int64, count=len(data))
+        self.rotate_type: np.ndarray = np.fromiter((vid.rotate_type for vid in data), dtype=np.int64, count=len(data))
+        self.vid_kbps: np.ndarray = np.fromiter((vid.vid_kbps for vid in data), dtype=np.int64, count=len(data))
+        self.vid_size_MB: np.ndarray = np.fromiter((vid.vid_size_MB for vid in data), dtype=np.float64, count=len(data))
+        self.keyframe_interval: np.ndarray = np.fromiter( # 키프레임 정보가 없으면 NaN
+            (np.nan if vid.keyframe_interval is None else vid.keyframe_interval for vid in data), dtype=np.float64, count=len(data)
+        )
+        self.keyframe_max: np.ndarray = np.fromiter(
+            (np.nan if vid.keyframe_max is None else vid.keyframe_max for vid in data), dtype=np.float64, count=len(data)
+        )
+        self.keyframe_p95: np.ndarray = np.fromiter(
+            (np.nan if vid.keyframe_p95 is None else vid.keyframe_p95 for vid in data), dtype=np.float64, count=len(data)
+        )
+        self.real_ratio: np.ndarray = np.fromiter((vid.ratio.real_value for vid in data), dtype=np.float64, count=len(data)) # 회전을 고려한 비율
+        self.ratio_index, self.ratio_diff = closet_ratio_index(self.real_ratio) # ratio_keys 기준 비율 유형 인덱스, 비율값 차이
+
+    def __len__(self) -> int: return len(self.width)
+
+
+def bitrate_config() -> Tuple[Any, ...]:
+    """
+    비트레이트 관련 파생 열이 의존하는 설정값 (값이 바뀌면 파생 열을 다시 계산)
+    """
+    from src.utils.load_env import Config, config
+    cfg: Config = config()
+    return (cfg.base_resolution_width, cfg.base_resolution_height, cfg.base_target_bitrate, cfg.threshold_optimal_bitrate_rate)
+
+
+class DerivedColumns:
+    """
+    VideoPropColumns로부터 계산하는 파생 열(최적 해상도/비트레이트, 분류 결과 등)을 처음 사용할 때 계산해 보관하는 클래스
+    파생 열마다 계산에 사용한 설정값을 함께 저장해, 설정값이 바뀐 열만 다시 계산
+    """
+
+    def __init__(self, columns: VideoPropColumns) -> None:
+        self._columns: VideoPropColumns = columns
+        self._memo: Dict[Hashable, Tuple[Hashable, Any]] = {} # 이름 → (설정값, 계산 결과)
+
+    @property
+    def columns(self) -> VideoPropColumns: return self._columns
+
+    def memo(self, name: Hashable, config: Hashable, compute: Callable[[], T]) -> T:
+        """
+        name 열의 값을 리턴. 아직 계산하지 않았거나 설정값(config)이 바뀐 경우에만 compute 실행
+        """
+        cached = self._memo.get(name)
+        if cached is not None and cached[0] == config: return cached[1]
+        value: T = compute()
+        self._memo[name] = (config, value)
+        return value
+
+    def _bitrate_flags(self) -> Tuple[List[bool], List[bool]]:
+        from src.utils import bitrate_utils as bu
+        def compute() -> Tuple[List[bool], List[bool]]:
+            overencoded_sd, overbitrate_hd = bu.bitrate_flags_array(self._columns.vid_kbps, self._columns.width, self._columns.height)
+            return overencoded_sd.tolist(), overbitrate_hd.tolist()
+        return self.memo("bitrate_flags", bitrate_config(), compute)
+
+    @property
+    def optimal_ratio(self) -> List[float]:
+        from src.utils import bitrate_utils as bu
+        return self.memo("optimal_ratio", bitrate_config(),
+                         lambda: bu.optimal_resolution_ratio_array(self._columns.width, self._columns.height).tolist())
+
+    @property
+    def optimal_width(self) -> List[int]:
+        return self.memo("optimal_width", bitrate_config(),
+                         lambda: [int(r * w) for r, w in zip(self.optimal_ratio, self._columns.width.tolist())])
+
+    @property
+    def optimal_height(self) -> List[int]:
+        return self.memo("optimal_height", bitrate_config(),
+                         lambda: [int(r * h) for r, h in zip(self.optimal_ratio, self._columns.height.tolist())])
+
+    @property
+    def optimal_bitrate(self) -> List[int]:
+        from src.utils import bitrate_utils as bu
+        return self.memo("optimal_bitrate", bitrate_config(),
+                         lambda: bu.optimal_bitrate_array(self._columns.width, self._columns.height).tolist())
+
+    @property
+    def bitrate_ratio(self) -> List[float]:
+        """
+        현재 비트레이트 / 최적 비트레이트
+        """
+        return self.memo("bitrate_ratio", bitrate_config(),
+                         lambda: [b / o if o else float("inf") for b, o in zip(self._columns.vid_kbps.tolist(), self.optimal_bitrate)])
+
+    @property
+    def overencoded_sd(self) -> List[bool]: return self._bitrate_flags()[0]
+
+    @property
+    def overbitrate_hd(self) -> List[bool]: return self._bitrate_flags()[1]
+
+    @property
+    def reducible(self) -> List[bool]:
+        """
+        비트레이트를 줄일 수 있는(SD 과다 비트레이트 또는 HD 고비트레이트) 비디오 여부
+        """
+        return self.memo("reducible", bitrate_config(),
+                         lambda: [sd or hd for sd, hd in zip(self.overencoded_sd, self.overbitrate_hd)])
+
+
+# 출력 열 이름 → (VideoProps, 행 번호, 파생 열)로 값을 구하는 함수
+RowGetter = Callable[[VideoProps, int, DerivedColumns], Any]
+ROW_GETTERS: Dict[str, RowGetter] = {
+    "\n이름": lambda vid, i, d: vid.filename,
+    "\nW": lambda vid, i, d: vid.width,
+    "\nH": lambda vid, i, d: vid.height,
+    "\n│": lambda vid, i, d: "│",
+    "\u200b\n│": lambda vid, i, d: "│",
+    "\u200b\u200b\n│": lambda vid, i, d: "│",
+    "회전\n각도": lambda vid, i, d: vid.rotate_type,
+    "\n비율": lambda vid, i, d: vid.ratio.real_value,
+    "비율\n타입": lambda vid, i, d: vid.ratio.type,
+    "비율\n차이": lambda vid, i, d: vid.ratio.diff,
+    "\nb-rate": lambda vid, i, d: vid.vid_kbps,
+    "최적\nW": lambda vid, i, d: d.optimal_width[i],
+    "최적\nH": lambda vid, i, d: d.optimal_height[i],
+    "최적\nb-rate": lambda vid, i, d: d.optimal_bitrate[i],
+    "b-rate\n비율": lambda vid, i, d: d.bitrate_ratio[i],
+    "키프레임\n간격": lambda vid, i, d: keyframe_statistic(vid) or -1.0
+}
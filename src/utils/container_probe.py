@@ -0,0 +1,513 @@
+import math
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from src.utils.video_prop import VideoProps
+from src.utils.bitrate_probe import BITRATE_STREAM, BITRATE_TAG
+
+if TYPE_CHECKING:
+    from src.utils.keyframe_probe import GopStats
+
+# ffprobe 프로세스 없이 MP4/MOV, MKV/WebM 컨테이너 헤더를 직접 읽는 모듈
+# 파일은 mmap으로 열어 필요한 박스/엘리먼트만 읽으며, 해석할 수 없는 파일은 None을 리턴해 ffprobe로 넘김
+
+# MP4 sample entry fourcc → ffprobe codec_name
+_MP4_CODECS: Dict[bytes, str] = {
+    b"avc1": "h264", b"avc3": "h264",
+    b"hvc1": "hevc", b"hev1": "hevc",
+    b"av01": "av1",
+    b"vp09": "vp9", b"vp08": "vp8",
+    b"mp4v": "mpeg4",
+    b"s263": "h263",
+    b"jpeg": "mjpeg", b"mjpa": "mjpeg",
+    b"apch": "prores", b"apcn": "prores", b"apcs": "prores", b"apco": "prores", b"ap4h": "prores",
+}
+
+# MKV CodecID → ffprobe codec_name
+_MKV_CODECS: Dict[str, str] = {
+    "V_MPEG4/ISO/AVC": "h264",
+    "V_MPEGH/ISO/HEVC": "hevc",
+    "V_AV1": "av1",
+    "V_VP9": "vp9",
+    "V_VP8": "vp8",
+    "V_MPEG4/ISO/ASP": "mpeg4",
+    "V_MPEG2": "mpeg2video",
+    "V_MPEG1": "mpeg1video",
+    "V_MJPEG": "mjpeg",
+    "V_PRORES": "prores",
+}
+
+_MP4_TOP_LEVEL: Tuple[bytes, ...] = (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip", b"pnot")
+
+# MKV 엘리먼트 ID
+_EBML = 0x1A45DFA3
+_DOCTYPE = 0x4282
+_SEGMENT = 0x18538067
+_SEEK_HEAD, _SEEK, _SEEK_ID, _SEEK_POSITION = 0x114D9B74, 0x4DBB, 0x53AB, 0x53AC
+_INFO, _TIMECODE_SCALE, _DURATION = 0x1549A966, 0x2AD7B1, 0x4489
+_TRACKS, _TRACK_ENTRY = 0x1654AE6B, 0xAE
+_TRACK_NUMBER, _TRACK_UID, _TRACK_TYPE, _CODEC_ID, _DEFAULT_DURATION = 0xD7, 0x73C5, 0x83, 0x86, 0x23E383
+_VIDEO, _PIXEL_WIDTH, _PIXEL_HEIGHT = 0xE0, 0xB0, 0xBA
+_PROJECTION, _PROJECTION_POSE_ROLL = 0x7670, 0x7675
+_TAGS, _TAG, _TARGETS, _TAG_TRACK_UID, _SIMPLE_TAG, _TAG_NAME, _TAG_STRING = 0x1254C367, 0x7373, 0x63C0, 0x63C5, 0x67C8, 0x45A3, 0x4487
+_CLUSTER = 0x1F43B675
+_CUES, _CUE_POINT, _CUE_TIME, _CUE_TRACK_POSITIONS, _CUE_TRACK = 0x1C53BB6B, 0xBB, 0xB3, 0xB7, 0xF7
+
+
+@dataclass
+class _TrackInfo:
+    """
+    컨테이너에서 읽은 트랙 정보
+    """
+    kind: str # "video" | "audio" | 기타
+    codec: Optional[str] = None
+    width: int = 0
+    height: int = 0
+    rotation: int = 0
+    fps: float = 0.0
+    duration: float = 0.0 # 초
+    bit_rate: Optional[int] = None # bps
+    track_id: int = 0
+
+
+def _display_rotation(a: float, b: float, c: float, d: float) -> int:
+    """
+    표시 행렬에서 회전 각도 계산 (ffprobe의 Display Matrix rotation과 동일한 규칙)
+    """
+    scale0: float = math.hypot(a, c)
+    scale1: float = math.hypot(b, d)
+    if scale0 == 0 or scale1 == 0: return 0
+    return -round(math.degrees(math.atan2(b / scale1, a / scale0)))
+
+
+def _to_video_props(filename: str, file_size: int, vid: _TrackInfo, aud: Optional[_TrackInfo], duration: float, bitrate_method: str) -> VideoProps:
+    from src.utils.ratio import closet_ratio_of
+
+    width, height, rotate_type = vid.width, vid.height, vid.rotation
+    return VideoProps(
+        filename = filename,
+        width = width,
+        height = height,
+        rotate_type = rotate_type,
+        fps = vid.fps,
+        vid_kbps = round((vid.bit_rate or 0) / 1000),
+        aud_kbps = round(((aud.bit_rate if aud else 0) or 0) / 1000),
+        vid_size_MB = file_size / (1024 * 1024),
+        duration = duration,
+        codec = vid.codec or "unknown",
+        ratio = closet_ratio_of(width, height, rotate_type), #회전을 고려한 비율 계산
+        bitrate_method = bitrate_method
+    )
+
+
+###############################################################################
+# MP4 / MOV
+###############################################################################
+
+def _iter_boxes(buf: mmap.mmap, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    [start, end) 구간의 박스를 순회하며 (타입, 본문 시작 위치, 박스 끝 위치) 리턴
+    """
+    pos: int = start
+    while pos + 8 <= end:
+        size, btype = struct.unpack_from(">I4s", buf, pos)
+        header: int = 8
+        if size == 1:
+            if pos + 16 > end: return
+            size, = struct.unpack_from(">Q", buf, pos + 8)
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end: return
+        yield btype, pos + header, pos + size
+        pos += size
+
+
+def _child(buf: mmap.mmap, start: int, end: int, btype: bytes) -> Optional[Tuple[int, int]]:
+    return next(((s, e) for t, s, e in _iter_boxes(buf, start, end) if t == btype), None)
+
+
+def _path(buf: mmap.mmap, start: int, end: int, *btypes: bytes) -> Optional[Tuple[int, int]]:
+    span: Optional[Tuple[int, int]] = (start, end)
+    for btype in btypes:
+        if span is None: return None
+        span = _child(buf, span[0], span[1], btype)
+    return span
+
+
+def _u32_array(buf: mmap.mmap, offset: int, count: int) -> array:
+    """
+    빅엔디언 uint32 배열을 읽음
+    """
+    values: array = array("I")
+    if values.itemsize != 4: values = array("L")
+    values.frombytes(buf[offset:offset + count * 4])
+    if sys.byteorder == "little": values.byteswap()
+    return values
+
+
+def _mp4_stts(buf: mmap.mmap, stbl: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+    """
+    stts 박스의 (샘플 수, 샘플 길이) 목록
+    """
+    if (stts := _child(buf, stbl[0], stbl[1], b"stts")) is None: return None
+    count, = struct.unpack_from(">I", buf, stts[0] + 4)
+    if stts[0] + 8 + count * 8 > stts[1]: return None
+    values: array = _u32_array(buf, stts[0] + 8, count * 2)
+    return list(zip(values[0::2], values[1::2]))
+
+
+def _mp4_track(buf: mmap.mmap, start: int, end: int) -> Optional[_TrackInfo]:
+    tkhd = _child(buf, start, end, b"tkhd")
+    mdhd = _path(buf, start, end, b"mdia", b"mdhd")
+    hdlr = _path(buf, start, end, b"mdia", b"hdlr")
+    stbl = _path(buf, start, end, b"mdia", b"minf", b"stbl")
+    if tkhd is None or mdhd is None or hdlr is None or stbl is None: return None
+
+    handler: bytes = bytes(buf[hdlr[0] + 8:hdlr[0] + 12])
+    track: _TrackInfo = _TrackInfo(kind={b"vide": "video", b"soun": "audio"}.get(handler, "other"))
+
+    # tkhd: 트랙 ID, 표시 행렬
+    tkhd_version: int = buf[tkhd[0]]
+    track.track_id, = struct.unpack_from(">I", buf, tkhd[0] + (20 if tkhd_version == 1 else 12))
+    matrix_offset: int = tkhd[0] + (52 if tkhd_version == 1 else 40)
+    a, b, _, c, d = struct.unpack_from(">5i", buf, matrix_offset)
+    track.rotation = _display_rotation(a / 65536, b / 65536, c / 65536, d / 65536)
+
+    # mdhd: 타임스케일, 길이
+    if buf[mdhd[0]] == 1: timescale, duration = struct.unpack_from(">IQ", buf, mdhd[0] + 20)
+    else: timescale, duration = struct.unpack_from(">II", buf, mdhd[0] + 12)
+    if timescale == 0: return None
+    track.duration = duration / timescale
+
+    # stsd: 코덱, 부호화 해상도
+    if (stsd := _child(buf, stbl[0], stbl[1], b"stsd")) is not None and stsd[0] + 16 <= stsd[1]:
+        fourcc: bytes = bytes(buf[stsd[0] + 12:stsd[0] + 16])
+        track.codec = _MP4_CODECS.get(fourcc) if track.kind == "video" else fourcc.decode("latin-1")
+        if track.kind == "video" and stsd[0] + 44 <= stsd[1]:
+            track.width, track.height = struct.unpack_from(">HH", buf, stsd[0] + 40)
+
+    # stsz: 스트림 크기 → 평균 비트레이트
+    if (stsz := _child(buf, stbl[0], stbl[1], b"stsz")) is not None:
+        sample_size, sample_count = struct.unpack_from(">II", buf, stsz[0] + 4)
+        if sample_count == 0: return None # 조각난(fragmented) MP4는 ffprobe로 처리
+        stream_bytes: int = sample_size * sample_count if sample_size else sum(_u32_array(buf, stsz[0] + 12, sample_count))
+        if track.duration > 0: track.bit_rate = int(stream_bytes * 8 / track.duration)
+
+    # stts: 가장 흔한 샘플 길이 → 프레임레이트
+    if track.kind == "video" and (stts := _mp4_stts(buf, stbl)):
+        common_delta: int = max(stts, key=lambda e: e[0])[1]
+        if common_delta: track.fps = timescale / common_delta
+
+    return track
+
+
+def _mp4_tracks(buf: mmap.mmap) -> Optional[List[_TrackInfo]]:
+    if len(buf) < 8 or bytes(buf[4:8]) not in _MP4_TOP_LEVEL: return None
+    if (moov := _child(buf, 0, len(buf), b"moov")) is None: return None
+    return [
+        track for btype, start, end in _iter_boxes(buf, moov[0], moov[1])
+        if btype == b"trak" and (track := _mp4_track(buf, start, end)) is not None
+    ]
+
+
+def _mp4_keyframe_times(buf: mmap.mmap) -> Optional[List[float]]:
+    """
+    첫 번째 비디오 트랙의 stss(동기 샘플 번호)와 stts(샘플 길이)로 모든 키프레임의 시각(초) 계산
+    stss가 없으면 모든 샘플이 키프레임
+    """
+    if len(buf) < 8 or bytes(buf[4:8]) not in _MP4_TOP_LEVEL: return None
+    if (moov := _child(buf, 0, len(buf), b"moov")) is None: return None
+
+    for btype, start, end in _iter_boxes(buf, moov[0], moov[1]):
+        if btype != b"trak": continue
+        hdlr = _path(buf, start, end, b"mdia", b"hdlr")
+        if hdlr is None or bytes(buf[hdlr[0] + 8:hdlr[0] + 12]) != b"vide": continue
+        mdhd = _path(buf, start, end, b"mdia", b"mdhd")
+        stbl = _path(buf, start, end, b"mdia", b"minf", b"stbl")
+        if mdhd is None or stbl is None: return None
+
+        timescale, = struct.unpack_from(">I", buf, mdhd[0] + (20 if buf[mdhd[0]] == 1 else 12))
+        if timescale == 0 or (stts := _mp4_stts(buf, stbl)) is None: return None
+
+        sync_samples: Optional[array] = None
+        if (stss := _child(buf, stbl[0], stbl[1], b"stss")) is not None:
+            count, = struct.unpack_from(">I", buf, stss[0] + 4)
+            if stss[0] + 8 + count * 4 > stss[1]: return None
+            sync_samples = _u32_array(buf, stss[0] + 8, count)
+
+        # stts 구간을 따라가며 동기 샘플(1부터 시작하는 번호)의 디코딩 시각 계산
+        times: List[float] = []
+        sample: int = 1 # 현재 구간의 첫 샘플 번호
+        dts: int = 0 # 현재 구간의 첫 샘플 시각
+        sync_index: int = 0
+        for run_count, delta in stts:
+            run_end: int = sample + run_count
+            if sync_samples is None:
+                times.extend((dts + i * delta) / timescale for i in range(run_count))
+            else:
+                while sync_index < len(sync_samples) and sync_samples[sync_index] < run_end:
+                    times.append((dts + (sync_samples[sync_index] - sample) * delta) / timescale)
+                    sync_index += 1
+            sample, dts = run_end, dts + run_count * delta
+        return times
+
+    return None
+
+
+###############################################################################
+# MKV / WebM (EBML)
+###############################################################################
+
+def _read_vint(buf: mmap.mmap, pos: int, keep_marker: bool) -> Tuple[int, int]:
+    """
+    EBML 가변 길이 정수를 읽어 (값, 다음 위치) 리턴, 크기가 '알 수 없음'이면 값은 -1
+    """
+    first: int = buf[pos]
+    if first == 0: raise ValueError("잘못된 EBML 가변 길이 정수")
+    length: int = 8 - first.bit_length() + 1
+    value: int = first if keep_marker else first & (0xFF >> length)
+    all_ones: bool = value == (0xFF >> length)
+    for i in range(1, length):
+        byte: int = buf[pos + i]
+        value = (value << 8) | byte
+        all_ones = all_ones and byte == 0xFF
+    return (-1 if all_ones and not keep_marker else value), pos + length
+
+
+def _iter_elements(buf: mmap.mmap, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    [start, end) 구간의 EBML 엘리먼트를 순회하며 (ID, 본문 시작 위치, 본문 끝 위치) 리턴
+    크기를 알 수 없는 엘리먼트를 만나면 끝 위치를 -1로 리턴하고 순회 종료
+    """
+    pos: int = start
+    while pos < end:
+        element_id, pos = _read_vint(buf, pos, keep_marker=True)
+        size, pos = _read_vint(buf, pos, keep_marker=False)
+        if size < 0:
+            yield element_id, pos, -1
+            return
+        if pos + size > end: return
+        yield element_id, pos, pos + size
+        pos += size
+
+
+def _ebml_uint(buf: mmap.mmap, start: int, end: int) -> int:
+    return int.from_bytes(buf[start:end], "big")
+
+
+def _ebml_float(buf: mmap.mmap, start: int, end: int) -> float:
+    if end - start == 4: return struct.unpack_from(">f", buf, start)[0]
+    if end - start == 8: return struct.unpack_from(">d", buf, start)[0]
+    return 0.0
+
+
+def _ebml_str(buf: mmap.mmap, start: int, end: int) -> str:
+    return bytes(buf[start:end]).rstrip(b"\x00").decode("utf-8", errors="replace")
+
+
+def _mkv_segment_children(buf: mmap.mmap) -> Optional[Tuple[int, Dict[int, Tuple[int, int]]]]:
+    """
+    Segment 본문 시작 위치와 {최상위 엘리먼트 ID: 첫 번째 (시작, 끝)} 리턴
+    순차 순회로 못 찾은 엘리먼트는 SeekHead의 위치 정보로 찾음
+    """
+    elements: Iterator[Tuple[int, int, int]] = _iter_elements(buf, 0, len(buf))
+    header = next(elements, None)
+    if header is None or header[0] != _EBML or header[2] < 0: return None
+    doctype: str = next((_ebml_str(buf, s, e) for i, s, e in _iter_elements(buf, header[1], header[2]) if i == _DOCTYPE), "matroska")
+    if doctype not in ("matroska", "webm"): return None
+
+    segment = next((el for el in elements if el[0] == _SEGMENT), None)
+    if segment is None: return None
+    seg_start: int = segment[1]
+    seg_end: int = len(buf) if segment[2] < 0 else segment[2]
+
+    children: Dict[int, Tuple[int, int]] = {}
+    seek_positions: Dict[int, int] = {}
+    for element_id, start, end in _iter_elements(buf, seg_start, seg_end):
+        if end < 0: break # 크기를 알 수 없는 엘리먼트 이후는 SeekHead로 찾음
+        if element_id == _CLUSTER and seek_positions: break # Cluster 헤더를 일일이 읽지 않고 SeekHead로 찾음
+        children.setdefault(element_id, (start, end))
+        if element_id == _SEEK_HEAD:
+            for seek_id, s, e in _iter_elements(buf, start, end):
+                if seek_id != _SEEK: continue
+                fields: Dict[int, Tuple[int, int]] = {i: (fs, fe) for i, fs, fe in _iter_elements(buf, s, e)}
+                if _SEEK_ID in fields and _SEEK_POSITION in fields:
+                    seek_positions[_ebml_uint(buf, *fields[_SEEK_ID])] = seg_start + _ebml_uint(buf, *fields[_SEEK_POSITION])
+
+    for element_id, pos in seek_positions.items():
+        if element_id in children or pos >= seg_end: continue
+        found = next(_iter_elements(buf, pos, seg_end), None)
+        if found is not None and found[0] == element_id and found[2] >= 0:
+            children[element_id] = (found[1], found[2])
+
+    return seg_start, children
+
+
+def _mkv_track_bps(buf: mmap.mmap, tags: Optional[Tuple[int, int]]) -> Dict[int, int]:
+    """
+    Tags의 BPS 태그(mkvmerge 통계 태그)에서 {TrackUID: 비트레이트} 리턴
+    """
+    result: Dict[int, int] = {}
+    if tags is None: return result
+    for tag_id, start, end in _iter_elements(buf, *tags):
+        if tag_id != _TAG: continue
+        track_uid: int = 0
+        bps: Optional[int] = None
+        for child_id, s, e in _iter_elements(buf, start, end):
+            if child_id == _TARGETS:
+                track_uid = next((_ebml_uint(buf, ts, te) for ti, ts, te in _iter_elements(buf, s, e) if ti == _TAG_TRACK_UID), 0)
+            elif child_id == _SIMPLE_TAG:
+                simple: Dict[int, Tuple[int, int]] = {i: (fs, fe) for i, fs, fe in _iter_elements(buf, s, e)}
+                if _TAG_NAME in simple and _TAG_STRING in simple and _ebml_str(buf, *simple[_TAG_NAME]) == "BPS":
+                    try: bps = int(_ebml_str(buf, *simple[_TAG_STRING]))
+                    except ValueError: pass
+        if track_uid and bps is not None: result[track_uid] = bps
+    return result
+
+
+def _mkv_tracks(buf: mmap.mmap) -> Optional[Tuple[List[_TrackInfo], float, int, Dict[int, Tuple[int, int]]]]:
+    """
+    MKV 트랙 목록, 전체 길이(초), TimecodeScale, Segment의 최상위 엘리먼트 위치 리턴
+    """
+    found = _mkv_segment_children(buf)
+    if found is None: return None
+    _, children = found
+    if _TRACKS not in children: return None
+
+    timecode_scale: int = 1_000_000
+    duration: float = 0.0
+    if _INFO in children:
+        info: Dict[int, Tuple[int, int]] = {i: (s, e) for i, s, e in _iter_elements(buf, *children[_INFO])}
+        if _TIMECODE_SCALE in info: timecode_scale = _ebml_uint(buf, *info[_TIMECODE_SCALE])
+        if _DURATION in info: duration = _ebml_float(buf, *info[_DURATION]) * timecode_scale / 1e9
+
+    bps: Dict[int, int] = _mkv_track_bps(buf, children.get(_TAGS))
+    tracks: List[_TrackInfo] = []
+    for entry_id, start, end in _iter_elements(buf, *children[_TRACKS]):
+        if entry_id != _TRACK_ENTRY: continue
+        entry: Dict[int, Tuple[int, int]] = {i: (s, e) for i, s, e in _iter_elements(buf, start, end)}
+        track_type: int = _ebml_uint(buf, *entry[_TRACK_TYPE]) if _TRACK_TYPE in entry else 0
+        track: _TrackInfo = _TrackInfo(kind={1: "video", 2: "audio"}.get(track_type, "other"), duration=duration)
+        track.track_id = _ebml_uint(buf, *entry[_TRACK_NUMBER]) if _TRACK_NUMBER in entry else 0
+        if _TRACK_UID in entry: track.bit_rate = bps.get(_ebml_uint(buf, *entry[_TRACK_UID]))
+        codec_id: str = _ebml_str(buf, *entry[_CODEC_ID]) if _CODEC_ID in entry else ""
+        track.codec = _MKV_CODECS.get(codec_id) if track.kind == "video" else codec_id
+        if _DEFAULT_DURATION in entry and (frame_ns := _ebml_uint(buf, *entry[_DEFAULT_DURATION])):
+            track.fps = round(1e9 / frame_ns, 3)
+        if _VIDEO in entry:
+            video: Dict[int, Tuple[int, int]] = {i: (s, e) for i, s, e in _iter_elements(buf, *entry[_VIDEO])}
+            if _PIXEL_WIDTH in video: track.width = _ebml_uint(buf, *video[_PIXEL_WIDTH])
+            if _PIXEL_HEIGHT in video: track.height = _ebml_uint(buf, *video[_PIXEL_HEIGHT])
+            if _PROJECTION in video:
+                projection: Dict[int, Tuple[int, int]] = {i: (s, e) for i, s, e in _iter_elements(buf, *video[_PROJECTION])}
+                if _PROJECTION_POSE_ROLL in projection:
+                    track.rotation = round(_ebml_float(buf, *projection[_PROJECTION_POSE_ROLL]))
+        tracks.append(track)
+
+    return tracks, duration, timecode_scale, children
+
+
+def _mkv_keyframe_times(buf: mmap.mmap) -> Optional[List[float]]:
+    """
+    Cues에 기록된 비디오 트랙의 CuePoint 시각(초) 목록
+    """
+    if (mkv := _mkv_tracks(buf)) is None: return None
+    tracks, _, timecode_scale, children = mkv
+    vid: Optional[_TrackInfo] = next((t for t in tracks if t.kind == "video"), None)
+    if vid is None or _CUES not in children: return None
+
+    times: List[float] = []
+    for point_id, start, end in _iter_elements(buf, *children[_CUES]):
+        if point_id != _CUE_POINT: continue
+        cue_time: Optional[int] = None
+        cue_tracks: List[int] = []
+        for child_id, s, e in _iter_elements(buf, start, end):
+            if child_id == _CUE_TIME: cue_time = _ebml_uint(buf, s, e)
+            elif child_id == _CUE_TRACK_POSITIONS:
+                cue_tracks.extend(_ebml_uint(buf, ts, te) for ti, ts, te in _iter_elements(buf, s, e) if ti == _CUE_TRACK)
+        if cue_time is not None and vid.track_id in cue_tracks:
+            times.append(cue_time * timecode_scale / 1e9)
+
+    return sorted(times)
+
+
+###############################################################################
+# 공통
+###############################################################################
+
+def _open_mmap(filepath: str) -> Optional[Tuple[mmap.mmap, int]]:
+    import os
+    size: int = os.path.getsize(filepath)
+    if size == 0: return None
+    with open(filepath, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), size
+
+
+def probe_container(filepath: str, filename: str) -> Optional[VideoProps]:
+    """
+    MP4/MOV, MKV/WebM 헤더를 직접 읽어 VideoProps 리턴
+    지원하지 않는 컨테이너이거나, 필요한 값(해상도, 코덱, 비트레이트, 프레임레이트)을 얻지 못하면 None 리턴
+    (BPS 태그가 없는 MKV 등은 ffprobe 경로에서 컨테이너 비트레이트나 패킷 샘플링으로 비트레이트를 추정)
+    """
+    try:
+        if (opened := _open_mmap(filepath)) is None: return None
+    except (OSError, ValueError):
+        return None
+
+    buf, file_size = opened
+    try:
+        tracks: Optional[List[_TrackInfo]] = None
+        duration: float = 0.0
+        bitrate_method: str = BITRATE_STREAM # MP4는 샘플 크기 합, MKV는 BPS 통계 태그
+        if bytes(buf[:4]) == _EBML.to_bytes(4, "big"):
+            if (mkv := _mkv_tracks(buf)) is not None: tracks, duration, _, _ = mkv
+            bitrate_method = BITRATE_TAG
+        elif (tracks := _mp4_tracks(buf)) is not None:
+            duration = max((t.duration for t in tracks if t.kind == "video"), default=0.0)
+    except (struct.error, ValueError, IndexError, KeyError):
+        return None
+    finally:
+        buf.close()
+
+    if not tracks: return None
+    vid: Optional[_TrackInfo] = next((t for t in tracks if t.kind == "video"), None)
+    aud: Optional[_TrackInfo] = next((t for t in tracks if t.kind == "audio"), None)
+    if vid is None or vid.codec is None or vid.width <= 0 or vid.height <= 0 or vid.fps <= 0 or not vid.bit_rate:
+        return None
+
+    return _to_video_props(filename, file_size, vid, aud, duration, bitrate_method)
+
+
+
+def read_keyframe_times(filepath: str) -> Optional[List[float]]:
+    """
+    MP4/MOV는 stss+stts, MKV/WebM은 Cues 인덱스를 직접 읽어 파일 전체의 키프레임 시각(초) 목록 리턴
+    프레임을 디코딩하지 않으며, 인덱스를 얻을 수 없으면 None 리턴
+    """
+    try:
+        if (opened := _open_mmap(filepath)) is None: return None
+    except (OSError, ValueError):
+        return None
+
+    buf, _ = opened
+    try:
+        if bytes(buf[:4]) == _EBML.to_bytes(4, "big"): return _mkv_keyframe_times(buf)
+        return _mp4_keyframe_times(buf)
+    except (struct.error, ValueError, IndexError, KeyError):
+        return None
+    finally:
+        buf.close()
+
+
+def native_gop_stats(filepath: str, duration: float) -> Optional["GopStats"]:
+    """
+    컨테이너 인덱스로 구한 파일 전체의 키프레임 간격 통계 (평균, 최댓값, 95백분위수)
+    키프레임이 하나뿐이면 파일 전체를 하나의 GOP로 보고 duration
+    """
+    from src.utils.keyframe_probe import keyframe_times_stats
+    if not (times := read_keyframe_times(filepath)): return None
+    return keyframe_times_stats(times, duration)
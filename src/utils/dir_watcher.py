@@ -0,0 +1,213 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+
+class _InotifyBackend:
+    """
+    Linux inotify를 ctypes로 직접 사용해 작업 경로와 모든 하위 폴더의 변경을 감시
+    """
+    _IN_MODIFY: int = 0x00000002
+    _IN_CLOSE_WRITE: int = 0x00000008
+    _IN_MOVED_FROM: int = 0x00000040
+    _IN_MOVED_TO: int = 0x00000080
+    _IN_CREATE: int = 0x00000100
+    _IN_DELETE: int = 0x00000200
+    _IN_DELETE_SELF: int = 0x00000400
+    _IN_Q_OVERFLOW: int = 0x00004000
+    _IN_IGNORED: int = 0x00008000
+    _IN_ISDIR: int = 0x40000000
+    _MASK: int = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+
+    def __init__(self, root_dir: str) -> None:
+        import ctypes
+        import ctypes.util
+
+        self._root_dir: str = root_dir
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        self._watches: Dict[int, str] = {} # watch descriptor → 상대 폴더 경로
+        self._add_tree("")
+
+    def _add_tree(self, rel_dir: str) -> None:
+        """
+        폴더와 그 하위 폴더 전체를 감시 대상에 추가
+        """
+        for current, dirnames, _ in os.walk(os.path.join(self._root_dir, rel_dir)):
+            wd: int = self._libc.inotify_add_watch(self._fd, os.fsencode(current), self._MASK)
+            if wd >= 0: self._watches[wd] = os.path.relpath(current, self._root_dir)
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+
+    def read(self, timeout: float) -> List[str]:
+        """
+        timeout(초) 동안 이벤트를 기다려 변경된 상대 경로 목록 리턴 (감시 큐가 넘치면 ["*"])
+        """
+        import select
+        import struct
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready: return []
+        try: buf: bytes = os.read(self._fd, 64 * 1024)
+        except BlockingIOError: return []
+
+        changed: List[str] = []
+        pos: int = 0
+        while pos + 16 <= len(buf):
+            wd, mask, _, name_len = struct.unpack_from("iIII", buf, pos)
+            name: str = os.fsdecode(buf[pos + 16:pos + 16 + name_len].rstrip(b"\0"))
+            pos += 16 + name_len
+
+            if mask & self._IN_Q_OVERFLOW:
+                changed.append("*")
+                continue
+            if mask & self._IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if (rel_dir := self._watches.get(wd)) is None: continue
+
+            rel_path: str = os.path.normpath(os.path.join(rel_dir, name)) if name else rel_dir
+            if mask & self._IN_ISDIR and mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                self._add_tree(rel_path) # 새로 생긴 폴더도 감시
+            changed.append(rel_path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """
+    inotify를 쓸 수 없는 환경에서 일정 간격으로 작업 경로를 다시 읽어 변경을 비교
+    """
+
+    def __init__(self, root_dir: str, interval: float, stop: threading.Event) -> None:
+        self._root_dir: str = root_dir
+        self._interval: float = interval
+        self._stop: threading.Event = stop # 감시 종료 시 대기를 바로 끝내기 위한 이벤트
+        self._snapshot: Dict[str, tuple] = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot: Dict[str, tuple] = {}
+        for current, dirnames, filenames in os.walk(self._root_dir):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                path: str = os.path.join(current, name)
+                try: st: os.stat_result = os.stat(path)
+                except OSError: continue
+                snapshot[os.path.relpath(path, self._root_dir)] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def read(self, timeout: float) -> List[str]:
+        if self._stop.wait(max(timeout, self._interval)): return []
+        current: Dict[str, tuple] = self._scan()
+        changed: List[str] = [p for p in current.keys() | self._snapshot.keys() if current.get(p) != self._snapshot.get(p)]
+        self._snapshot = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class DirWatcher:
+    """
+    작업 경로의 파일 변경을 백그라운드 스레드에서 감시하는 클래스
+    - Linux는 inotify, 그 외 환경은 주기적인 폴더 비교(polling) 사용
+    - 마지막 변경 후 settle_seconds 동안 추가 변경이 없으면 on_settled 호출 (쓰기가 끝난 파일만 분석하기 위함)
+    """
+
+    def __init__(self, root_dir: str, on_settled: Callable[[], None], settle_seconds: Optional[float] = None) -> None:
+        from src.utils.load_env import load_env
+
+        self._root_dir: str = root_dir
+        self._on_settled: Callable[[], None] = on_settled
+        self._settle_seconds: float = float(load_env("WATCH_SETTLE_SECONDS")) if settle_seconds is None else settle_seconds
+        self._poll_interval: float = float(load_env("WATCH_POLL_INTERVAL"))
+        self._lock: threading.Lock = threading.Lock()
+        self._stop: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._recent: Dict[str, float] = {} # 최근 변경된 상대 경로 → 마지막 변경 시각
+        self._last_event: float = 0.0
+        self._dirty: bool = False # 마지막 반영 이후 변경이 있었는지 여부
+        self.backend: str = ""
+
+    def start(self) -> None:
+        """
+        감시 시작 (inotify를 쓸 수 없으면 polling으로 대체)
+        """
+        import sys
+        if self._thread is not None: return
+
+        backend: _InotifyBackend | _PollingBackend
+        try:
+            if not sys.platform.startswith("linux"): raise OSError("inotify는 Linux에서만 사용 가능")
+            backend = _InotifyBackend(self._root_dir)
+            self.backend = "inotify"
+        except (OSError, AttributeError):
+            backend = _PollingBackend(self._root_dir, self._poll_interval, self._stop)
+            self.backend = "polling"
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(backend,), name="DirWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        감시 종료 (감시 스레드가 끝날 때까지 대기)
+        """
+        if self._thread is None: return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    @property
+    def running(self) -> bool: return self._thread is not None
+
+    def take_changes(self) -> bool:
+        """
+        마지막 호출 이후 변경이 있었는지 리턴하고 변경 표시를 지움
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, False
+            return dirty
+
+    def mark_dirty(self) -> None:
+        """
+        아직 반영하지 못한 변경이 남아 있음을 표시 (다음 안정화 시점에 다시 반영)
+        """
+        import time
+        with self._lock:
+            self._dirty = True
+            self._last_event = time.monotonic()
+
+    def unsettled(self) -> Set[str]:
+        """
+        마지막 변경 후 settle_seconds가 지나지 않은 (쓰기 중일 수 있는) 상대 경로 목록
+        """
+        import time
+        now: float = time.monotonic()
+        with self._lock:
+            return {p for p, t in self._recent.items() if now - t < self._settle_seconds}
+
+    def _run(self, backend: "_InotifyBackend | _PollingBackend") -> None:
+        import time
+        try:
+            while not self._stop.is_set():
+                changed: List[str] = backend.read(min(0.5, self._settle_seconds))
+                now: float = time.monotonic()
+                with self._lock:
+                    for path in changed: self._recent[path] = now
+                    if changed:
+                        self._dirty = True
+                        self._last_event = now
+                    self._recent = {p: t for p, t in self._recent.items() if now - t < self._settle_seconds}
+                    settled: bool = self._dirty and now - self._last_event >= self._settle_seconds
+
+                if settled and not self._stop.is_set():
+                    try: self._on_settled()
+                    except Exception as e:
+                        self.take_changes() # 같은 오류가 반복 출력되지 않도록 다음 변경까지 대기
+                        print(f"[WARN] 작업 경로 변경 반영 실패: {e}")
+        finally:
+            backend.close()
@@ -0,0 +1,67 @@
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+# 파일 이름 출력 결과 캐시 크기 (파일 이름, 이모지 치환 여부, 최대 폭 조합 단위)
+_RENDER_CACHE_SIZE: int = 1 << 17
+
+
+@lru_cache(maxsize=None)
+def char_width(ch: str) -> int:
+    """
+    truncate_text 기준 글자 폭
+    F, W, A: Fullwidth, Wide, Ambiguous → 2칸 취급
+    """
+    return 2 if unicodedata.east_asian_width(ch) in ("F", "W", "A") else 1
+
+
+@lru_cache(maxsize=None)
+def char_kept(ch: str) -> bool:
+    """
+    sanitize_text에서 그대로 남기는 글자인지 여부 (영어 등 ASCII, 한중일 문자)
+    """
+    return ch.isascii() or (unicodedata.category(ch).startswith("L") and unicodedata.east_asian_width(ch) == "W")
+
+
+def sanitize_text(text: str) -> str:
+    """
+    영어, 한중일 문자 제외 모두 ?로 치환
+    """
+    if not text: return ""
+    if text.isascii(): return text
+    return "".join(ch if char_kept(ch) else "?" for ch in text)
+
+
+def truncate_text(text: str, max_len: int) -> str:
+    """
+    글자 폭 합이 max_len을 넘으면 잘라서 끝에 ...을 붙임
+    """
+    chars: List[str] = []
+    curr_len: int = 0
+    for ch in text:
+        ch_len: int = char_width(ch)
+        if curr_len + ch_len > max_len:
+            return "".join(chars[:-2]) + "..."
+        chars.append(ch)
+        curr_len += ch_len
+    return text
+
+
+@lru_cache(maxsize=_RENDER_CACHE_SIZE)
+def render_name(text: str, sanitize: bool, max_len: int) -> str:
+    """
+    출력용 파일 이름 (이모지 치환 후 길이 제한)
+    같은 파일 이름은 정렬 기준을 바꿔 다시 출력해도 다시 계산하지 않음
+    """
+    return truncate_text(sanitize_text(text) if sanitize else text, max_len)
+
+
+@lru_cache(maxsize=_RENDER_CACHE_SIZE)
+def text_width(text: str) -> int:
+    """
+    터미널에 표시되는 문자열 폭 (tabulate와 같은 wcwidth 기준)
+    """
+    if text.isascii() and text.isprintable(): return len(text)
+    from wcwidth import wcswidth
+    width: int = wcswidth(text)
+    return width if width >= 0 else len(text)
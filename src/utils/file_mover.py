@@ -0,0 +1,314 @@
+import os
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 작업 경로에 남기는 이동 기록 파일 (한 줄에 JSON 하나, 추가 전용)
+JOURNAL_FILENAME: str = ".video_classify_journal.jsonl"
+
+
+@dataclass(frozen=True)
+class PlannedMove:
+    """
+    작업 경로 기준 상대 경로로 표현한 파일 이동 계획
+    """
+    src: str
+    dst: str
+
+
+@dataclass
+class JournalRun:
+    """
+    이동 기록 파일에서 읽은 한 번의 이동 작업(run) 정보
+    """
+    run_id: str
+    moves: List[PlannedMove] = field(default_factory=list)
+    done: Set[int] = field(default_factory=set) # 이동이 끝난 move 번호
+    undone: Set[int] = field(default_factory=set) # 되돌린 move 번호
+    created_dirs: List[str] = field(default_factory=list) # 이 작업이 새로 만든 폴더 (상대 경로)
+    finished: bool = False # 모든 이동 시도가 끝났는지 여부 (False면 중단된 작업)
+
+
+@dataclass
+class ManifestDrift:
+    """
+    이동 기록과 실제 파일 위치를 비교한 결과
+    """
+    checked: int = 0 # 확인한 (분류되어 있어야 하는) 파일 수
+    missing: List[PlannedMove] = field(default_factory=list) # 목적지와 원래 경로 모두에 없는 파일
+    returned: List[PlannedMove] = field(default_factory=list) # 기록 없이 원래 경로로 돌아가 있는 파일
+    duplicated: List[PlannedMove] = field(default_factory=list) # 목적지와 원래 경로 모두에 있는 파일
+
+    @property
+    def ok(self) -> bool: return not (self.missing or self.returned or self.duplicated)
+
+
+class MoveJournal:
+    """
+    파일 이동을 작업 경로의 JSONL 파일에 추가 전용으로 기록하는 클래스
+    - begin: 작업 시작
+    - mkdir: 작업이 새로 만든 폴더
+    - move: 실제 이동 전에 기록하는 이동 계획 (번호, 원래 경로, 목적지)
+    - done / undo: 이동 완료 / 되돌림 완료
+    - end: 작업 종료
+    """
+
+    def __init__(self, root_dir: str) -> None:
+        self._path: str = os.path.join(root_dir, JOURNAL_FILENAME)
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def path(self) -> str: return self._path
+
+    def append(self, records: Iterable[Dict[str, object]], sync: bool = False) -> None:
+        """
+        기록 여러 개를 한 번에 추가. sync가 True면 디스크까지 반영(fsync)
+        """
+        lines: str = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        if not lines: return
+        with self._lock, open(self._path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            if sync: os.fsync(f.fileno())
+
+    def read(self) -> Dict[str, JournalRun]:
+        """
+        기록 파일을 읽어 작업별 정보 리턴 (기록된 순서 유지)
+        중단으로 마지막 줄이 잘린 경우 그 줄은 무시
+        """
+        runs: Dict[str, JournalRun] = {}
+        if not os.path.exists(self._path): return runs
+
+        with open(self._path, encoding="utf-8") as f:
+            for line in f:
+                try: record: Dict[str, object] = json.loads(line)
+                except json.JSONDecodeError: continue
+
+                run: JournalRun = runs.setdefault(str(record.get("run")), JournalRun(str(record.get("run"))))
+                op = record.get("op")
+                if op == "mkdir": run.created_dirs.append(str(record["dir"]))
+                elif op == "move": run.moves.append(PlannedMove(str(record["src"]), str(record["dst"])))
+                elif op == "done": run.done.add(int(record["id"])) # type: ignore[arg-type]
+                elif op == "undo": run.undone.add(int(record["id"])) # type: ignore[arg-type]
+                elif op == "end": run.finished = True
+        return runs
+
+
+class FileMover:
+    """
+    파일 이동을 계획 → 폴더 생성 → 이동 순서로 한 번에 처리하는 클래스
+    - 목적지를 먼저 모두 계산하고, 폴더는 한 번씩만 생성
+    - 같은 파일 시스템이면 os.rename, 다른 장치로의 이동(복사)은 제한된 스레드 풀에서 처리
+    - 모든 이동을 기록 파일(MoveJournal)에 남겨, 중단된 작업의 재개/되돌리기가 가능
+    """
+
+    def __init__(self, root_dir: str) -> None:
+        self._root_dir: str = root_dir
+        self._journal: MoveJournal = MoveJournal(root_dir)
+        self._current_run: str = "" # 기록 중인 작업 id
+
+    @property
+    def journal(self) -> MoveJournal: return self._journal
+
+    def _abs(self, rel_path: str) -> str:
+        return os.path.join(self._root_dir, rel_path)
+
+    def plan(self, targets: Iterable[Tuple[str, str]]) -> List[PlannedMove]:
+        """
+        (파일이름, 이동할 폴더) 목록으로 이동 계획 생성
+        파일은 폴더 바로 아래로 이동하며, 원래 경로와 같거나 목적지가 겹치는 항목은 제외
+        """
+        moves: List[PlannedMove] = []
+        claimed: Set[str] = set()
+        for filename, dirname in targets:
+            dst: str = os.path.join(dirname, os.path.basename(filename))
+            if os.path.normpath(dst) == os.path.normpath(filename): continue
+            if dst in claimed:
+                print(f"[WARN] '{filename}' 파일은 '{dirname}' 폴더에 같은 이름의 파일이 예정되어 있어 이동하지 않습니다.")
+                continue
+            claimed.add(dst)
+            moves.append(PlannedMove(filename, dst))
+        return moves
+
+    def _make_dirs(self, run_id: str, moves: List[PlannedMove]) -> None:
+        """
+        목적지 폴더를 한 번씩만 생성하고, 새로 만든 폴더를 기록
+        """
+        created: List[str] = []
+        for rel_dir in sorted({os.path.dirname(m.dst) for m in moves}):
+            if not rel_dir or os.path.isdir(self._abs(rel_dir)): continue
+            # 중첩 폴더(예: '_키프레임조정/16-9')는 새로 만든 상위 폴더도 기록해, 되돌릴 때 바깥 폴더까지 삭제
+            parts: List[str] = os.path.normpath(rel_dir).split(os.sep)
+            for depth in range(1, len(parts) + 1):
+                sub_dir: str = os.path.join(*parts[:depth])
+                if os.path.isdir(self._abs(sub_dir)): continue
+                os.mkdir(self._abs(sub_dir))
+                created.append(sub_dir)
+        self._journal.append(({"op": "mkdir", "run": run_id, "dir": d} for d in created), sync=True)
+
+    def _transfer(self, moves: List[Tuple[int, PlannedMove]], reverse: bool) -> List[Tuple[PlannedMove, OSError]]:
+        """
+        번호가 붙은 이동 목록을 실행하고 (실패한 이동, 오류) 목록 리턴
+        같은 장치는 os.rename(MOVE_RENAME_WORKERS개 동시 실행), 다른 장치는 별도 스레드 풀에서 shutil.move(복사 후 삭제)
+        reverse가 True면 목적지 → 원래 경로로 되돌림
+        완료 기록은 묶어서 남김 (기록 전에 중단되어도 resume이 실제 파일 위치로 완료 여부를 판별)
+        """
+        import shutil
+        from concurrent.futures import ThreadPoolExecutor
+        from src.utils.load_env import load_env
+
+        failed: List[Tuple[PlannedMove, OSError]] = []
+        finished: List[int] = []
+        cross_device: List[Tuple[int, PlannedMove, str, str]] = []
+        dev_cache: Dict[str, int] = {}
+
+        def device_of(dirpath: str) -> int:
+            if dirpath not in dev_cache: dev_cache[dirpath] = os.stat(dirpath).st_dev
+            return dev_cache[dirpath]
+
+        def rename(item: Tuple[int, PlannedMove]) -> Optional[Tuple[PlannedMove, OSError]]:
+            move_id, move = item
+            src, dst = (self._abs(move.dst), self._abs(move.src)) if reverse else (self._abs(move.src), self._abs(move.dst))
+            try:
+                if os.path.lexists(dst):
+                    raise FileExistsError(f"목적지에 같은 이름의 파일이 존재합니다: '{dst}'")
+                if os.stat(src).st_dev != device_of(os.path.dirname(dst)):
+                    cross_device.append((move_id, move, src, dst))
+                    return None
+                os.rename(src, dst)
+            except OSError as e:
+                return move, e
+            finished.append(move_id)
+            return None
+
+        # 목적지가 모두 다르므로 이름 변경은 여러 스레드에서 동시에 실행 (네트워크 드라이브 지연 감소)
+        with ThreadPoolExecutor(max_workers=max(1, int(load_env("MOVE_RENAME_WORKERS")))) as exe:
+            failed.extend(r for r in exe.map(rename, moves) if r is not None)
+
+        if cross_device:
+            def copy_move(item: Tuple[int, PlannedMove, str, str]) -> Optional[Tuple[PlannedMove, OSError]]:
+                move_id, move, src, dst = item
+                try: shutil.move(src, dst)
+                except OSError as e: return move, e
+                finished.append(move_id)
+                return None
+
+            with ThreadPoolExecutor(max_workers=max(1, int(load_env("MOVE_COPY_WORKERS")))) as exe:
+                failed.extend(r for r in exe.map(copy_move, cross_device) if r is not None)
+
+        op: str = "undo" if reverse else "done"
+        self._journal.append(({"op": op, "run": self._current_run, "id": move_id} for move_id in finished), sync=True)
+        return failed
+
+    def execute(self, moves: List[PlannedMove]) -> List[Tuple[PlannedMove, OSError]]:
+        """
+        이동 계획을 기록 파일에 먼저 남긴 뒤 실행하고, (실패한 이동, 오류) 목록 리턴
+        """
+        import time
+        import uuid
+
+        if not moves: return []
+        self._current_run = uuid.uuid4().hex
+        self._journal.append(
+            [{"op": "begin", "run": self._current_run, "time": time.time()}] +
+            [{"op": "move", "run": self._current_run, "id": i, "src": m.src, "dst": m.dst} for i, m in enumerate(moves)],
+            sync=True
+        )
+        self._make_dirs(self._current_run, moves)
+        failed: List[Tuple[PlannedMove, OSError]] = self._transfer(list(enumerate(moves)), reverse=False)
+        self._journal.append([{"op": "end", "run": self._current_run}], sync=True)
+        return failed
+
+    def interrupted_runs(self) -> List[JournalRun]:
+        """
+        종료 기록(end)이 없는, 중간에 중단된 작업 목록
+        """
+        return [run for run in self._journal.read().values() if not run.finished and run.moves]
+
+    def resume(self, run: JournalRun) -> List[Tuple[PlannedMove, OSError]]:
+        """
+        중단된 작업에서 아직 끝나지 않은 이동을 마저 실행
+        이미 목적지에 있고 원래 경로에 없는 파일은 완료로 기록만 함
+        """
+        self._current_run = run.run_id
+        pending: List[Tuple[int, PlannedMove]] = []
+        for move_id, move in enumerate(run.moves):
+            if move_id in run.done: continue
+            if not os.path.lexists(self._abs(move.src)) and os.path.lexists(self._abs(move.dst)):
+                self._journal.append([{"op": "done", "run": run.run_id, "id": move_id}])
+                continue
+            pending.append((move_id, move))
+
+        self._make_dirs(run.run_id, [m for _, m in pending])
+        failed: List[Tuple[PlannedMove, OSError]] = self._transfer(pending, reverse=False)
+        self._journal.append([{"op": "end", "run": run.run_id}], sync=True)
+        return failed
+
+    def rollback(self, run: JournalRun) -> Tuple[List[PlannedMove], List[Tuple[PlannedMove, OSError]]]:
+        """
+        작업의 이동을 역순으로 되돌리고, 작업이 새로 만든 폴더 중 비어 있는 폴더 삭제
+        (되돌린 이동 목록, (실패한 이동, 오류) 목록) 리턴
+        목적지에 파일이 없는(이동 전에 중단되었거나 이미 되돌린) 항목은 건너뜀
+        """
+        self._current_run = run.run_id
+        targets: List[Tuple[int, PlannedMove]] = [
+            (move_id, move) for move_id, move in reversed(self.active_moves(run))
+            if os.path.lexists(self._abs(move.dst))
+        ]
+        failed: List[Tuple[PlannedMove, OSError]] = self._transfer(targets, reverse=True)
+        failed_moves: Set[PlannedMove] = {m for m, _ in failed}
+
+        for rel_dir in reversed(run.created_dirs):
+            try: os.rmdir(self._abs(rel_dir))
+            except OSError: pass # 다른 파일이 남아 있는 폴더는 유지
+        self._journal.append([{"op": "end", "run": run.run_id}], sync=True)
+        return [m for _, m in targets if m not in failed_moves], failed
+
+    def active_moves(self, run: JournalRun) -> List[Tuple[int, PlannedMove]]:
+        """
+        작업의 이동 중 아직 되돌리지 않은 (분류된 상태여야 하는) 이동 목록
+        중단된 작업은 완료 기록이 빠졌을 수 있으므로 목적지에 파일이 있는 이동도 포함
+        """
+        return [
+            (move_id, move) for move_id, move in enumerate(run.moves)
+            if move_id not in run.undone and (move_id in run.done or (not run.finished and os.path.lexists(self._abs(move.dst))))
+        ]
+
+    def restore_all(self) -> Tuple[List[PlannedMove], List[Tuple[PlannedMove, OSError]]]:
+        """
+        기록된 모든 작업을 최근 작업부터 되돌림 (기록에 있는 파일과 작업이 만든 폴더만 대상)
+        (되돌린 이동 목록, (실패한 이동, 오류) 목록) 리턴
+        """
+        restored: List[PlannedMove] = []
+        failed: List[Tuple[PlannedMove, OSError]] = []
+        for run in reversed(list(self._journal.read().values())):
+            if not self.active_moves(run): continue
+            run_restored, run_failed = self.rollback(run)
+            restored.extend(run_restored)
+            failed.extend(run_failed)
+        return restored, failed
+
+    def verify(self) -> ManifestDrift:
+        """
+        되돌리지 않은 이동 기록과 실제 파일 위치를 비교 (파일마다 존재 여부만 확인)
+        """
+        drift: ManifestDrift = ManifestDrift()
+        for run in self._journal.read().values():
+            for _, move in self.active_moves(run):
+                drift.checked += 1
+                at_dst: bool = os.path.lexists(self._abs(move.dst))
+                at_src: bool = os.path.lexists(self._abs(move.src))
+                if at_dst and at_src: drift.duplicated.append(move)
+                elif at_src: drift.returned.append(move)
+                elif not at_dst: drift.missing.append(move)
+        return drift
+
+    def discard_settled_journal(self) -> bool:
+        """
+        모든 작업이 끝났고 되돌리지 않은 이동이 없으면 기록 파일 삭제 후 True 리턴
+        """
+        runs: Dict[str, JournalRun] = self._journal.read()
+        if any(not run.finished or self.active_moves(run) for run in runs.values()): return False
+        if os.path.exists(self._journal.path): os.remove(self._journal.path)
+        return True
@@ -1,5 +1,65 @@
 import os
 import shutil
+import fnmatch
+from dataclasses import dataclass, field
+from typing import FrozenSet, Iterable, Iterator, Tuple
+
+# 파일 동일성 판별용 (inode, 크기, 수정 시각(ns)), inode를 싸게 얻을 수 없는 OS에서는 inode == 0
+FileIdentity = Tuple[int, int, int]
+
+
+def _split_csv(value: str) -> Tuple[str, ...]:
+    return tuple(v.strip() for v in value.split(",") if v.strip())
+
+
+@dataclass(frozen=True)
+class ScanOptions:
+    """
+    작업 경로에서 분석 대상 파일을 고르는 조건에 대한 데이터클래스
+    """
+    max_depth: int = 0 # 하위 폴더 탐색 깊이 (0: 작업 경로만, -1: 제한 없음)
+    extensions: FrozenSet[str] = frozenset() # 허용 확장자 (소문자, '.' 포함), 비어 있으면 모두 허용
+    include_globs: Tuple[str, ...] = () # 하나라도 일치해야 대상 (비어 있으면 모두 대상)
+    exclude_globs: Tuple[str, ...] = () # 일치하는 파일/폴더는 제외
+    skip_dirnames: FrozenSet[str] = field(default_factory=frozenset) # 탐색하지 않는 폴더 이름 (분류 폴더 등)
+
+    @classmethod
+    def from_env(cls, skip_dirnames: Iterable[str] = ()) -> "ScanOptions":
+        """
+        .env 설정값으로 ScanOptions 생성
+        """
+        from src.utils.load_env import load_env
+        return cls(
+            max_depth = int(load_env("SCAN_MAX_DEPTH")),
+            extensions = frozenset(e.lower() if e.startswith(".") else f".{e.lower()}" for e in _split_csv(load_env("VIDEO_EXTENSIONS"))),
+            include_globs = _split_csv(load_env("SCAN_INCLUDE_GLOBS")),
+            exclude_globs = _split_csv(load_env("SCAN_EXCLUDE_GLOBS")),
+            skip_dirnames = frozenset(skip_dirnames)
+        )
+
+    def _matches(self, rel_path: str, globs: Tuple[str, ...]) -> bool:
+        rel_path = rel_path.replace(os.sep, "/")
+        name: str = rel_path.rsplit("/", 1)[-1]
+        return any(fnmatch.fnmatch(rel_path, g) or fnmatch.fnmatch(name, g) for g in globs)
+
+    def accepts_extension(self, name: str) -> bool:
+        return not self.extensions or os.path.splitext(name)[1].lower() in self.extensions
+
+    def accepts_file(self, rel_path: str) -> bool:
+        '''
+        확장자와 include/exclude 조건을 모두 만족하는 파일인지 확인
+        '''
+        if not self.accepts_extension(rel_path): return False
+        if self.include_globs and not self._matches(rel_path, self.include_globs): return False
+        return not self._matches(rel_path, self.exclude_globs)
+
+    def accepts_dir(self, rel_dir: str, depth: int) -> bool:
+        '''
+        depth 깊이의 하위 폴더(rel_dir)를 탐색 대상으로 볼지 확인
+        '''
+        if self.max_depth >= 0 and depth > self.max_depth: return False
+        if os.path.basename(rel_dir) in self.skip_dirnames: return False
+        return not self._matches(rel_dir, self.exclude_globs)
 
 def get_filenames(target_root_dir: str) -> list[str]:
     '''
@@ -9,6 +69,49 @@ def get_filenames(target_root_dir: str) -> list[str]:
     return [f for f in items if os.path.isfile(os.path.join(target_root_dir, f))]
 
 
+def walk_files(
+        target_root_dir: str,
+        options: ScanOptions,
+        include_out_of_scope: bool = False) -> Iterator[Tuple[str, str, FileIdentity, bool]]:
+    '''
+    os.scandir 기반으로 파일을 순회하며 (상대 폴더 경로, 파일이름, FileIdentity, 분석 대상 여부) 리턴
+    - 폴더/파일 구분은 d_type으로 하고, 확장자가 맞는 파일만 stat 수행
+    - include_out_of_scope가 True면 분석 대상이 아닌 폴더(분류 폴더, 깊이 초과 등)의 비디오 파일도 함께 리턴
+    '''
+    use_inode: bool = os.name != "nt" # Windows는 inode를 얻으려면 파일마다 stat이 추가로 필요
+    pending: list[Tuple[str, int, bool]] = [("", 0, True)]
+
+    while pending:
+        rel_dir, depth, in_scope = pending.pop()
+        try:
+            with os.scandir(os.path.join(target_root_dir, rel_dir)) as it:
+                for entry in it:
+                    rel_path: str = os.path.join(rel_dir, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_in_scope: bool = in_scope and options.accepts_dir(rel_path, depth + 1)
+                        if sub_in_scope or include_out_of_scope:
+                            pending.append((rel_path, depth + 1, sub_in_scope))
+                        continue
+                    if not entry.is_file() or not options.accepts_extension(entry.name):
+                        continue
+
+                    file_in_scope: bool = in_scope and options.accepts_file(rel_path)
+                    if not file_in_scope and not include_out_of_scope:
+                        continue
+                    try: st: os.stat_result = entry.stat()
+                    except OSError: continue # 순회 도중 삭제된 파일
+                    yield rel_dir, entry.name, (entry.inode() if use_inode else 0, st.st_size, st.st_mtime_ns), file_in_scope
+        except OSError:
+            continue
+
+
+def get_video_filenames(target_root_dir: str, options: ScanOptions) -> list[str]:
+    '''
+    지정한 경로에서 분석 대상 비디오 파일의 상대경로 list[str] 리턴
+    '''
+    return [os.path.join(rel_dir, name) for rel_dir, name, _, _ in walk_files(target_root_dir, options)]
+
+
 def get_dirnames(target_root_dir: str) -> list[str]:
     '''
     지정한 경로의 폴더이름 list[str] 리턴
@@ -35,4 +138,4 @@ def file_exists_in(target_root_dir: str, filename: str) -> bool:
     '''
     target_root_dir 내 지정한 파일이 있는지 확인
     '''
-    return os.path.exists(os.path.join(target_root_dir, filename))
\ No newline at end of file
+    return os.path.exists(os.path.join(target_root_dir, filename))
@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 키프레임 탐색 구간(초), 앞 구간에서 키프레임 2개 이상을 찾으면 다음 구간은 보지 않음 (frames 방식)
+KEYFRAME_LIMITS: Tuple[float, ...] = (2.1, 5.1, 10)
+
+# KEYFRAME_STATISTIC 값 → VideoProps 필드 이름
+KEYFRAME_STATISTICS: Dict[str, str] = {"mean": "keyframe_interval", "max": "keyframe_max", "p95": "keyframe_p95"}
+
+
+@dataclass(frozen=True)
+class GopStats:
+    """
+    키프레임 간격(GOP 길이, 초) 통계
+    """
+    mean: float
+    max: float
+    p95: float
+
+    @staticmethod
+    def of(intervals: Sequence[float]) -> "GopStats":
+        """
+        키프레임 간격 목록의 평균, 최댓값, 95백분위수 (nearest-rank), 목록은 비어 있으면 안 됨
+        """
+        ordered: List[float] = sorted(intervals)
+        rank: int = max(1, -(-95 * len(ordered) // 100)) # ceil(0.95 * n)
+        return GopStats(sum(ordered) / len(ordered), ordered[-1], ordered[rank - 1])
+
+    @staticmethod
+    def constant(interval: float) -> "GopStats":
+        return GopStats(interval, interval, interval)
+
+
+def keyframe_times_stats(times: Sequence[float], duration: float) -> Optional[GopStats]:
+    """
+    파일 전체의 키프레임 시각 목록으로 구한 통계
+    키프레임이 하나뿐이면 파일 전체를 하나의 GOP로 보고 duration, 구할 수 없으면 None
+    """
+    if not times: return None
+    if len(times) < 2: return GopStats.constant(float(duration)) if duration > 0 else None
+    return GopStats.of([b - a for a, b in zip(times[:-1], times[1:])])
+
+
+def profile_windows(duration: float, points: int, window: float) -> Tuple[Tuple[float, float], ...]:
+    """
+    GOP를 측정할 (시작 시각, 길이) 구간 목록: 처음, 끝과 그 사이에 고르게 points개
+    영상이 구간 합보다 짧거나 길이를 모르면 처음부터 한 구간
+    """
+    points = max(1, points)
+    if duration <= 0: return ((0.0, window),)
+    if points == 1 or duration <= window * points: return ((0.0, min(duration, window * points)),)
+    return tuple((round((duration - window) * i / (points - 1), 3), window) for i in range(points))
+
+
+def gop_probe_args(filepath: str, windows: Sequence[Tuple[float, float]]) -> List[str]:
+    """
+    디코딩 없이 여러 구간의 비디오 패킷 (pts_time, size, flags)만 한 줄씩 출력하는 ffprobe 명령 (구간 순서대로 출력)
+    """
+    return [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,size,flags",
+        "-read_intervals", ",".join(f"{start}%+{length}" for start, length in windows),
+        "-of", "csv=p=0",
+        filepath
+    ]
+
+
+class GopProfiler:
+    """
+    여러 구간을 이어서 출력하는 ffprobe 패킷 출력을 한 줄씩 받아 구간별로 키프레임 간격을 모으는 클래스
+    패킷 시각이 현재 구간의 끝을 넘으면 다음 구간의 출력으로 판단
+    구간 경계를 넘는 간격은 사이를 읽지 않았으므로 세지 않으며,
+    키프레임이 1개인 구간은 그 앞뒤 중 긴 쪽, 없는 구간은 구간 길이를 (GOP의 최소 길이로) 간격으로 기록
+    읽은 패킷 크기 합이 예산(budget_bytes)을 넘으면 바로 종료 가능
+    """
+
+    def __init__(self, windows: Sequence[Tuple[float, float]], budget_bytes: int) -> None:
+        self._windows: Tuple[Tuple[float, float], ...] = tuple(windows)
+        self._budget_bytes: int = budget_bytes
+        self._total: int = 0
+        self._intervals: List[float] = []
+        self._keyframes: List[float] = [] # 현재 구간의 키프레임 시각
+        self._first_pts: Optional[float] = None # 현재 구간에서 처음 읽은 패킷 시각
+        self._last_pts: float = 0.0 # 현재 구간에서 마지막으로 읽은 패킷 시각
+        self._index: int = 0 # 현재 구간 번호
+        self._exhausted: bool = False
+
+    @property
+    def exhausted(self) -> bool: return self._exhausted
+
+    def stop(self) -> None:
+        """
+        시간 예산을 넘긴 경우 등 더 읽지 않음 (현재 구간은 키프레임이 2개 이상일 때만 반영)
+        """
+        self._exhausted = True
+
+    def start_window(self, index: int) -> None:
+        """
+        현재 구간을 마무리하고 index번 구간 시작
+        """
+        self._close_window()
+        self._index = index
+
+    def _window_end(self) -> float:
+        start, length = self._windows[self._index]
+        return start + length
+
+    def _close_window(self) -> None:
+        if len(self._keyframes) >= 2:
+            self._keyframes.sort()
+            closed: List[float] = [b - a for a, b in zip(self._keyframes[:-1], self._keyframes[1:])]
+            self._intervals.extend(closed)
+            # 마지막 키프레임 이후가 앞의 간격보다 길면 그보다 긴 GOP가 시작된 것이므로 최소 길이로 기록
+            if (open_span := self._last_pts - self._keyframes[-1]) > max(closed): self._intervals.append(open_span)
+        elif self._first_pts is not None and not self._exhausted: # 예산 때문에 중간에 멈춘 구간, 패킷이 없는 구간은 판정하지 않음
+            if self._keyframes:
+                self._intervals.append(max(self._keyframes[0] - self._first_pts, self._last_pts - self._keyframes[0]))
+            else:
+                self._intervals.append(self._windows[self._index][1])
+        self._keyframes = []
+        self._first_pts = None
+        self._last_pts = 0.0
+
+    def feed(self, line: str) -> bool:
+        """
+        'pts_time,size,flags' 한 줄을 반영하고, 읽기 예산을 다 썼으면 True 리턴
+        """
+        if self._exhausted: return True
+        parts: List[str] = line.strip().split(",")
+        try: pts, size = float(parts[0]), int(parts[1])
+        except (ValueError, IndexError): return False # pts가 N/A인 패킷
+
+        while self._index + 1 < len(self._windows) and pts > self._window_end():
+            self.start_window(self._index + 1)
+        if "K" in parts[-1]: self._keyframes.append(pts)
+        self._first_pts = pts if self._first_pts is None else min(self._first_pts, pts)
+        self._last_pts = max(self._last_pts, pts)
+        self._total += size
+        self._exhausted = self._total >= self._budget_bytes
+        return self._exhausted
+
+    def result(self) -> GopStats:
+        """
+        지금까지 읽은 구간의 통계 (판정한 구간이 없으면 마지막 구간 길이)
+        """
+        if self._windows: self._close_window()
+        if self._intervals: return GopStats.of(self._intervals)
+        return GopStats.constant(self._windows[-1][1] if self._windows else float(KEYFRAME_LIMITS[-1]))
+
+
+def profile_gop(filepath: str, windows: Sequence[Tuple[float, float]], budget_bytes: int, timeout: float) -> GopStats:
+    """
+    ffprobe 한 번으로 여러 구간의 패킷 키프레임 플래그만 스트리밍으로 읽어 GOP 통계를 구함
+    읽은 패킷 크기 합이 budget_bytes를 넘거나 timeout(초)을 넘기면 ffprobe를 바로 종료하고 남은 구간은 읽지 않음
+    """
+    import subprocess
+    import threading
+
+    profiler: GopProfiler = GopProfiler(windows, budget_bytes)
+    if not windows: return profiler.result()
+    proc: subprocess.Popen = subprocess.Popen(
+        gop_probe_args(filepath, windows),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=1
+    )
+    timed_out: threading.Event = threading.Event()
+
+    def expire() -> None:
+        timed_out.set()
+        proc.kill()
+
+    timer: threading.Timer = threading.Timer(timeout, expire)
+    timer.start()
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if profiler.feed(line): break
+    finally:
+        timer.cancel()
+        if proc.poll() is None: proc.kill()
+        proc.wait()
+    if timed_out.is_set(): profiler.stop() # 시간 예산을 넘겨 중간에 멈춘 구간은 판정하지 않음
+
+    return profiler.result()
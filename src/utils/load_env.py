@@ -1,3 +1,8 @@
+import os
+import threading
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
 default_configs: dict[str, str] = {
     "THRESHOLD_RATIO_DIFF": "0.2",
     "BASE_RESOLUTION_WIDTH": "1280",
@@ -6,31 +11,239 @@ default_configs: dict[str, str] = {
     "THRESHOLD_OPTIMAL_BITRATE_RATE": "1.5",
     "THRESHOLD_KEYFRAME_INTERVAL": "2.2", 
     "TABULATE_FLOATFMT": ".3f",
-    "TABULATE_FILENAME_MAXLEN": "35"
+    "TABULATE_FILENAME_MAXLEN": "35",
+    "PROBE_CACHE_ENABLED": "1",
+    "PROBE_CACHE_PATH": ".probe_cache.sqlite3",
+    "VIDEO_EXTENSIONS": ".mp4,.m4v,.mov,.mkv,.webm,.avi,.wmv,.flv,.ts,.m2ts,.mts,.mpg,.mpeg,.3gp",
+    "SCAN_MAX_DEPTH": "0",
+    "SCAN_INCLUDE_GLOBS": "",
+    "SCAN_EXCLUDE_GLOBS": "",
+    "NATIVE_PROBE_ENABLED": "1",
+    "KEYFRAME_PROBE_MODE": "packets",
+    "KEYFRAME_PROBE_TIMEOUT": "30",
+    "KEYFRAME_STATISTIC": "mean",
+    "KEYFRAME_PROFILE_POINTS": "3",
+    "KEYFRAME_PROFILE_WINDOW": "10",
+    "KEYFRAME_PROFILE_BUDGET_MB": "16",
+    "PROBE_ENGINE": "async",
+    "PROBE_CONCURRENCY": "0",
+    "WORKER_POOL_SIZE": "0",
+    "WORKER_POOL_CHUNKSIZE": "0",
+    "MOVE_COPY_WORKERS": "4",
+    "MOVE_RENAME_WORKERS": "8",
+    "WATCH_SETTLE_SECONDS": "2",
+    "WATCH_POLL_INTERVAL": "5",
+    "METRICS_ENABLED": "0",
+    "METRICS_TOP_N": "10",
+    "WORK_QUEUE_PATH": ".work_queue.sqlite3",
+    "WORK_QUEUE_SHARD_SIZE": "200",
+    "WORK_QUEUE_LEASE_SECONDS": "600",
+    "BITRATE_SAMPLE_WINDOWS": "3",
+    "BITRATE_SAMPLE_SECONDS": "5",
+    "BITRATE_SAMPLE_BUDGET_MB": "32"
 }
 
-def load_env(key: str) -> str:
-    '''
-    key와 대응하는 .env 값을 가져옴
-    '''
-    from dotenv import load_dotenv
-    import os
 
-    load_dotenv()
-    return os.environ.get(key) or default_configs[key]
 
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    .env(환경 변수 우선) 값과 .rootdir 경로를 타입 변환해 둔 설정 스냅샷
+    필드 이름은 default_configs 키의 소문자 (예: BASE_TARGET_BITRATE → base_target_bitrate)
+    """
+    threshold_ratio_diff: float
+    base_resolution_width: int
+    base_resolution_height: int
+    base_target_bitrate: int
+    threshold_optimal_bitrate_rate: float
+    threshold_keyframe_interval: float
+    tabulate_floatfmt: str
+    tabulate_filename_maxlen: int
+    probe_cache_enabled: bool
+    probe_cache_path: str
+    video_extensions: str
+    scan_max_depth: int
+    scan_include_globs: str
+    scan_exclude_globs: str
+    native_probe_enabled: bool
+    keyframe_probe_mode: str
+    keyframe_probe_timeout: float
+    keyframe_statistic: str
+    keyframe_profile_points: int
+    keyframe_profile_window: float
+    keyframe_profile_budget_mb: float
+    probe_engine: str
+    probe_concurrency: int
+    worker_pool_size: int
+    worker_pool_chunksize: int
+    move_copy_workers: int
+    move_rename_workers: int
+    watch_settle_seconds: float
+    watch_poll_interval: float
+    metrics_enabled: bool
+    metrics_top_n: int
+    work_queue_path: str
+    work_queue_shard_size: int
+    work_queue_lease_seconds: float
+    bitrate_sample_windows: int
+    bitrate_sample_seconds: float
+    bitrate_sample_budget_mb: float
+    values: Mapping[str, str] # 키 → 문자열 값 (load_env용)
+    root_dir: Optional[str] # .rootdir 경로 (파일이 없거나 읽을 수 없으면 None)
 
-def get_root_dir() -> str:
+    @staticmethod
+    def parse(values: Mapping[str, str], root_dir: Optional[str]) -> "Config":
+        """
+        문자열 값을 필드 타입에 맞게 변환해 Config 생성
+        """
+        converters: Dict[object, Callable[[str], object]] = {int: int, float: float, bool: _parse_flag, str: str}
+        parsed: Dict[str, object] = {
+            f.name: converters[f.type](values[f.name.upper()])
+            for f in fields(Config) if f.name not in ("values", "root_dir")
+        }
+        return Config(**parsed, values=dict(values), root_dir=root_dir)
+
+
+ConfigListener = Callable[[Config, Config], None] # (이전 설정, 새 설정)
+
+
+def _parse_flag(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class _ConfigState:
+    """
+    설정 스냅샷과 다시 읽기 판단 정보 보관
+    .env, .rootdir의 수정 시각과 관련 환경 변수 값이 바뀐 경우에만 파일을 다시 읽음
     """
-    .rootdir 파일에서 경로를 매번 읽어옴 (프로그램 재시작 불필요)
+    lock: threading.Lock = threading.Lock()
+    snapshot: Optional[Config] = None
+    stamp: Optional[Tuple[object, ...]] = None
+    checked_at: float = 0.0 # 마지막으로 변경 여부를 확인한 시각 (time.monotonic)
+    listeners: List[Callable[[], Optional[ConfigListener]]] = [] # 약한 참조(또는 함수를 리턴하는 람다) 목록
+
+
+_CHECK_INTERVAL: float = 1.0 # 변경 여부 확인 최소 간격(초), 이 간격 안에서는 확인 없이 스냅샷을 바로 리턴
+
+
+def _mtime(path: str) -> Optional[int]:
+    try: return os.stat(path).st_mtime_ns
+    except OSError: return None
+
+
+def _read_root_dir() -> str:
+    """
+    .rootdir 파일에서 경로를 읽어옴
     큰따옴표 불필요, 경로만 입력
     """
-    import os
-    rootdir_path: str = os.path.join(os.path.dirname(__file__), '..', '..', '.rootdir')
+    rootdir_path: str = get_project_path('.rootdir')
     try:
         with open(rootdir_path, 'r', encoding='utf-8') as f:
             return f.read().strip()
     except FileNotFoundError:
         raise FileNotFoundError(f".rootdir 파일을 찾을 수 없습니다: {rootdir_path}")
     except Exception as e:
-        raise RuntimeError(f".rootdir 파일 읽기 오류: {e}")
\ No newline at end of file
+        raise RuntimeError(f".rootdir 파일 읽기 오류: {e}")
+
+
+def _load_config() -> Config:
+    """
+    .env와 .rootdir를 읽어 새 Config 생성 (환경 변수 > .env > 기본값 순서로 적용)
+    """
+    env_path: str = get_project_path('.env')
+    file_values: Dict[str, Optional[str]] = {}
+    if os.path.isfile(env_path):
+        from dotenv import dotenv_values # .env가 없으면 불러오지 않음 (CLI 시작 시간 단축)
+        file_values = dotenv_values(env_path)
+    values: Dict[str, str] = {
+        key: os.environ.get(key) or file_values.get(key) or default
+        for key, default in default_configs.items()
+    }
+    try: root_dir: Optional[str] = _read_root_dir()
+    except (FileNotFoundError, RuntimeError): root_dir = None
+    return Config.parse(values, root_dir)
+
+
+def config(force_check: bool = False) -> Config:
+    """
+    현재 설정 스냅샷 리턴
+    .env, .rootdir의 수정 시각 또는 관련 환경 변수가 바뀐 경우에만 다시 읽고, 바뀐 값이 있으면 리스너에 알림
+    변경 여부 확인은 _CHECK_INTERVAL초에 한 번만 하므로 반복 호출 비용이 작음 (force_check=True이면 바로 확인)
+    """
+    import time
+
+    snapshot: Optional[Config] = _ConfigState.snapshot
+    now: float = time.monotonic()
+    if snapshot is not None and not force_check and now - _ConfigState.checked_at < _CHECK_INTERVAL: return snapshot
+    _ConfigState.checked_at = now
+
+    stamp: Tuple[object, ...] = (
+        _mtime(get_project_path('.env')),
+        _mtime(get_project_path('.rootdir')),
+        *(os.environ.get(key) for key in default_configs)
+    )
+    if snapshot is not None and stamp == _ConfigState.stamp: return snapshot
+
+    with _ConfigState.lock:
+        if _ConfigState.snapshot is not None and stamp == _ConfigState.stamp: return _ConfigState.snapshot
+        previous: Optional[Config] = _ConfigState.snapshot
+        try:
+            current: Config = _load_config()
+        except ValueError as e:
+            if previous is None: raise
+            print(f"[WARN] 설정 값을 해석할 수 없어 이전 설정을 유지합니다: {e}")
+            _ConfigState.stamp = stamp
+            return previous
+        _ConfigState.snapshot = current
+        _ConfigState.stamp = stamp
+
+    if previous is not None and previous != current:
+        print("[INFO] 설정 파일 변경을 반영했습니다.")
+        for ref in list(_ConfigState.listeners):
+            if (listener := ref()) is not None: listener(previous, current)
+    return current
+
+
+def add_config_listener(listener: ConfigListener) -> None:
+    """
+    설정 값이 바뀌었을 때 호출할 함수 등록 (설정에 의존하는 캐시 무효화용)
+    바운드 메서드는 약한 참조로 보관하므로 객체가 삭제되면 자동으로 호출되지 않음
+    """
+    import weakref
+    ref: Callable[[], Optional[ConfigListener]] = (
+        weakref.WeakMethod(listener) if hasattr(listener, "__self__") else (lambda: listener) # type: ignore[arg-type]
+    )
+    _ConfigState.listeners.append(ref)
+    _ConfigState.listeners[:] = [r for r in _ConfigState.listeners if r() is not None]
+
+
+def load_env(key: str) -> str:
+    '''
+    key와 대응하는 .env 값을 가져옴 (설정 스냅샷에서 읽으므로 매번 .env를 다시 읽지 않음)
+    '''
+    return config().values[key]
+
+
+def load_env_flag(key: str) -> bool:
+    '''
+    key와 대응하는 .env 값을 on/off 플래그로 해석 (1, true, yes, on → True)
+    '''
+    return _parse_flag(load_env(key))
+
+
+def get_project_path(filename: str) -> str:
+    """
+    프로젝트 최상위 경로(.env, .rootdir가 있는 경로) 기준의 파일 경로 리턴
+    절대경로가 주어지면 그대로 리턴
+    """
+    if os.path.isabs(filename):
+        return filename
+    return os.path.join(os.path.dirname(__file__), '..', '..', filename)
+
+
+def get_root_dir() -> str:
+    """
+    .rootdir 파일의 경로 리턴 (파일이 바뀌면 다시 읽으므로 프로그램 재시작 불필요)
+    """
+    root_dir: Optional[str] = config().root_dir
+    return root_dir if root_dir is not None else _read_root_dir()
\ No newline at end of file
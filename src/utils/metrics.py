@@ -0,0 +1,258 @@
+import heapq
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# 파일별 분석 시간 히스토그램 구간 (초, Prometheus 기본 구간과 같은 형식)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_PROM_PREFIX: str = "video_scripts"
+
+
+@dataclass(slots=True)
+class FileSample:
+    """
+    파일 한 개를 분석하는 데 걸린 시간과 세부 단계
+    작업 프로세스에서 만들어 결과와 함께 돌려보낼 수 있도록 단순한 값만 보관
+    """
+    stage: str # scan(속성 분석) 또는 keyframe(키프레임 분석)
+    filename: str
+    seconds: float = 0.0
+    file_bytes: int = 0 # 파일 크기
+    output_bytes: int = 0 # ffprobe 출력(json, 패킷 목록)을 읽은 크기 (헤더를 직접 읽은 경우 0)
+    method: str = "" # native(헤더 직접 읽기), ffprobe (키프레임만 분석한 경우 "")
+    keyframe_method: str = "" # 키프레임 분석 방식: short(짧은 영상), native(컨테이너 인덱스), ffprobe (분석하지 않았으면 "")
+    steps: Dict[str, float] = field(default_factory=dict) # 세부 단계 → 시간 (ffprobe 실행, json 해석 등)
+
+
+@contextmanager
+def timed_step(sample: Optional[FileSample], step: str) -> Iterator[None]:
+    """
+    sample의 세부 단계 시간 측정 (sample이 None이면 측정하지 않음)
+    """
+    if sample is None:
+        yield
+        return
+    start: float = time.perf_counter()
+    try: yield
+    finally: sample.steps[step] = sample.steps.get(step, 0.0) + time.perf_counter() - start
+
+
+@contextmanager
+def file_sample(stage: str, filepath: str, filename: str) -> Iterator[FileSample]:
+    """
+    with 블록 동안 파일 한 개의 분석 시간을 측정하는 FileSample 생성 (블록이 끝나면 시간과 파일 크기 기록)
+    """
+    sample: FileSample = FileSample(stage, filename)
+    start: float = time.perf_counter()
+    try: yield sample
+    finally:
+        sample.seconds = time.perf_counter() - start
+        try: sample.file_bytes = os.path.getsize(filepath)
+        except OSError: pass
+
+
+@dataclass
+class _StageStats:
+    """
+    단계(scan, keyframe)별 파일 분석 통계
+    """
+    count: int = 0
+    seconds: float = 0.0
+    file_bytes: int = 0
+    output_bytes: int = 0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)) # 마지막은 +Inf
+    steps: Dict[str, float] = field(default_factory=dict)
+    methods: Dict[str, int] = field(default_factory=dict)
+    keyframe_methods: Dict[str, int] = field(default_factory=dict)
+    slowest: List[Tuple[float, int, FileSample]] = field(default_factory=list) # 최소 힙 (시간, 순번, 샘플)
+
+
+class Metrics:
+    """
+    분석/분류/출력 단계별 시간과 파일별 분석 시간을 모으는 수집기 (기본 비활성)
+    METRICS_ENABLED 설정 또는 enable()로 켜며, 꺼져 있으면 기록하지 않음
+    """
+
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._forced: Optional[bool] = None # enable()로 지정한 값 (None이면 설정값 사용)
+        self._seq: int = 0
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        if self._forced is not None: return self._forced
+        from src.utils.load_env import config
+        return config().metrics_enabled
+
+    def enable(self, flag: bool = True) -> None:
+        """
+        설정값과 관계없이 수집 여부 지정
+        """
+        self._forced = flag
+
+    def reset(self) -> None:
+        """
+        수집한 값 모두 삭제
+        """
+        with self._lock:
+            self._phases: Dict[str, List[float]] = {} # 단계 → [호출 수, 시간]
+            self._stages: Dict[str, _StageStats] = {}
+            self._started_at: float = time.time()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        name 단계의 경과 시간 측정 (비활성 상태면 측정하지 않음)
+        """
+        if not self.enabled:
+            yield
+            return
+        start: float = time.perf_counter()
+        try: yield
+        finally:
+            elapsed: float = time.perf_counter() - start
+            with self._lock:
+                stat: List[float] = self._phases.setdefault(name, [0, 0.0])
+                stat[0] += 1
+                stat[1] += elapsed
+
+    def record(self, sample: Optional[FileSample]) -> None:
+        """
+        파일 분석 결과 한 개 반영
+        """
+        if sample is None or not self.enabled: return
+        from src.utils.load_env import config
+        top_n: int = config().metrics_top_n
+
+        with self._lock:
+            stats: _StageStats = self._stages.setdefault(sample.stage, _StageStats())
+            stats.count += 1
+            stats.seconds += sample.seconds
+            stats.file_bytes += sample.file_bytes
+            stats.output_bytes += sample.output_bytes
+            stats.buckets[next((i for i, b in enumerate(LATENCY_BUCKETS) if sample.seconds <= b), len(LATENCY_BUCKETS))] += 1
+            for step, seconds in sample.steps.items():
+                stats.steps[step] = stats.steps.get(step, 0.0) + seconds
+            if sample.method: stats.methods[sample.method] = stats.methods.get(sample.method, 0) + 1
+            if sample.keyframe_method:
+                stats.keyframe_methods[sample.keyframe_method] = stats.keyframe_methods.get(sample.keyframe_method, 0) + 1
+
+            self._seq += 1
+            if len(stats.slowest) < top_n:
+                heapq.heappush(stats.slowest, (sample.seconds, self._seq, sample))
+            elif stats.slowest and sample.seconds > stats.slowest[0][0]:
+                heapq.heapreplace(stats.slowest, (sample.seconds, self._seq, sample))
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        수집한 값을 json으로 변환할 수 있는 dict로 리턴
+        """
+        with self._lock:
+            return {
+                "started_at": self._started_at,
+                "phases": {name: {"calls": int(calls), "seconds": seconds} for name, (calls, seconds) in self._phases.items()},
+                "files": {
+                    stage: {
+                        "count": s.count,
+                        "seconds_sum": s.seconds,
+                        "file_bytes": s.file_bytes,
+                        "output_bytes": s.output_bytes,
+                        "histogram": [{"le": le, "count": c} for le, c in zip((*LATENCY_BUCKETS, "+Inf"), s.buckets)],
+                        "steps": dict(s.steps),
+                        "methods": dict(s.methods),
+                        "keyframe_methods": dict(s.keyframe_methods),
+                        "slowest": [asdict(sample) for _, _, sample in sorted(s.slowest, key=lambda e: -e[0])]
+                    }
+                    for stage, s in self._stages.items()
+                }
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        수집한 값을 Prometheus text 형식으로 리턴
+        """
+        def label(value: str) -> str:
+            return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+        data: Dict[str, Any] = self.to_json()
+        lines: List[str] = [
+            f"# HELP {_PROM_PREFIX}_phase_seconds_total 단계별 누적 경과 시간",
+            f"# TYPE {_PROM_PREFIX}_phase_seconds_total counter"
+        ]
+        lines += [f'{_PROM_PREFIX}_phase_seconds_total{{phase="{label(n)}"}} {p["seconds"]:.6f}' for n, p in data["phases"].items()]
+        lines += [f"# HELP {_PROM_PREFIX}_phase_calls_total 단계별 실행 횟수", f"# TYPE {_PROM_PREFIX}_phase_calls_total counter"]
+        lines += [f'{_PROM_PREFIX}_phase_calls_total{{phase="{label(n)}"}} {p["calls"]}' for n, p in data["phases"].items()]
+
+        lines += [f"# HELP {_PROM_PREFIX}_file_probe_seconds 파일별 분석 시간", f"# TYPE {_PROM_PREFIX}_file_probe_seconds histogram"]
+        for stage, s in data["files"].items():
+            cumulative: int = 0
+            for bucket in s["histogram"]:
+                cumulative += bucket["count"]
+                le: str = bucket["le"] if isinstance(bucket["le"], str) else f"{bucket['le']:g}"
+                lines.append(f'{_PROM_PREFIX}_file_probe_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{_PROM_PREFIX}_file_probe_seconds_sum{{stage="{stage}"}} {s["seconds_sum"]:.6f}')
+            lines.append(f'{_PROM_PREFIX}_file_probe_seconds_count{{stage="{stage}"}} {s["count"]}')
+
+        lines += [f"# HELP {_PROM_PREFIX}_file_step_seconds_total 파일 분석 세부 단계별 누적 시간", f"# TYPE {_PROM_PREFIX}_file_step_seconds_total counter"]
+        lines += [
+            f'{_PROM_PREFIX}_file_step_seconds_total{{stage="{stage}",step="{label(step)}"}} {seconds:.6f}'
+            for stage, s in data["files"].items() for step, seconds in s["steps"].items()
+        ]
+        lines += [f"# HELP {_PROM_PREFIX}_files_total 분석 방식별 파일 수", f"# TYPE {_PROM_PREFIX}_files_total counter"]
+        lines += [
+            f'{_PROM_PREFIX}_files_total{{stage="{stage}",method="{label(method)}"}} {count}'
+            for stage, s in data["files"].items() for method, count in s["methods"].items()
+        ]
+        lines += [f"# HELP {_PROM_PREFIX}_keyframe_files_total 키프레임 분석 방식별 파일 수", f"# TYPE {_PROM_PREFIX}_keyframe_files_total counter"]
+        lines += [
+            f'{_PROM_PREFIX}_keyframe_files_total{{stage="{stage}",method="{label(method)}"}} {count}'
+            for stage, s in data["files"].items() for method, count in s["keyframe_methods"].items()
+        ]
+        lines += [f"# HELP {_PROM_PREFIX}_file_bytes_total 분석한 파일 크기 합", f"# TYPE {_PROM_PREFIX}_file_bytes_total counter"]
+        lines += [f'{_PROM_PREFIX}_file_bytes_total{{stage="{stage}"}} {s["file_bytes"]}' for stage, s in data["files"].items()]
+        lines += [f"# HELP {_PROM_PREFIX}_probe_output_bytes_total ffprobe 출력을 읽은 크기 합", f"# TYPE {_PROM_PREFIX}_probe_output_bytes_total counter"]
+        lines += [f'{_PROM_PREFIX}_probe_output_bytes_total{{stage="{stage}"}} {s["output_bytes"]}' for stage, s in data["files"].items()]
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str) -> None:
+        """
+        수집한 값 저장 (.prom, .txt 확장자는 Prometheus text 형식, 그 외는 json)
+        """
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            if os.path.splitext(path)[1].lower() in (".prom", ".txt"): f.write(self.to_prometheus())
+            else: json.dump(self.to_json(), f, ensure_ascii=False, indent=2)
+
+    def report(self, top_n: Optional[int] = None) -> None:
+        """
+        단계별 시간과 가장 오래 걸린 파일 목록 출력
+        """
+        data: Dict[str, Any] = self.to_json()
+        if not data["phases"] and not data["files"]:
+            print("[INFO] 수집된 측정값이 없습니다. (METRICS_ENABLED=1 또는 .instrument()로 활성화)")
+            return
+
+        print("\n[ 단계별 시간 ]")
+        for name, p in sorted(data["phases"].items(), key=lambda i: -i[1]["seconds"]):
+            print(f"  {name:<24} {p['seconds']:>9.3f}s  ({p['calls']}회)")
+
+        for stage, s in data["files"].items():
+            print(f"\n[ 파일별 분석 시간: {stage} - {s['count']}개, 평균 {s['seconds_sum'] / max(s['count'], 1):.3f}s ]")
+            for step, seconds in sorted(s["steps"].items(), key=lambda i: -i[1]):
+                print(f"  {step:<24} {seconds:>9.3f}s (파일별 누적)")
+            if s["methods"]: print(f"  분석 방식: " + ", ".join(f"{m} {c}개" for m, c in s["methods"].items()))
+            if s["keyframe_methods"]: print(f"  키프레임 분석 방식: " + ", ".join(f"{m} {c}개" for m, c in s["keyframe_methods"].items()))
+            slowest: List[Dict[str, Any]] = s["slowest"][:top_n] if top_n else s["slowest"]
+            for i, sample in enumerate(slowest, 1):
+                steps: str = ", ".join(f"{k} {v:.3f}s" for k, v in sample["steps"].items())
+                print(f"  {i:>2}. {sample['seconds']:>8.3f}s  {sample['file_bytes'] / 1024 ** 2:>8.1f}MB  {sample['method'] or sample['keyframe_method']:<7} {sample['filename']}" +
+                      (f"  ({steps})" if steps else ""))
+
+
+# 프로세스 전체에서 공유하는 수집기
+metrics: Metrics = Metrics()
@@ -0,0 +1,152 @@
+import os
+import json
+import sqlite3
+import threading
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.utils.video_prop import VideoProps
+
+# 캐시에 저장하지 않는 필드 (ratio는 해상도로 다시 계산, moved_dirname은 분류 상태라 캐싱 대상 아님)
+_EXCLUDED_FIELDS: Tuple[str, ...] = ("ratio", "moved_dirname")
+
+
+def _props_to_json(props: VideoProps) -> str:
+    """
+    VideoProps를 캐시에 저장할 JSON 문자열로 변환
+    """
+    return json.dumps({
+        f.name: getattr(props, f.name)
+        for f in fields(VideoProps) if f.name not in _EXCLUDED_FIELDS
+    }, ensure_ascii=False)
+
+
+def _props_from_json(raw: str, filename: str) -> Optional[VideoProps]:
+    """
+    캐시의 JSON 문자열을 VideoProps로 복원
+    필수 필드가 빠진 예전 형식의 항목은 None 리턴 (다시 분석 대상)
+    """
+    from src.utils.ratio import closet_ratio_of
+
+    stored: Dict[str, Any] = json.loads(raw)
+    known: Dict[str, Any] = {
+        f.name: stored[f.name]
+        for f in fields(VideoProps) if f.name not in _EXCLUDED_FIELDS and f.name in stored
+    }
+    known["filename"] = filename
+    if "bitrate_method" not in known and not known.get("vid_kbps"):
+        return None # 비트레이트 추정 기능 이전에 비트레이트를 구하지 못한 항목은 다시 분석
+
+    try:
+        width, height, rotate_type = known["width"], known["height"], known["rotate_type"]
+        return VideoProps(
+            **known,
+            ratio = closet_ratio_of(width, height, rotate_type)
+        )
+    except (KeyError, TypeError, ZeroDivisionError):
+        return None
+
+
+def file_stat_key(filepath: str) -> Tuple[str, int, int]:
+    """
+    캐시 키로 사용하는 (절대경로, 파일 크기, 수정 시각(ns)) 리턴
+    """
+    st: os.stat_result = os.stat(filepath)
+    return os.path.abspath(filepath), st.st_size, st.st_mtime_ns
+
+
+class ProbeCache:
+    """
+    비디오 분석 결과(VideoProps)를 (경로, 크기, 수정 시각) 기준으로 디스크(SQLite)에 저장하는 캐시
+    크기나 수정 시각이 바뀐 파일은 캐시 미스로 취급되어 다시 분석됨
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        from src.utils.load_env import load_env, get_project_path
+
+        self._db_path: str = os.path.abspath(db_path or get_project_path(load_env("PROBE_CACHE_PATH")))
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(self._db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS probes ("
+                "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, props TEXT NOT NULL)"
+            )
+
+    @property
+    def db_path(self) -> str: return self._db_path
+
+    def get(self, filepath: str, size: int, mtime_ns: int, filename: Optional[str] = None) -> Optional[VideoProps]:
+        """
+        경로, 크기, 수정 시각이 모두 일치하는 캐시 항목 리턴 (없으면 None)
+        filename: 복원한 VideoProps에 기록할 작업 경로 기준 상대 경로 (하위 폴더 탐색 시 'sub/a.mp4'), None이면 파일 이름
+        """
+        path: str = os.path.abspath(filepath)
+        with self._lock:
+            row: Optional[Tuple[int, int, str]] = self._conn.execute(
+                "SELECT size, mtime_ns, props FROM probes WHERE path = ?", (path,)
+            ).fetchone()
+
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        return _props_from_json(row[2], filename or os.path.basename(filepath))
+
+    def put_many(self, entries: Iterable[Tuple[str, int, int, VideoProps]]) -> None:
+        """
+        (경로, 크기, 수정 시각, VideoProps) 목록을 한 트랜잭션으로 저장
+        """
+        rows: List[Tuple[str, int, int, str]] = [
+            (os.path.abspath(filepath), size, mtime_ns, _props_to_json(props))
+            for filepath, size, mtime_ns, props in entries
+        ]
+        if not rows: return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO probes (path, size, mtime_ns, props) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def put(self, filepath: str, size: int, mtime_ns: int, props: VideoProps) -> None:
+        """
+        단일 항목 저장
+        """
+        self.put_many([(filepath, size, mtime_ns, props)])
+
+    def validate(self) -> int:
+        """
+        디스크 상태와 맞지 않는 항목(삭제, 크기/수정 시각 변경)을 캐시에서 제거
+        제거된 항목 수 리턴
+        """
+        with self._lock:
+            rows: List[Tuple[str, int, int]] = self._conn.execute("SELECT path, size, mtime_ns FROM probes").fetchall()
+
+        stale: List[Tuple[str]] = []
+        for path, size, mtime_ns in rows:
+            try:
+                st: os.stat_result = os.stat(path)
+            except OSError:
+                stale.append((path,))
+                continue
+            if st.st_size != size or st.st_mtime_ns != mtime_ns:
+                stale.append((path,))
+
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM probes WHERE path = ?", stale)
+        return len(stale)
+
+    def clear(self, root_dir: Optional[str] = None) -> int:
+        """
+        캐시 항목 삭제. root_dir가 주어지면 해당 경로 아래 항목만 삭제
+        삭제된 항목 수 리턴
+        """
+        with self._lock, self._conn:
+            if root_dir is None:
+                return self._conn.execute("DELETE FROM probes").rowcount
+
+            prefix: str = os.path.join(os.path.abspath(root_dir), "")
+            escaped: str = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return self._conn.execute("DELETE FROM probes WHERE path LIKE ? ESCAPE '\\'", (escaped + "%",)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,4 +1,9 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 ratio_map = {
     "1-2": {
@@ -81,10 +86,11 @@ ratio_map = {
     }
 }
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ClosetRatio:
     """
     가장 가까운 비율에 대한 데이터클래스
+    같은 해상도의 비디오끼리 하나의 객체를 공유하므로 변경 불가(frozen)
     """
     type: str
     value: float # 타입에 해당하는 정확한 비율값
@@ -102,4 +108,39 @@ def get_closet_ratio(ratio: float) -> ClosetRatio:
         value = result[1]["value"], # 비율값 (ex: 16/9)
         real_value = ratio, # 실제 비율값
         diff = abs(result[1]["value"] - ratio) # 비율값 차이
-    )
\ No newline at end of file
+    )
+
+
+@lru_cache(maxsize=4096)
+def closet_ratio_of(width: int, height: int, rotate_type: int) -> ClosetRatio:
+    """
+    회전을 고려한 해상도의 가장 가까운 비율 정보 리턴
+    (가로, 세로, 회전) 조합마다 하나의 객체를 만들어 모든 행이 공유 (flyweight)
+    """
+    return get_closet_ratio(width / height if abs(rotate_type) % 180 == 0 else height / width)
+
+
+ratio_keys: List[str] = list(ratio_map) # 벡터화 함수에서 쓰는 비율 유형 인덱스 순서
+
+
+def closet_ratio_index(ratios: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    get_closet_ratio의 벡터화 버전
+    정렬된 ratio_map 비율값에 대해 searchsorted로 가장 가까운 비율을 찾아
+    (ratio_keys 기준 인덱스 배열, 비율값 차이 배열) 리턴
+    """
+    import numpy as np
+
+    values: np.ndarray = np.array([ratio_map[k]["value"] for k in ratio_keys], dtype=np.float64)
+    order: np.ndarray = np.argsort(values, kind="stable")
+    sorted_values: np.ndarray = values[order]
+
+    pos: np.ndarray = np.searchsorted(sorted_values, ratios)
+    left: np.ndarray = np.clip(pos - 1, 0, len(sorted_values) - 1)
+    right: np.ndarray = np.clip(pos, 0, len(sorted_values) - 1)
+    left_diff: np.ndarray = np.abs(ratios - sorted_values[left])
+    right_diff: np.ndarray = np.abs(ratios - sorted_values[right])
+
+    # 차이가 같으면 작은 비율값 우선 (get_closet_ratio의 min과 동일)
+    choose_left: np.ndarray = left_diff <= right_diff
+    return order[np.where(choose_left, left, right)], np.where(choose_left, left_diff, right_diff)
\ No newline at end of file
@@ -1,6 +1,14 @@
-from typing import List, Literal
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Mapping, Optional, Set, Tuple
 from src.utils.video_prop import VideoProps
 from src.utils.pred import Pred
+from src.utils.probe_cache import ProbeCache
+from src.utils.filesys import FileIdentity, ScanOptions
+
+if TYPE_CHECKING:
+    from src.utils.load_env import Config
+    from src.utils.columnar import DerivedColumns, VideoPropColumns
+    from src.utils.dir_watcher import DirWatcher
 
 class TableCache:
     """
@@ -8,17 +16,60 @@ class TableCache:
     """
     AllowedPred = Literal[Pred.RATIO, Pred.BITRATE, Pred.KEYFRAME]
 
-    def __init__(self, root_dir: str, init_keyframe_flag: bool = False) -> None:
+    def __init__(self, 
+                 root_dir: str, 
+                 init_keyframe_flag: bool = False, 
+                 use_probe_cache: bool = True, 
+                 scan_options: Optional[ScanOptions] = None,
+                 known: Optional[Mapping[str, Tuple[int, int, VideoProps]]] = None) -> None:
+        """
+        known: 다른 프로세스/호스트가 미리 분석한 결과 {파일이름: (파일 크기, 수정 시각(ns), VideoProps)} (작업 큐 병합용)
+               크기와 수정 시각이 현재 파일과 같은 항목은 다시 분석하지 않고 그대로 사용
+        """
         import os
-        from src.utils.video_prop import get_video_prop_table
-        
+        from src.utils.video_prop import get_video_prop_table, keyframe_statistic
+        from src.utils.load_env import config, load_env_flag, add_config_listener
+        from src.utils.filesys import walk_files
+        from src.utils.metrics import metrics
+
         # 유효성 검사
         if not os.path.isdir(root_dir):
             raise FileNotFoundError(f"지정된 루트 디렉터리를 찾을 수 없거나 유효하지 않습니다: '{root_dir}'")
-        
+
         self._root_dir: str = root_dir # 분석이 된 대상 경로
         self._include_keyframe: bool = init_keyframe_flag # 키프레임 포함 여부
-        self._data: List[VideoProps] = get_video_prop_table(self._root_dir, self._include_keyframe) # 분석 결과 데이터
+        self._keyframe_statistic: str = config().keyframe_statistic # 키프레임 정보를 포함할 때 사용한 KEYFRAME_STATISTIC
+        self._scan_options: ScanOptions = scan_options or ScanOptions.from_env() # 분석 대상 탐색 조건
+        self._probe_cache: Optional[ProbeCache] = ProbeCache() if use_probe_cache and load_env_flag("PROBE_CACHE_ENABLED") else None # 디스크 캐시
+
+        with metrics.phase("scan.enumerate"):
+            target_files: Dict[str, FileIdentity] = {
+                os.path.join(rel_dir, name): identity
+                for rel_dir, name, identity, _ in walk_files(self._root_dir, self._scan_options)
+            }
+        # 미리 분석된 결과(known) 중 파일이 그대로인 항목은 재사용하고, 나머지만 분석 (순서는 순회 순서 유지)
+        reused: Dict[str, VideoProps] = {
+            filename: props for filename, (size, mtime_ns, props) in (known or {}).items()
+            if (identity := target_files.get(filename)) is not None and identity[1:] == (size, mtime_ns)
+            and (keyframe_statistic(props) is not None or not init_keyframe_flag)
+        }
+        to_probe: List[str] = [filename for filename in target_files if filename not in reused]
+        probed: Dict[str, VideoProps] = {
+            vid.filename: vid
+            for vid in (get_video_prop_table(self._root_dir, self._include_keyframe, self._probe_cache, to_probe) if to_probe else [])
+        }
+        self._data: List[VideoProps] = [props for f in target_files if (props := reused.get(f) or probed.get(f)) is not None] # 분석 결과 데이터
+        self._identities: Dict[Tuple[str, str], FileIdentity] = { # (분류 폴더("": 작업 경로), 파일이름) → 파일 동일성 판별 정보
+            ("", vid.filename): target_files[vid.filename] for vid in self._data
+        }
+        self._columns: Optional["VideoPropColumns"] = None # data의 열 단위 배열 (필요할 때 생성)
+        self._derived: Optional["DerivedColumns"] = None # columns로부터 계산한 파생 열 (필요할 때 계산)
+        self._rows: Dict[Tuple[str, ...], Tuple[Tuple[Any, ...], List[Dict[str, Any]]]] = {} # 출력 열 목록 → (설정값, 행 목록)
+        self._natural_keys: Dict[str, Tuple[int | str, ...]] = {} # 파일 이름 → 윈도우 이름 정렬 키
+        self._root_files: Set[str] = set(target_files) # 작업 경로에 있는 분석 대상 파일 (존재 여부 확인용 색인)
+        self._watcher: Optional["DirWatcher"] = None # 감시 모드에서 사용하는 작업 경로 감시자
+        self._lock: threading.RLock = threading.RLock() # 감시 스레드의 갱신과 분류 작업이 겹치지 않도록 하는 잠금
+        add_config_listener(self._on_config_changed)
 
     @property
     def root_dir(self) -> str: return self._root_dir
@@ -26,6 +77,123 @@ class TableCache:
     @property
     def data(self) -> List[VideoProps]: return self._data
 
+    @property
+    def lock(self) -> threading.RLock: return self._lock
+
+    @property
+    def watching(self) -> bool: return self._watcher is not None
+
+    def file_in_root(self, filename: str) -> bool:
+        """
+        마지막 갱신 시점에 작업 경로(분류 폴더 제외)에 해당 파일이 있었는지 확인
+        파일마다 디스크를 확인하지 않고 색인에서 찾음
+        """
+        return filename in self._root_files
+
+    def start_watch(self, settle_seconds: Optional[float] = None) -> None:
+        """
+        감시 모드 시작: 작업 경로의 변경을 백그라운드에서 감시하다가,
+        쓰기가 끝난(settle_seconds 동안 변경이 없는) 시점에 새 파일 분석 및 삭제된 파일 제거를 반영
+        감시 중에는 변경이 없으면 refresh가 작업 경로를 다시 읽지 않음
+        """
+        from src.utils.dir_watcher import DirWatcher
+        if self._watcher is not None: return
+
+        self._watcher = DirWatcher(self._root_dir, self.refresh, settle_seconds)
+        self._watcher.start()
+        self._watcher.mark_dirty() # 감시 시작 전에 생긴 변경을 한 번 반영
+        print(f"[INFO] 작업 경로 감시를 시작합니다. ({self._watcher.backend})")
+
+    def stop_watch(self) -> None:
+        """
+        감시 모드 종료
+        """
+        if self._watcher is None: return
+        self._watcher.stop()
+        self._watcher = None
+        print("[INFO] 작업 경로 감시를 종료합니다.")
+
+    @property
+    def columns(self) -> "VideoPropColumns":
+        """
+        data를 열 단위 numpy 배열로 변환한 결과 (data가 바뀌기 전까지 재사용)
+        """
+        from src.utils.columnar import VideoPropColumns
+        if self._columns is None:
+            self._columns = VideoPropColumns(self._data)
+        return self._columns
+
+    @property
+    def derived(self) -> "DerivedColumns":
+        """
+        최적 해상도/비트레이트, 분류 결과 등 파생 열 (열마다 처음 사용할 때 계산, data나 관련 설정값이 바뀌기 전까지 재사용)
+        """
+        from src.utils.columnar import DerivedColumns
+        if self._derived is None:
+            self._derived = DerivedColumns(self.columns)
+        return self._derived
+
+    def rows(self, headers: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        """
+        headers 열로 구성한 출력용 행 목록 (data와 같은 순서)
+        같은 열 목록은 행이나 비트레이트 관련 설정값이 바뀌기 전까지 다시 만들지 않고 재사용
+        리턴한 행은 여러 출력에서 공유하므로 수정하면 안 됨
+        """
+        from src.utils.columnar import ROW_GETTERS, bitrate_config
+        config: Tuple[Any, ...] = bitrate_config()
+        cached = self._rows.get(headers)
+        if cached is not None and cached[0] == config: return cached[1]
+
+        derived: "DerivedColumns" = self.derived
+        getters = [(h, ROW_GETTERS[h]) for h in headers]
+        rows: List[Dict[str, Any]] = [{h: get(vid, i, derived) for h, get in getters} for i, vid in enumerate(self._data)]
+        self._rows[headers] = (config, rows)
+        return rows
+
+    def grouped_rows(self, headers: Tuple[str, ...]) -> Dict[Tuple[str, bool], List[Dict[str, Any]]]:
+        """
+        rows(headers)를 (분류 폴더 이름, 가분류 여부) 기준으로 묶은 결과 (TablePrinter.print_groups 입력 형식)
+        """
+        from collections import defaultdict
+        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = defaultdict(list)
+        for vid, row in zip(self._data, self.rows(headers)):
+            pseudo_classified: bool = vid.moved_dirname is not None and vid.filename in self._root_files
+            tables[(vid.moved_dirname or "", pseudo_classified)].append(row)
+        return tables
+
+    def natural_key(self, filename: str) -> Tuple[int | str, ...]:
+        """
+        파일 이름의 윈도우 이름 정렬 키 (파일 이름마다 한 번만 계산해 재사용)
+        """
+        key: Optional[Tuple[int | str, ...]] = self._natural_keys.get(filename)
+        if key is None:
+            from src.utils.table_printer import windows_name_key
+            key = self._natural_keys[filename] = windows_name_key(filename)
+        return key
+
+    def invalidate_rows(self) -> None:
+        """
+        출력용 행 캐시 삭제 (테이블 밖에서 파일 이름 등 행의 값을 바꾼 경우 호출)
+        정렬 키 캐시에서는 더 이상 테이블에 없는 파일 이름만 제거
+        """
+        self._rows = {}
+        self._natural_keys = {vid.filename: key for vid in self._data if (key := self._natural_keys.get(vid.filename)) is not None}
+
+    def _on_config_changed(self, previous: "Config", current: "Config") -> None:
+        """
+        설정 값이 바뀌면 설정에 의존하는 파생 열(분류 결과 포함)과 출력용 행 캐시 삭제 (다음 사용 시 다시 계산)
+        """
+        self._derived = None
+        self._rows = {}
+
+    def _invalidate(self) -> None:
+        """
+        data가 바뀐 경우 열 배열, 파생 열, 출력용 행 캐시 모두 삭제
+        """
+        self._columns = None
+        self._derived = None
+        self.invalidate_rows()
+
     def _keyframe_flag_raised(self, keyframe_flag: bool) -> bool:
         """
         keyframe_flag가 raise up된 상황인지 판별
@@ -35,8 +203,134 @@ class TableCache:
     def update_keyframe(self, keyframe_flag: bool) -> None:
         """
         keyframe을 업데이트 하면서, 필요한 상황인 경우 data에 키프레임 정보를 업데이트함
+        키프레임을 포함한 뒤 KEYFRAME_STATISTIC이 바뀐 경우에도 해당 통계가 없는 항목(예전 캐시)만 다시 구함
         """
         from src.utils.video_prop import include_keyframe_at
-        if self._keyframe_flag_raised(keyframe_flag): 
+        from src.utils.load_env import config
+        statistic: str = config().keyframe_statistic
+        statistic_changed: bool = self._include_keyframe and keyframe_flag and statistic != self._keyframe_statistic
+        if self._keyframe_flag_raised(keyframe_flag) or statistic_changed:
             self._include_keyframe = keyframe_flag
-            include_keyframe_at(self.data, self._root_dir)
\ No newline at end of file
+            self._keyframe_statistic = statistic
+            include_keyframe_at(self.data, self._root_dir, self._probe_cache)
+            self._invalidate()
+
+    def refresh(self) -> None:
+        """
+        작업 경로를 한 번 순회한 결과와 캐시된 테이블을 비교해 변경분만 반영
+        - 새로 생기거나 내용이 바뀐 분석 대상 파일만 분석
+        - 사라진 파일은 테이블에서 제거
+        - 하위(분류) 폴더로 옮겨진 파일은 inode 또는 크기+수정 시각으로 찾아 moved_dirname 갱신
+        감시 모드에서는 변경이 없으면 바로 리턴하고, 아직 쓰기 중인 파일은 다음 갱신으로 미룸
+        """
+        with self._lock:
+            if self._watcher is not None and not self._watcher.take_changes(): return
+            self._refresh()
+
+    def _refresh(self) -> None:
+        import os
+        import sys
+        from src.utils.video_prop import get_video_prop_table
+        from src.utils.filesys import walk_files
+        from src.utils.metrics import metrics
+
+        # 분석 대상 파일과, 분석 대상 밖(분류 폴더 등)에 있는 파일을 한 번의 순회로 수집
+        root_files: Dict[str, FileIdentity] = {}
+        snapshot: Dict[str, Dict[str, FileIdentity]] = {}
+        with metrics.phase("refresh.enumerate"):
+            for rel_dir, name, identity, in_scope in walk_files(self._root_dir, self._scan_options, include_out_of_scope=True):
+                if in_scope: root_files[os.path.join(rel_dir, name)] = identity
+                else: snapshot.setdefault(rel_dir, {})[name] = identity
+        root_identities: Dict[str, FileIdentity] = dict(root_files)
+
+        # 하위 폴더 파일의 동일성 색인 (inode, 크기+수정 시각)
+        by_inode: Dict[int, Tuple[str, str]] = {}
+        by_signature: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}
+        for rel_dir, files in snapshot.items():
+            for name, (inode, size, mtime_ns) in files.items():
+                if inode: by_inode[inode] = (rel_dir, name)
+                by_signature.setdefault((size, mtime_ns), []).append((rel_dir, name))
+
+        def find_moved(vid: VideoProps, identity: Optional[FileIdentity]) -> Optional[Tuple[str, str]]:
+            """
+            하위 폴더로 옮겨진 파일의 (상대 폴더 경로, 파일이름) 탐색
+            """
+            if identity is None: return None
+            inode, size, mtime_ns = identity
+            if inode and (found := by_inode.get(inode)) and snapshot[found[0]].get(found[1], (0, -1, -1))[1:] == (size, mtime_ns):
+                return found
+            candidates: List[Tuple[str, str]] = [c for c in by_signature.get((size, mtime_ns), []) if c[1] in snapshot[c[0]]] # 이미 매칭된 파일 제외
+            same_name: List[Tuple[str, str]] = [c for c in candidates if c[1] == os.path.basename(vid.filename)]
+            if same_name: return same_name[0]
+            return candidates[0] if len(candidates) == 1 else None
+
+        kept: List[VideoProps] = []
+        deferred: List[str] = [] # 쓰기 중이라 분석을 미룬 파일
+        identities: Dict[Tuple[str, str], FileIdentity] = {}
+        to_probe: List[str] = []
+        moved_count: int = 0
+        dropped_count: int = 0
+
+        for vid in self._data:
+            # 마지막 갱신 때 확인한 위치의 동일성 정보 (분류 직후라 아직 갱신 전이면 작업 경로에서 확인한 정보)
+            identity: Optional[FileIdentity] = (
+                self._identities.get((vid.moved_dirname or "", os.path.basename(vid.filename)))
+                or self._identities.get(("", vid.filename))
+            )
+
+            # 분류 폴더에 그대로 있는 경우
+            if vid.moved_dirname is not None:
+                name: str = os.path.basename(vid.filename)
+                current: Optional[FileIdentity] = snapshot.get(vid.moved_dirname, {}).get(name)
+                if current is not None and (identity is None or current[1:] == identity[1:]):
+                    if vid.filename != name: moved_count += 1
+                    vid.filename = name
+                    kept.append(vid)
+                    identities[(vid.moved_dirname, name)] = snapshot[vid.moved_dirname].pop(name)
+                    continue
+
+            # 원래 경로에 그대로 있는 경우 (분류 안 됨, 가분류)
+            # 분류 폴더로 옮겨졌던 파일과 이름만 같은 새 파일은 같은 파일로 보지 않음
+            if vid.filename in root_files and (vid.moved_dirname is None or vid.filename in self._root_files):
+                current = root_files.pop(vid.filename)
+                if identity is not None and current[1:] != identity[1:]:
+                    to_probe.append(vid.filename) # 내용이 바뀐 파일
+                    continue
+                kept.append(vid)
+                identities[("", vid.filename)] = current
+                continue
+
+            # 하위 폴더로 옮겨진 경우
+            if (found := find_moved(vid, identity)) is not None:
+                rel_dir, name = found
+                if vid.moved_dirname != rel_dir or vid.filename != name: moved_count += 1
+                vid.moved_dirname = sys.intern(rel_dir)
+                vid.filename = name
+                kept.append(vid)
+                identities[(rel_dir, name)] = snapshot[rel_dir].pop(name)
+                continue
+
+            dropped_count += 1
+
+        # 테이블에 없던 분석 대상 파일은 새로 분석 (감시 중 아직 쓰기가 끝나지 않은 파일은 다음 갱신으로 미룸)
+        to_probe.extend(root_files)
+        if self._watcher is not None and (unsettled := self._watcher.unsettled()):
+            deferred = [filename for filename in to_probe if filename in unsettled]
+            if deferred:
+                to_probe = [filename for filename in to_probe if filename not in unsettled]
+                self._watcher.mark_dirty()
+        if to_probe:
+            probed: List[VideoProps] = get_video_prop_table(self._root_dir, self._include_keyframe, self._probe_cache, to_probe)
+            kept.extend(probed)
+            identities.update({("", vid.filename): root_identities[vid.filename] for vid in probed})
+
+        if to_probe or moved_count or dropped_count:
+            print(f"[INFO] 테이블 갱신: 새로 분석 {len(to_probe)}개, 폴더 이동 확인 {moved_count}개, 제거 {dropped_count}개")
+
+        # 행이 추가/제거된 경우에만 열 배열과 파생 열을 다시 계산 (이동만 된 경우 파일 이름이 바뀌므로 출력용 행만 삭제)
+        rows_changed: bool = bool(to_probe) or len(kept) != len(self._data)
+        self._data = kept
+        self._identities = identities
+        self._root_files = set(root_identities)
+        if rows_changed: self._invalidate()
+        elif moved_count: self.invalidate_rows()
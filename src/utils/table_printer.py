@@ -1,30 +1,17 @@
-import unicodedata
-from typing import Any, List, Dict, Callable, Tuple
-from tabulate import tabulate
+import re
+from dataclasses import dataclass
+from typing import Any, List, Dict, Callable, Iterable, Optional, Sequence, Tuple
 
-from src.utils.load_env import load_env
+from src.utils.load_env import config
+from src.utils.metrics import metrics
+from src.utils.display_width import sanitize_text, truncate_text, render_name, text_width
 
-def sanitize_text(text: str) -> str:
-    """
-    영어, 한중일 문자 제외 모두 ?로 치환
-    """
-    if not text: return ""
-
-    clean_chars = []
-    for ch in text:
-        if ch.isascii():
-            clean_chars.append(ch)
-            continue
+NAME_COL: str = "\n이름" # 파일 이름 열 (이모지 치환, 길이 제한 대상)
+_MIN_PADDING: int = 2 # 헤더 폭에 더하는 여백 (tabulate와 동일)
+_WRITE_CHUNK: int = 1000 # 한 번에 출력하는 줄 수
+_DIGITS: re.Pattern = re.compile(r"(\d+)")
 
-        eaw = unicodedata.east_asian_width(ch)
-        cat = unicodedata.category(ch)
-        if cat.startswith('L') and eaw == "W":
-            clean_chars.append(ch)
-            continue
-
-        clean_chars.append("?")
-
-    return "".join(clean_chars)
+SortPass = Tuple[Callable[[Dict[str, Any]], Any], bool] # (정렬 키 함수, 내림차순 여부)
 
 
 def sanitize_col(table: List[Dict[str, Any]], key: str) -> None:
@@ -36,20 +23,6 @@ def sanitize_col(table: List[Dict[str, Any]], key: str) -> None:
             row[key] = sanitize_text(row[key])
 
 
-def truncate_text(text: str, max_len: int) -> str:
-    result: str = ""
-    curr_len: int = 0
-    for ch in text:
-        # F, W, A: Fullwidth, Wide, Ambiguous → 2칸 취급
-        ch_len: int = 2 if unicodedata.east_asian_width(ch) in ("F", "W", "A") else 1
-        if curr_len + ch_len > max_len:
-            cut: str = result[:-2] if len(result) >= 2 else ""
-            return cut + "..."
-        result += ch
-        curr_len += ch_len
-    return result
-
-
 def truncate_col(table: List[Dict[str, Any]], key: str, max_len: int) -> None:
     """
     열의 글자 폭 기준으로 길이를 제한 (동양문자, 이모티콘 등 2글자 폭 취급)
@@ -59,20 +32,199 @@ def truncate_col(table: List[Dict[str, Any]], key: str, max_len: int) -> None:
             row[key] = truncate_text(row[key], max_len)
 
 
+def windows_name_key(name: str) -> Tuple[int | str, ...]:
+    """
+    윈도우 이름 정렬 키 (숫자 부분은 정수, 나머지는 소문자로 비교)
+    re.split 결과는 홀수 번째가 항상 숫자 부분이므로 위치로 구분
+    """
+    return tuple(int(part) if i % 2 else part.lower() for i, part in enumerate(_DIGITS.split(name)))
+
+
+def sort_rows(table: List[Dict[str, Any]], passes: Sequence[SortPass]) -> List[Dict[str, Any]]:
+    """
+    여러 열 기준 정렬: 우선순위가 낮은 열부터 안정 정렬을 반복
+    내림차순은 reverse로 정렬하므로 값(문자열 등)을 뒤집어 만들 필요가 없음
+    """
+    rows: List[Dict[str, Any]] = list(table)
+    for key, descending in reversed(passes):
+        rows.sort(key=key, reverse=descending)
+    return rows
+
+
+@dataclass(frozen=True)
+class PrintOptions:
+    """
+    테이블 출력 범위 옵션
+    """
+    limit: Optional[int] = None # 그룹마다 출력할 최대 행 수 (None이면 전체)
+    offset: int = 0 # 정렬 후 건너뛸 행 수
+    summary_only: bool = False # 그룹별 개수만 출력하고 행은 출력하지 않음
+    sort_passes: Tuple[SortPass, ...] = () # 여러 열 기준 정렬 (지정하면 sort_key 대신 사용)
+
+
+def _after_point(text: str) -> int:
+    """
+    소수점 뒤 자릿수 (소수점이 없으면 -1)
+    """
+    pos: int = text.rfind(".")
+    return len(text) - pos - 1 if pos >= 0 else -1
+
+
+class _ColumnFormat:
+    """
+    열 하나의 타입(정렬 방식), 소수점 자릿수, 폭 정보
+    """
+
+    def __init__(self, header: str) -> None:
+        self.header_lines: List[str] = header.split("\n")
+        self.numeric: bool = True # 숫자만 있는 열이면 오른쪽(소수점) 정렬
+        self.is_float: bool = False # 실수가 섞인 열이면 정수도 실수 형식으로 출력
+        self.max_after_point: int = -1
+        self.width: int = max(text_width(line) for line in self.header_lines) + _MIN_PADDING
+
+    def observe(self, value: Any) -> None:
+        if value is None: return
+        if isinstance(value, bool) or not isinstance(value, (int, float)): self.numeric = False
+        elif isinstance(value, float): self.is_float = True
+
+    def format(self, value: Any, floatfmt: str) -> str:
+        if value is None: return ""
+        if self.numeric and self.is_float: return format(float(value), floatfmt)
+        return str(value)
+
+    def pad(self, text: str) -> str:
+        """
+        열 폭에 맞게 정렬 (숫자 열은 소수점 위치를 맞춘 뒤 오른쪽 정렬)
+        """
+        if self.numeric:
+            if self.max_after_point >= 0: text += " " * (self.max_after_point - _after_point(text))
+            return " " * (self.width - text_width(text)) + text
+        return text + " " * (self.width - text_width(text))
+
+
 class TablePrinter:
     @staticmethod
-    def print(table: List[Dict[str, Any]], sort_key: Callable[[Dict[str, Any]], Tuple | list] | None, filename_maxlen: int, sanitize_emoji: bool) -> None:
+    def _select(table: List[Dict[str, Any]],
+                sort_key: Callable[[Dict[str, Any]], Tuple | list] | None,
+                options: PrintOptions) -> List[Dict[str, Any]]:
+        """
+        출력할 행 선택
+        sort_passes가 있으면 열마다 안정 정렬을 반복하고, 없으면 sort_key로 정렬
+        sort_key와 limit이 있으면 전체 정렬 없이 힙으로 상위 offset+limit개만 골라냄
+        """
+        import heapq
+
+        if options.sort_passes:
+            rows: List[Dict[str, Any]] = sort_rows(table, options.sort_passes)
+            end: Optional[int] = None if options.limit is None else options.offset + options.limit
+            return rows[options.offset:end]
+
+        if options.limit is None:
+            rows = sorted(table, key=sort_key) if sort_key else table
+            return rows[options.offset:] if options.offset else rows
+
+        end = options.offset + options.limit
+        if sort_key: return heapq.nsmallest(end, table, key=sort_key)[options.offset:]
+        return table[options.offset:end]
+
+    @staticmethod
+    def print(table: List[Dict[str, Any]], 
+              sort_key: Callable[[Dict[str, Any]], Tuple | list] | None, 
+              filename_maxlen: int, 
+              sanitize_emoji: bool, 
+              options: PrintOptions = PrintOptions()) -> None:
         """
         테이블 형식 데이터를 출력
         sort_key를 통해 정렬 후, 길이가 긴 열을 자르고 출력
+        원본 행은 변경하지 않고, 열 폭을 먼저 한 번 계산한 뒤 행을 조금씩 나누어 출력
         """
+        with metrics.phase("print.select"):
+            rows: List[Dict[str, Any]] = TablePrinter._select(table, sort_key, options)
+        if not rows:
+            print("")
+            return
+
+        with metrics.phase("print.render"):
+            TablePrinter._render(rows, filename_maxlen, sanitize_emoji)
+
+        if options.limit is not None and len(table) > len(rows):
+            print(f"... (전체 {len(table)}개 중 {options.offset + 1}~{options.offset + len(rows)}번째 행 출력)")
 
-        data_to_print: List[Dict[str, Any]] = sorted(table, key=sort_key) if sort_key else table
-        if sanitize_emoji: sanitize_col(data_to_print, "\n이름")
-        truncate_col(data_to_print, "\n이름", filename_maxlen)
+    @staticmethod
+    def _render(rows: List[Dict[str, Any]], filename_maxlen: int, sanitize_emoji: bool) -> None:
+        """
+        선택된 행을 열 폭을 맞춰 출력
+        """
+        import sys
+
+        floatfmt: str = config().tabulate_floatfmt
+        headers: List[str] = list(rows[0].keys())
+
+        def render(row: Dict[str, Any]) -> Iterable[Any]:
+            for key in headers:
+                value: Any = row.get(key)
+                if key == NAME_COL and isinstance(value, str):
+                    value = render_name(value, sanitize_emoji, filename_maxlen)
+                yield value
+
+        # 1차: 열 타입 판별
+        columns: List[_ColumnFormat] = [_ColumnFormat(h) for h in headers]
+        for row in rows:
+            for column, value in zip(columns, render(row)):
+                column.observe(value)
+
+        # 2차: 열 폭과 소수점 자릿수 계산
+        # 숫자 열은 소수점 위치를 맞추면 (폭 - 소수점 뒤 자릿수)의 최댓값 + 소수점 뒤 최대 자릿수가 열 폭이 됨
+        int_widths: List[int] = [0] * len(columns)
+        for row in rows:
+            for i, (column, value) in enumerate(zip(columns, render(row))):
+                text: str = column.format(value, floatfmt)
+                if column.numeric:
+                    after_point: int = _after_point(text)
+                    column.max_after_point = max(column.max_after_point, after_point)
+                    int_widths[i] = max(int_widths[i], text_width(text) - after_point)
+                else:
+                    column.width = max(column.width, text_width(text))
+        for column, int_width in zip(columns, int_widths):
+            if column.numeric: column.width = max(column.width, int_width + column.max_after_point)
+
+        # 헤더 출력 (여러 줄 헤더는 아래쪽을 빈 칸으로 채움)
+        header_height: int = max(len(c.header_lines) for c in columns)
+        lines: List[str] = []
+        for i in range(header_height):
+            cells: List[str] = []
+            for column in columns:
+                line: str = column.header_lines[i] if i < len(column.header_lines) else ""
+                pad: str = " " * (column.width - text_width(line))
+                cells.append(pad + line if column.numeric else line + pad)
+            lines.append("  ".join(cells).rstrip())
+        lines.append("  ".join("-" * c.width for c in columns))
+
+        # 행 출력
+        for row in rows:
+            lines.append("  ".join(c.pad(c.format(v, floatfmt)) for c, v in zip(columns, render(row))).rstrip())
+            if len(lines) >= _WRITE_CHUNK:
+                sys.stdout.write("\n".join(lines) + "\n")
+                lines = []
+        if lines: sys.stdout.write("\n".join(lines) + "\n")
 
-        print(tabulate(
-            tabular_data=data_to_print,
-            headers="keys", 
-            floatfmt=load_env("TABULATE_FLOATFMT"))
-        )
\ No newline at end of file
+    @staticmethod
+    def print_groups(tables: Dict[Tuple[str, bool], List[Dict[str, Any]]],
+                     sort_key: Callable[[Dict[str, Any]], Tuple | list] | None,
+                     filename_maxlen: int,
+                     sanitize_emoji: bool,
+                     options: PrintOptions = PrintOptions()) -> None:
+        """
+        (분류 폴더, 가분류 여부)별로 묶인 테이블을 미분류 → 분류 → 가분류 순서로 출력
+        summary_only이면 그룹별 개수만 출력
+        """
+        sorted_items = sorted(tables.items(), key=lambda i: (bool(i[0][0]), i[0][1], i[0][0]))
+        for (dirname, pseudo_classified), table in sorted_items:
+            if not dirname:
+                print(f"\n\n[ 분류되지 않은 비디오 목록 - 총 {len(table)}개 ]")
+            elif pseudo_classified:
+                print(f"\n\n[ '{dirname}' 경로로 모의 분류된 비디오 목록 (실제로 분류되지 않음) - 총 {len(table)}개 ]")
+            else:
+                print(f"\n\n[ '{dirname}' 경로로 분류된 비디오 목록 - 총 {len(table)}개 ]")
+            if not options.summary_only:
+                TablePrinter.print(table, sort_key, filename_maxlen, sanitize_emoji, options)
@@ -1,11 +1,20 @@
-from typing import Any, Dict, Iterator, List, Optional
-from dataclasses import dataclass
-from src.utils.ratio import ClosetRatio
-
-@dataclass
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, fields
+from src.utils.ratio import ClosetRatio, closet_ratio_of
+
+if TYPE_CHECKING:
+    from src.utils.bitrate_probe import SamplingPlan
+    from src.utils.keyframe_probe import GopStats
+    from src.utils.probe_cache import ProbeCache
+    from src.utils.metrics import FileSample
+
+@dataclass(slots=True)
 class VideoProps:
     """
     비디오 속성에 대한 데이터클래스
+    행이 많은 테이블의 메모리를 줄이기 위해 __slots__를 사용하고,
+    ClosetRatio와 코덱/분류 폴더 이름 문자열은 같은 값끼리 하나의 객체를 공유
     """
     filename: str
     width: int
@@ -18,8 +27,36 @@ class VideoProps:
     duration: float
     codec: str
     ratio: ClosetRatio
-    keyframe_interval: Optional[float] = None
+    keyframe_interval: Optional[float] = None # 키프레임 간격 평균
     moved_dirname: Optional[str] = None
+    bitrate_method: str = "stream" # vid_kbps를 구한 방식 (bitrate_probe.BITRATE_* 값)
+    keyframe_max: Optional[float] = None # 키프레임 간격 최댓값
+    keyframe_p95: Optional[float] = None # 키프레임 간격 95백분위수
+
+    def __post_init__(self) -> None:
+        self.ratio = closet_ratio_of(self.width, self.height, self.rotate_type)
+        self.codec = sys.intern(self.codec)
+        self.bitrate_method = sys.intern(self.bitrate_method)
+        if self.moved_dirname is not None: self.moved_dirname = sys.intern(self.moved_dirname)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        # 작업 프로세스에서 넘어온 객체도 생성자(__post_init__)를 거쳐 공유 객체를 사용하도록 복원
+        return (VideoProps, tuple(getattr(self, f.name) for f in fields(self)))
+
+
+def keyframe_statistic(vid: VideoProps, statistic: Optional[str] = None) -> Optional[float]:
+    """
+    키프레임 분류/출력에 사용하는 키프레임 간격 통계 (statistic이 None이면 KEYFRAME_STATISTIC 설정값, 구하지 않았으면 None)
+    """
+    from src.utils.load_env import config
+    from src.utils.keyframe_probe import KEYFRAME_STATISTICS
+    return getattr(vid, KEYFRAME_STATISTICS[statistic or config().keyframe_statistic])
+
+
+def _apply_gop_stats(props: VideoProps, stats: "GopStats") -> None:
+    props.keyframe_interval = stats.mean
+    props.keyframe_max = stats.max
+    props.keyframe_p95 = stats.p95
 
 
 def _get_rotate_type(vid_stream: Optional[Dict[str, Any]]) -> int:
@@ -39,20 +76,20 @@ def _get_rotate_type(vid_stream: Optional[Dict[str, Any]]) -> int:
     return result[0] if result else 0
     
 
-def _get_video_props(filepath: str, filename: str, include_keyframe_interval: bool) -> VideoProps:
+def _video_props_from_probe(probe: Dict[str, Any], filepath: str, filename: str) -> VideoProps:
     """
-    지정한 영상파일의 여러 속성 리턴
+    ffprobe 결과(json)로 VideoProps 생성 (키프레임 정보 제외)
+    비디오 스트림에 bit_rate가 없으면(MKV/WebM, 리먹싱된 파일 등) 통계 태그나 컨테이너 비트레이트로 추정하고,
+    그래도 구할 수 없으면 bitrate_method가 BITRATE_UNKNOWN (_sample_bitrate로 패킷 샘플링 필요)
     """
-    import ffmpeg
     import os
     from src.utils.safe_ref import safe_dict
-    from src.utils.ratio import get_closet_ratio
-
-    probe: Dict[str, Any] = ffmpeg.probe(filepath)
+    from src.utils.bitrate_probe import estimate_bitrate
 
     streams: List[Dict[str, Any]] = probe.get("streams", [])
-    vid_stream: Optional[Dict[str, Any]] = next((stream for stream in streams if stream.get("codec_type") == "video" and "bit_rate" in stream), None)
+    vid_stream: Optional[Dict[str, Any]] = next((stream for stream in streams if stream.get("codec_type") == "video"), None)
     aud_stream: Optional[Dict[str, Any]] = next((stream for stream in streams if stream.get("codec_type") == "audio"), None)
+    vid_bps, aud_bps, bitrate_method = estimate_bitrate(probe, vid_stream, aud_stream)
 
     return VideoProps(
         filename = filename,
@@ -60,40 +97,147 @@ def _get_video_props(filepath: str, filename: str, include_keyframe_interval: bo
         height = (height := safe_dict(vid_stream, "height", -1)),
         rotate_type = (rotate_type := _get_rotate_type(vid_stream)),
         fps = float(eval(safe_dict(vid_stream, "r_frame_rate", "0"))),
-        vid_kbps = round(int(safe_dict(vid_stream, "bit_rate", 0)) / 1000),
-        aud_kbps = round(int(safe_dict(aud_stream, "bit_rate", 0)) / 1000),
+        vid_kbps = round((vid_bps or 0) / 1000),
+        aud_kbps = round((aud_bps or 0) / 1000),
         vid_size_MB = os.path.getsize(filepath) / (1024 * 1024),
-        duration = (duration := float(safe_dict(vid_stream, "duration", 0)) or 0.0),
+        duration = float(safe_dict(vid_stream, "duration", 0)) or float(safe_dict(probe.get("format"), "duration", 0)) or 0.0, # MKV는 스트림 길이가 없음
         codec = safe_dict(vid_stream, "codec_name", "unknown"),
-        ratio = get_closet_ratio(width / height if abs(rotate_type) % 180 == 0 else height / width), #회전을 고려한 비율 계산
-        keyframe_interval = _get_keyframe_interval(filepath, duration) if include_keyframe_interval else None
+        ratio = closet_ratio_of(width, height, rotate_type), #회전을 고려한 비율 계산
+        bitrate_method = bitrate_method
     )
 
 
-def _get_keyframe_interval(filepath: str, duration: float) -> float:
+def _sampling_plan(probe: Dict[str, Any], props: VideoProps) -> Optional["SamplingPlan"]:
+    """
+    ffprobe 결과만으로 비트레이트를 구하지 못한 경우의 패킷 샘플링 계획 (필요 없거나 불가능하면 None)
+    """
+    from src.utils.bitrate_probe import BITRATE_UNKNOWN, sampling_plan
+
+    if props.bitrate_method != BITRATE_UNKNOWN: return None
+    streams: List[Dict[str, Any]] = probe.get("streams", [])
+    vid_stream: Optional[Dict[str, Any]] = next((stream for stream in streams if stream.get("codec_type") == "video"), None)
+    aud_stream: Optional[Dict[str, Any]] = next((stream for stream in streams if stream.get("codec_type") == "audio"), None)
+    return sampling_plan(vid_stream, aud_stream, props.duration, props.fps)
+
+
+def _apply_sampled_bitrate(props: VideoProps, sampled: Tuple[Optional[int], Optional[int]]) -> None:
     """
-    키프레임 간격을 빠르게 얻되,
-    최대 15초 구간까지만 탐색.
-    15초 탐색에서도 1개 이하인 경우 → 15초로 간주.
+    패킷 샘플링으로 구한 (비디오 bps, 오디오 bps)를 반영 (오디오는 모르는 경우에만)
+    """
+    from src.utils.bitrate_probe import BITRATE_SAMPLED
+
+    vid_bps, aud_bps = sampled
+    if vid_bps:
+        props.vid_kbps = round(vid_bps / 1000)
+        props.bitrate_method = BITRATE_SAMPLED
+    if aud_bps and not props.aud_kbps: props.aud_kbps = round(aud_bps / 1000)
+
+
+def _ffprobe_json(filepath: str, sample: Optional["FileSample"] = None) -> Dict[str, Any]:
+    """
+    ffprobe로 format/streams 정보를 json으로 읽음 (ffmpeg.probe와 같은 결과)
+    sample이 주어지면 ffprobe 실행 시간과 json 해석 시간, 출력 크기를 따로 기록
+    """
+    import json
+    import subprocess
+    import ffmpeg
+    from src.utils.metrics import timed_step
+
+    with timed_step(sample, "ffprobe"):
+        proc: subprocess.CompletedProcess = subprocess.run(
+            ["ffprobe", "-show_format", "-show_streams", "-of", "json", filepath],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    if proc.returncode != 0:
+        raise ffmpeg.Error("ffprobe", proc.stdout, proc.stderr)
+    with timed_step(sample, "json_parse"):
+        probe: Dict[str, Any] = json.loads(proc.stdout.decode("utf-8"))
+    if sample is not None: sample.output_bytes += len(proc.stdout)
+    return probe
+
+
+def _get_video_props(filepath: str, filename: str, include_keyframe_interval: bool, sample: Optional["FileSample"] = None) -> VideoProps:
+    """
+    지정한 영상파일의 여러 속성 리턴
+    MP4/MKV 등은 헤더를 직접 읽고, 해석할 수 없는 파일만 ffprobe 사용
+    sample이 주어지면 분석 방식과 세부 단계 시간을 기록
+    """
+    from src.utils.load_env import load_env_flag
+    from src.utils.container_probe import probe_container
+    from src.utils.metrics import timed_step
+
+    props: Optional[VideoProps] = None
+    if load_env_flag("NATIVE_PROBE_ENABLED"):
+        with timed_step(sample, "native_header"):
+            props = probe_container(filepath, filename)
+    if sample is not None: sample.method = "native" if props is not None else "ffprobe"
+    if props is None:
+        probe: Dict[str, Any] = _ffprobe_json(filepath, sample)
+        props = _video_props_from_probe(probe, filepath, filename)
+        if (plan := _sampling_plan(probe, props)) is not None:
+            from src.utils.bitrate_probe import sample_bitrate
+            with timed_step(sample, "bitrate_sample"):
+                _apply_sampled_bitrate(props, sample_bitrate(filepath, plan))
+
+    if include_keyframe_interval:
+        with timed_step(sample, "keyframe"):
+            _apply_gop_stats(props, _get_gop_stats(filepath, props.duration, sample))
+    return props
+
+
+def _get_gop_stats(filepath: str, duration: float, sample: Optional["FileSample"] = None) -> "GopStats":
+    """
+    키프레임 간격(GOP 길이)의 평균, 최댓값, 95백분위수를 빠르게 얻되,
+    MP4/MKV 등은 컨테이너의 키프레임 인덱스(stss, Cues)로 파일 전체의 통계를 구함.
+    인덱스를 읽을 수 없는 경우에만 ffprobe 사용.
+    KEYFRAME_PROBE_MODE가 packets면 처음/중간/끝 등 KEYFRAME_PROFILE_POINTS개 지점에서 KEYFRAME_PROFILE_WINDOW초씩만
+    ffprobe 한 번으로 패킷의 키프레임 플래그를 읽고, 파일당 KEYFRAME_PROFILE_BUDGET_MB, KEYFRAME_PROBE_TIMEOUT초를 넘기면 남은 지점은 읽지 않음.
+    (이전 방식처럼 키프레임 2개를 찾은 즉시 멈추지 않고 구간을 끝까지 읽음: 최댓값/95백분위수는 구간 안의 긴 GOP까지 봐야 하므로,
+     GOP가 촘촘한 파일도 구간 길이만큼 읽으며 읽기량은 위 예산으로 제한)
+    frames면 앞부분 구간을 2.1초, 5.1초, 10초로 늘려가며 ffprobe를 여러 번 실행 (이전 방식, 10초 탐색에서도 1개 이하 → 10초로 간주)
+    sample이 주어지면 분석 방식과 세부 단계 시간을 기록
     """
     import ffmpeg
-    import statistics
+    from src.utils.load_env import Config, config
+    from src.utils.container_probe import native_gop_stats
+    from src.utils.keyframe_probe import KEYFRAME_LIMITS, GopStats, profile_gop, profile_windows
+    from src.utils.metrics import timed_step
 
-    lim_list: List[float] = [2.1, 5.1, 10]
+    cfg: Config = config()
+    lim_list: List[float] = list(KEYFRAME_LIMITS)
 
     # 극단적으로 짧은 비디오는 키프레임 값 1.0
     if duration < lim_list[0]:
-        return 1.0
+        if sample is not None: sample.keyframe_method = "short"
+        return GopStats.constant(1.0)
+
+    if cfg.native_probe_enabled:
+        with timed_step(sample, "keyframe_index"):
+            stats: Optional[GopStats] = native_gop_stats(filepath, duration)
+        if stats is not None:
+            if sample is not None: sample.keyframe_method = "native"
+            return stats
+
+    if sample is not None: sample.keyframe_method = "ffprobe"
+    if cfg.keyframe_probe_mode == "packets":
+        with timed_step(sample, "keyframe_ffprobe"):
+            return profile_gop(
+                filepath,
+                profile_windows(duration, cfg.keyframe_profile_points, cfg.keyframe_profile_window),
+                int(cfg.keyframe_profile_budget_mb * 1024 * 1024),
+                cfg.keyframe_probe_timeout
+            )
 
     for lim in lim_list:
-        probe: Dict[str, Any] = ffmpeg.probe(
-            filepath,
-            select_streams="v",
-            skip_frame="nokey",
-            show_entries="frame=pts_time",
-            read_intervals=f"%+{lim}",
-            of="json"
-        )
+        with timed_step(sample, "keyframe_ffprobe"):
+            probe: Dict[str, Any] = ffmpeg.probe(
+                filepath,
+                select_streams="v",
+                skip_frame="nokey",
+                show_entries="frame=pts_time",
+                read_intervals=f"%+{lim}",
+                of="json"
+            )
 
         keyframes: List[float] = [
             float(frame.get("pts_time", 0))
@@ -102,32 +246,39 @@ def _get_keyframe_interval(filepath: str, duration: float) -> float:
 
         # 키프레임 2개 이상 → 간격 계산 가능
         if len(keyframes) >= 2:
-            intervals: List[float] = [j - i for i, j in zip(keyframes[:-1], keyframes[1:])]
-            if intervals:
-                return statistics.mean(intervals)
+            return GopStats.of([j - i for i, j in zip(keyframes[:-1], keyframes[1:])])
 
     # 여기 오면 키프레임이 2개 미만
-    return float(lim_list[-1])
+    return GopStats.constant(float(lim_list[-1]))
 
 
-def _worker_include_keyframe_at(args: tuple[str, str, Optional[float], float]) -> tuple[str, Optional[float]]:
+def _worker_include_keyframe_at(args: tuple[str, str, bool, float]) -> tuple[str, Optional["GopStats"], Optional["FileSample"]]:
     import os 
-    target_root_dir, filename, current_interval, duration = args
+    from src.utils.metrics import file_sample
+    target_root_dir, filename, has_keyframe, duration = args
     filepath: str = os.path.join(target_root_dir, filename)
 
-    if current_interval: return f"Skipped {filename} (이미 키프레임이 확인된 파일)", None
+    if has_keyframe: return f"Skipped {filename} (이미 키프레임이 확인된 파일)", None, None
 
-    return f"{filename}", _get_keyframe_interval(filepath, duration)
+    with file_sample("keyframe", filepath, filename) as sample:
+        stats: "GopStats" = _get_gop_stats(filepath, duration, sample)
+    return f"{filename}", stats, sample
 
 
-def include_keyframe_at(video_prop_table: List[VideoProps], target_root_dir: str) -> None:
+def include_keyframe_at(video_prop_table: List[VideoProps], target_root_dir: str, probe_cache: Optional["ProbeCache"] = None) -> None:
     """
     구해진 video_prop_table에 키프레임 정보를 추가적으로 삽입
+    probe_cache가 주어지면 구한 키프레임 정보를 캐시에도 반영
     """
-    from concurrent.futures import ProcessPoolExecutor
-
-    tasks: List[tuple[str, str, Optional[float], float]] = [
-        (target_root_dir, vid.filename, vid.keyframe_interval, vid.duration) 
+    import os
+    from src.utils.probe_cache import file_stat_key
+    from src.utils.load_env import load_env
+    from src.utils.async_probe import probe_gop_stats
+    from src.utils.worker_pool import map_batched
+    from src.utils.metrics import FileSample, metrics
+
+    tasks: List[tuple[str, str, bool, float]] = [
+        (target_root_dir, vid.filename, keyframe_statistic(vid) is not None, vid.duration) 
         for vid in video_prop_table
     ]
 
@@ -135,48 +286,129 @@ def include_keyframe_at(video_prop_table: List[VideoProps], target_root_dir: str
     print(f"[INFO] 기존 테이블에 키프레임 정보를 추가합니다.")
     print(f"[INFO] 작업 경로: {target_root_dir}")
 
-    with ProcessPoolExecutor() as exe:
-        results: Iterator[tuple[str, Optional[float]]] = exe.map(_worker_include_keyframe_at, tasks)
-
-        for i, (vid, (log, interval)) in enumerate(zip(video_prop_table, results), 1):
-            progress: float = (i / total_tasks) * 100
-            print(f"\r[progress{progress:5.1f}%] 파일 '{log}' 완료".ljust(150), end="", flush=True)
-            vid.keyframe_interval = interval
+    updated: List[VideoProps] = []
+    with metrics.phase("keyframe.probe"):
+        if load_env("PROBE_ENGINE") == "async":
+            # asyncio 엔진: 키프레임 정보가 없는 파일만 끝나는 순서대로 반영
+            prop_map: Dict[str, VideoProps] = {vid.filename: vid for vid in video_prop_table if keyframe_statistic(vid) is None}
+            total_async: int = len(prop_map)
+
+            def on_result(i: int, filename: str, stats: "GopStats") -> None:
+                progress: float = (i / total_async) * 100
+                print(f"\r[progress{progress:5.1f}%] 파일 '{filename}' 완료".ljust(150), end="", flush=True)
+                _apply_gop_stats(prop_map[filename], stats)
+                updated.append(prop_map[filename])
+
+            probe_gop_stats(target_root_dir, {filename: vid.duration for filename, vid in prop_map.items()}, on_result)
+        else:
+            results: Iterator[tuple[str, Optional["GopStats"], Optional[FileSample]]] = map_batched(_worker_include_keyframe_at, tasks)
+
+            for i, (vid, (log, stats, sample)) in enumerate(zip(video_prop_table, results), 1):
+                progress: float = (i / total_tasks) * 100
+                print(f"\r[progress{progress:5.1f}%] 파일 '{log}' 완료".ljust(150), end="", flush=True)
+                metrics.record(sample)
+                if stats is None: continue
+                _apply_gop_stats(vid, stats)
+                updated.append(vid)
+
+    if probe_cache is not None:
+        with metrics.phase("keyframe.cache_store"):
+            entries: List[tuple[str, int, int, VideoProps]] = []
+            for vid in updated:
+                try: entries.append((*file_stat_key(os.path.join(target_root_dir, vid.filename)), vid))
+                except OSError: continue # 분석 도중 이동/삭제된 파일은 캐시하지 않음
+            probe_cache.put_many(entries)
 
     print("\r[INFO] 작업이 완료되었습니다.".ljust(150))
 
 
-def _worker_get_video_prop_table(args: tuple[str, str, bool]) -> tuple[VideoProps, str]:
+def _worker_get_video_prop_table(args: tuple[str, str, bool]) -> tuple[VideoProps, str, "FileSample"]:
     import os
+    from src.utils.metrics import file_sample
     target_root_dir, filename, include_keyframe_interval = args
     filepath = os.path.join(target_root_dir, filename)
     log: str = f"{filename}"
-    return _get_video_props(filepath, filename, include_keyframe_interval), log
+    with file_sample("scan", filepath, filename) as sample:
+        props: VideoProps = _get_video_props(filepath, filename, include_keyframe_interval, sample)
+    return props, log, sample
 
 
-def get_video_prop_table(target_root_dir: str, include_keyframe_interval: bool) -> List[VideoProps]:
+def get_video_prop_table(
+        target_root_dir: str,
+        include_keyframe_interval: bool,
+        probe_cache: Optional["ProbeCache"] = None,
+        filenames: Optional[List[str]] = None,
+        on_complete: Optional[Callable[[VideoProps], None]] = None) -> List[VideoProps]:
     """
     지정한 경로의 파일에 대한 비율 관련 테이블 리턴
+    probe_cache가 주어지면 크기/수정 시각이 그대로인 파일은 캐시에서 불러오고, 새로 분석한 결과는 캐시에 저장
+    filenames가 주어지면 해당 파일만 분석
+    on_complete가 주어지면 파일마다 결과가 확정되는 즉시(캐시 사용 파일은 조회 즉시, 새로 분석한 파일은 끝나는 순서대로) 호출
     """
-    from src.utils.filesys import get_filenames
-    from concurrent.futures import ProcessPoolExecutor
+    import os
+    from src.utils.filesys import ScanOptions, get_video_filenames
+    from src.utils.probe_cache import file_stat_key
+    from src.utils.load_env import load_env
+    from src.utils.async_probe import probe_video_props
+    from src.utils.worker_pool import map_batched
+    from src.utils.metrics import metrics
+
+    if filenames is None:
+        with metrics.phase("scan.enumerate"):
+            filenames = get_video_filenames(target_root_dir, ScanOptions.from_env())
+    results: Dict[str, VideoProps] = {}
+    stat_keys: Dict[str, tuple[str, int, int]] = {}
+    need_keyframe: List[VideoProps] = [] # 캐시에는 있으나 키프레임 정보가 없는 항목
+
+    # 캐시 조회
+    if probe_cache is not None:
+        with metrics.phase("scan.cache_lookup"):
+            for filename in filenames:
+                stat_keys[filename] = (key := file_stat_key(os.path.join(target_root_dir, filename)))
+                if (cached := probe_cache.get(*key, filename)) is None: continue
+                results[filename] = cached
+                if include_keyframe_interval and keyframe_statistic(cached) is None:
+                    need_keyframe.append(cached)
+                elif on_complete is not None:
+                    on_complete(cached)
 
-    results: List[VideoProps] = []
     tasks: List[tuple[str, str, bool]] = [
         (target_root_dir, filename, include_keyframe_interval) 
-        for filename in get_filenames(target_root_dir)
+        for filename in filenames if filename not in results
     ]
 
     total_tasks: int = len(tasks)
     print(f"[INFO] 현재 작업 경로에 대한 정보를 생성합니다.")
     print(f"[INFO] 작업 경로: {target_root_dir}")
-
-    with ProcessPoolExecutor() as exe:
-        for i, (result, log) in enumerate(exe.map(_worker_get_video_prop_table, tasks), 1):
-            progress: float = (i / total_tasks) * 100
-            print(f"\r[progress{progress:5.1f}%] 파일 '{log}' 완료".ljust(150), end="", flush=True)
-            results.append(result)
+    if probe_cache is not None:
+        print(f"[INFO] 캐시 사용: {len(results)}개, 새로 분석: {total_tasks}개")
+
+    probed: List[VideoProps] = []
+
+    def on_result(i: int, result: VideoProps) -> None:
+        progress: float = (i / total_tasks) * 100
+        print(f"\r[progress{progress:5.1f}%] 파일 '{result.filename}' 완료".ljust(150), end="", flush=True)
+        results[result.filename] = result
+        probed.append(result)
+        if on_complete is not None: on_complete(result)
+
+    with metrics.phase("scan.probe"):
+        if tasks and load_env("PROBE_ENGINE") == "async":
+            # asyncio 엔진: ffprobe를 직접 동시 실행하고 끝나는 순서대로 반영
+            probe_video_props(target_root_dir, [filename for _, filename, _ in tasks], include_keyframe_interval, on_result)
+        elif tasks:
+            for i, (result, _, sample) in enumerate(map_batched(_worker_get_video_prop_table, tasks), 1):
+                metrics.record(sample)
+                on_result(i, result)
 
     print("\r[INFO] 작업이 완료되었습니다.".ljust(150))
 
-    return results
\ No newline at end of file
+    if probe_cache is not None:
+        with metrics.phase("scan.cache_store"):
+            probe_cache.put_many((*stat_keys[vid.filename], vid) for vid in probed)
+        if need_keyframe:
+            include_keyframe_at(need_keyframe, target_root_dir, probe_cache)
+            if on_complete is not None:
+                for vid in need_keyframe: on_complete(vid)
+
+    return [results[filename] for filename in filenames]
\ No newline at end of file
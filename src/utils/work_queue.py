@@ -0,0 +1,270 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from src.utils.video_prop import VideoProps
+from src.utils.filesys import ScanOptions
+
+_MAX_ATTEMPTS: int = 3 # 실패한 묶음(shard)을 다시 시도하는 최대 횟수
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    작업자 한 명이 한 번에 가져가 분석하는 파일 묶음
+    """
+    id: int
+    root: str
+    keyframe: bool
+    filenames: Tuple[str, ...] # root 기준 상대 경로
+
+
+@dataclass(frozen=True)
+class QueueStatus:
+    """
+    작업 큐 진행 상황 (묶음 수 기준, files/probed는 파일 수)
+    """
+    pending: int
+    claimed: int
+    done: int
+    failed: int
+    files: int
+    probed: int
+
+
+class WorkQueue:
+    """
+    여러 작업 경로의 분석 대상 파일을 묶음(shard) 단위로 나눠 담는 SQLite 작업 큐
+    같은 DB 파일을 여러 로컬 프로세스나 공유 파일 시스템의 여러 호스트가 함께 사용할 수 있음
+    - 여러 호스트가 함께 쓰므로 WAL 대신 기본 저널 모드를 사용하며, 호스트 간 작업 경로는 같은 경로로 보여야 함
+    - 묶음을 가져간 작업자가 WORK_QUEUE_LEASE_SECONDS 안에 끝내지 못하면(중단 등) 다른 작업자가 다시 가져감
+    - 분석 결과는 큐에 저장되며, VideoClassifier.load_work_queue로 작업 경로별 테이블 캐시에 병합
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        from src.utils.load_env import config, get_project_path
+
+        self._db_path: str = os.path.abspath(db_path or get_project_path(config().work_queue_path))
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(self._db_path, timeout=60, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS shards ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, root TEXT NOT NULL, keyframe INTEGER NOT NULL, "
+                "state TEXT NOT NULL DEFAULT 'pending', worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0, error TEXT);"
+                "CREATE TABLE IF NOT EXISTS files ("
+                "root TEXT NOT NULL, filename TEXT NOT NULL, shard_id INTEGER NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                "props TEXT, PRIMARY KEY (root, filename));"
+                "CREATE INDEX IF NOT EXISTS files_shard ON files (shard_id);"
+                "CREATE INDEX IF NOT EXISTS shards_state ON shards (state);"
+            )
+
+    @property
+    def db_path(self) -> str: return self._db_path
+
+    def enqueue(self, roots: Iterable[str], scan_options: ScanOptions, keyframe: bool = False, shard_size: Optional[int] = None) -> int:
+        """
+        roots의 분석 대상 파일을 shard_size개(None이면 WORK_QUEUE_SHARD_SIZE)씩 묶어 큐에 추가
+        이미 큐에 있고 크기/수정 시각이 같은 파일은 건너뛰고, 사라진 파일은 큐에서 제거
+        새로 추가된 파일 수 리턴
+        """
+        from src.utils.load_env import config
+        from src.utils.filesys import walk_files
+
+        size_per_shard: int = max(1, shard_size or config().work_queue_shard_size)
+        added: int = 0
+        for root in roots:
+            root = os.path.abspath(root)
+            if not os.path.isdir(root):
+                raise FileNotFoundError(f"지정된 루트 디렉터리를 찾을 수 없거나 유효하지 않습니다: '{root}'")
+            current: Dict[str, Tuple[int, int]] = {
+                os.path.join(rel_dir, name): (size, mtime_ns)
+                for rel_dir, name, (_, size, mtime_ns), _ in walk_files(root, scan_options)
+            }
+
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # {파일이름: (크기, 수정 시각, 결과가 있거나 분석 중인지, 키프레임 포함 여부)}
+                    queued: Dict[str, Tuple[int, int, bool, bool]] = {
+                        filename: (size, mtime_ns, props is not None or state in ("pending", "claimed"), bool(shard_keyframe))
+                        for filename, size, mtime_ns, props, state, shard_keyframe in self._conn.execute(
+                            "SELECT f.filename, f.size, f.mtime_ns, f.props, s.state, s.keyframe FROM files f JOIN shards s ON s.id = f.shard_id WHERE f.root = ?",
+                            (root,)
+                        )
+                    }
+                    self._conn.executemany("DELETE FROM files WHERE root = ? AND filename = ?",
+                                           [(root, f) for f in queued if f not in current])
+
+                    # 새 파일, 내용이 바뀐 파일, 분석에 실패한 파일, 키프레임 정보가 추가로 필요한 파일만 새 묶음으로 추가
+                    targets: List[str] = [
+                        filename for filename, identity in current.items()
+                        if (q := queued.get(filename)) is None or q[:2] != identity or not q[2] or (keyframe and not q[3])
+                    ]
+                    for start in range(0, len(targets), size_per_shard):
+                        shard_id: int = self._conn.execute(
+                            "INSERT INTO shards (root, keyframe) VALUES (?, ?)", (root, int(keyframe))
+                        ).lastrowid
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO files (root, filename, shard_id, size, mtime_ns, props) VALUES (?, ?, ?, ?, ?, NULL)",
+                            [(root, f, shard_id, *current[f]) for f in targets[start:start + size_per_shard]]
+                        )
+                    # 파일이 모두 다른 묶음으로 옮겨졌거나 사라진 묶음 정리
+                    self._conn.execute("DELETE FROM shards WHERE id NOT IN (SELECT shard_id FROM files)")
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            added += len(targets)
+        return added
+
+    def claim(self, worker: str) -> Optional[Shard]:
+        """
+        대기 중이거나 작업 기한이 지난(작업자 중단) 묶음 하나를 가져감 (없으면 None)
+        """
+        from src.utils.load_env import config
+
+        now: float = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row: Optional[Tuple[int, str, int]] = self._conn.execute(
+                    "SELECT id, root, keyframe FROM shards "
+                    "WHERE state = 'pending' OR (state = 'claimed' AND lease_until < ?) OR (state = 'failed' AND attempts < ?) "
+                    "ORDER BY state = 'failed', id LIMIT 1",
+                    (now, _MAX_ATTEMPTS)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                shard_id, root, keyframe = row
+                self._conn.execute(
+                    "UPDATE shards SET state = 'claimed', worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                    (worker, now + config().work_queue_lease_seconds, shard_id)
+                )
+                filenames: Tuple[str, ...] = tuple(f for (f,) in self._conn.execute(
+                    "SELECT filename FROM files WHERE shard_id = ? ORDER BY filename", (shard_id,)
+                ))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return Shard(shard_id, root, bool(keyframe), filenames)
+
+    def complete(self, shard: Shard, results: Mapping[str, VideoProps]) -> bool:
+        """
+        묶음의 분석 결과 {파일이름: VideoProps} 저장 후 완료 처리 (결과에 저장하는 크기/수정 시각은 분석 직후 파일 기준)
+        파일 이름은 묶음의 filenames 기준이며, 파일이 남아 있는데 결과가 없으면 받은 결과만 저장하고 묶음을 실패로 기록
+        완료 처리했으면 True 리턴
+        """
+        from src.utils.probe_cache import _props_to_json
+
+        rows: List[Tuple[int, int, str, str, str, int]] = []
+        missing: List[str] = []
+        for filename in shard.filenames:
+            try: st: os.stat_result = os.stat(os.path.join(shard.root, filename))
+            except OSError: continue # 분석 도중 이동/삭제된 파일
+            if (vid := results.get(filename)) is None:
+                missing.append(filename)
+                continue
+            rows.append((st.st_size, st.st_mtime_ns, _props_to_json(vid), shard.root, filename, shard.id))
+        error: Optional[str] = f"분석 결과 없음 ({len(missing)}개): {', '.join(missing[:10])}" if missing else None
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "UPDATE files SET size = ?, mtime_ns = ?, props = ? WHERE root = ? AND filename = ? AND shard_id = ?", rows
+                )
+                self._conn.execute(
+                    "UPDATE shards SET state = ?, lease_until = NULL, error = ? WHERE id = ?",
+                    ("failed" if missing else "done", error, shard.id)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if error is not None: print(f"[WARN] 묶음 #{shard.id} {error}")
+        return not missing
+
+    def fail(self, shard: Shard, error: str) -> None:
+        """
+        묶음을 실패로 기록 (시도 횟수가 남아 있으면 나중에 다시 가져감)
+        """
+        with self._lock:
+            self._conn.execute("UPDATE shards SET state = 'failed', lease_until = NULL, error = ? WHERE id = ?", (error, shard.id))
+
+    def roots(self) -> List[str]:
+        """
+        큐에 있는 작업 경로 목록
+        """
+        with self._lock:
+            return [root for (root,) in self._conn.execute("SELECT DISTINCT root FROM files ORDER BY root")]
+
+    def results(self, root: str) -> Dict[str, Tuple[int, int, VideoProps]]:
+        """
+        root의 분석 결과 {파일이름: (파일 크기, 수정 시각(ns), VideoProps)} (TableCache의 known 형식)
+        """
+        from src.utils.probe_cache import _props_from_json
+
+        with self._lock:
+            rows: List[Tuple[str, int, int, str]] = self._conn.execute(
+                "SELECT filename, size, mtime_ns, props FROM files WHERE root = ? AND props IS NOT NULL", (os.path.abspath(root),)
+            ).fetchall()
+
+        known: Dict[str, Tuple[int, int, VideoProps]] = {}
+        for filename, size, mtime_ns, raw in rows:
+            if (props := _props_from_json(raw, filename)) is not None:
+                known[filename] = (size, mtime_ns, props)
+        return known
+
+    def status(self) -> QueueStatus:
+        with self._lock:
+            counts: Dict[str, int] = dict(self._conn.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall())
+            files, probed = self._conn.execute("SELECT COUNT(*), COUNT(props) FROM files").fetchone()
+        return QueueStatus(counts.get("pending", 0), counts.get("claimed", 0), counts.get("done", 0), counts.get("failed", 0), files, probed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def default_worker_id() -> str:
+    """
+    작업자 식별 이름 (호스트 이름:프로세스 번호)
+    """
+    import socket
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(queue: WorkQueue, worker: Optional[str] = None, max_shards: Optional[int] = None) -> int:
+    """
+    큐가 빌 때까지(또는 max_shards개까지) 묶음을 가져가 분석하고 결과를 저장
+    묶음 안의 파일은 기존 분석 엔진(PROBE_ENGINE)으로 동시에 분석하며, 로컬 디스크 캐시도 그대로 사용
+    처리한 묶음 수 리턴
+    """
+    from src.utils.load_env import config
+    from src.utils.probe_cache import ProbeCache
+    from src.utils.video_prop import get_video_prop_table
+
+    worker = worker or default_worker_id()
+    probe_cache: Optional[ProbeCache] = ProbeCache() if config().probe_cache_enabled else None
+    processed: int = 0
+    try:
+        while max_shards is None or processed < max_shards:
+            if (shard := queue.claim(worker)) is None: break
+            print(f"[INFO] 묶음 #{shard.id} 분석 시작: {shard.root} ({len(shard.filenames)}개)")
+            try:
+                existing: List[str] = [f for f in shard.filenames if os.path.isfile(os.path.join(shard.root, f))]
+                results: List[VideoProps] = get_video_prop_table(shard.root, shard.keyframe, probe_cache, existing) if existing else []
+            except Exception as e:
+                print(f"[WARN] 묶음 #{shard.id} 분석 실패: {e}")
+                queue.fail(shard, repr(e))
+                continue
+            # 결과는 existing 순서이므로 VideoProps.filename 대신 묶음의 파일 이름으로 저장
+            if queue.complete(shard, dict(zip(existing, results))): processed += 1
+    finally:
+        if probe_cache is not None: probe_cache.close()
+    return processed
@@ -0,0 +1,92 @@
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 세션 전체에서 재사용하는 프로세스 풀 (분석, 키프레임 분석 등에서 공유)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size: int = 0
+_lock: threading.Lock = threading.Lock()
+
+
+def worker_pool_size() -> int:
+    """
+    공유 프로세스 풀의 워커 수 (WORKER_POOL_SIZE, 0이면 CPU 수)
+    """
+    import os
+    from src.utils.load_env import load_env
+    return int(load_env("WORKER_POOL_SIZE")) or os.cpu_count() or 1
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """
+    공유 프로세스 풀 리턴, 없거나 설정된 크기가 바뀐 경우 새로 생성
+    """
+    global _pool, _pool_size
+
+    size: int = worker_pool_size()
+    with _lock:
+        if _pool is not None and _pool_size != size:
+            _pool.shutdown(wait=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=size)
+            _pool_size = size
+        return _pool
+
+
+def shutdown_worker_pool() -> None:
+    """
+    공유 프로세스 풀 종료 (다음 사용 시 다시 생성됨)
+    """
+    global _pool
+
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def map_batched(fn: Callable[[Any], T], tasks: Iterable[Any]) -> Iterator[T]:
+    """
+    공유 프로세스 풀에서 tasks를 묶음 단위로 나누어 실행하고, 제출 순서대로 결과 리턴
+    묶음 크기는 WORKER_POOL_CHUNKSIZE (0이면 워커당 약 4묶음이 되도록 자동 계산)
+    실행 중 워커가 비정상 종료되면 풀을 새로 만들어 아직 결과를 받지 못한 작업만 한 번 다시 실행
+    """
+    from concurrent.futures.process import BrokenProcessPool
+    from src.utils.load_env import load_env
+
+    task_list: List[Any] = list(tasks)
+    if not task_list: return iter(())
+
+    chunksize: int = int(load_env("WORKER_POOL_CHUNKSIZE")) or max(1, len(task_list) // (worker_pool_size() * 4))
+    retried: bool = False
+    try:
+        first: Iterator[T] = get_worker_pool().map(fn, task_list, chunksize=chunksize)
+    except BrokenProcessPool:
+        # 이미 깨진 풀은 버리고 새 풀에 제출
+        shutdown_worker_pool()
+        first = get_worker_pool().map(fn, task_list, chunksize=chunksize)
+        retried = True
+
+    def results(current: Iterator[T], retried: bool) -> Iterator[T]:
+        received: int = 0
+        while True:
+            try:
+                for result in current:
+                    received += 1
+                    yield result
+                return
+            except BrokenProcessPool:
+                if retried: raise
+                retried = True
+                print(f"[WARN] 작업 프로세스가 비정상 종료되어 남은 {len(task_list) - received}개 작업을 다시 실행합니다.")
+                shutdown_worker_pool()
+                current = get_worker_pool().map(fn, task_list[received:], chunksize=chunksize)
+
+    return results(first, retried)
+
+
+atexit.register(shutdown_worker_pool)
@@ -1 +1,12 @@
-from src.video_classify.video_classifier import VideoClassifier, Pred, WindowsNameOrder, desc, col, t
\ No newline at end of file
+from typing import Any, List
+
+# 무거운 모듈(numpy 등)을 불러오는 video_classifier는 실제로 사용할 때 불러옴
+# (python -m src.video_classify 실행 시 시작 시간 단축, `from src.video_classify import *`도 그대로 동작)
+__all__: List[str] = ["VideoClassifier", "Pred", "WindowsNameOrder", "WINDOWS_NAME_ORDER", "desc", "asc", "col", "t"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from src.video_classify import video_classifier
+    return getattr(video_classifier, name)
\ No newline at end of file
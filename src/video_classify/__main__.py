@@ -0,0 +1,365 @@
+"""
+명령줄 실행 (저장소 루트에서): python -m src.video_classify <명령> <작업 경로> [옵션]
+- scan: 파일마다 분석이 끝나는 즉시 결과를 NDJSON/CSV 한 줄로 출력 (--by를 지정하면 분류될 폴더도 함께 출력, 파일은 이동하지 않음)
+- classify: --by 기준으로 분류한 뒤 파일별 결과 출력 (--pseudo면 이동 없이 scan --by와 같은 결과를 바로 출력)
+  --by keyframe,bitrate,ratio처럼 여러 기준을 지정하면 '_키프레임조정/16-9' 같은 중첩 폴더로 파일마다 한 번만 이동
+- unclassify: 분류 기록대로 분류 전 위치로 되돌림
+- print: 노트북의 .print와 같은 표 출력 (--queue를 지정하면 작업 큐의 분석 결과를 병합해 사용)
+- enqueue: 여러 작업 경로의 분석 대상 파일을 묶음 단위로 작업 큐(SQLite)에 추가
+- work: 작업 큐가 빌 때까지 묶음을 가져가 분석 (여러 프로세스/공유 폴더의 여러 호스트에서 동시에 실행 가능)
+- queue-status: 작업 큐 진행 상황을 json으로 출력
+scan, classify, work의 진행 상황 등 로그는 stderr로 출력하므로 stdout에는 결과만 남음
+
+예:
+    python -m src.video_classify scan /mnt/share --by bitrate --format csv > result.csv
+    python -m src.video_classify classify /mnt/share --by ratio --skip "filename~*keep_origin*"
+    python -m src.video_classify enqueue /mnt/share/a /mnt/share/b && python -m src.video_classify work
+"""
+import argparse
+import re
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.utils.video_prop import VideoProps
+
+Rule = Callable[["VideoProps"], bool]
+
+# 출력 필드 → VideoProps에서 값을 구하는 함수 (--skip 규칙에도 같은 이름 사용)
+_FIELD_GETTERS: Dict[str, Callable[["VideoProps"], Any]] = {
+    "filename": lambda vid: vid.filename,
+    "width": lambda vid: vid.width,
+    "height": lambda vid: vid.height,
+    "rotate_type": lambda vid: vid.rotate_type,
+    "fps": lambda vid: vid.fps,
+    "vid_kbps": lambda vid: vid.vid_kbps,
+    "bitrate_method": lambda vid: vid.bitrate_method,
+    "aud_kbps": lambda vid: vid.aud_kbps,
+    "vid_size_MB": lambda vid: vid.vid_size_MB,
+    "duration": lambda vid: vid.duration,
+    "codec": lambda vid: vid.codec,
+    "ratio": lambda vid: vid.ratio.real_value,
+    "ratio_type": lambda vid: vid.ratio.type,
+    "ratio_diff": lambda vid: vid.ratio.diff,
+    "keyframe_interval": lambda vid: vid.keyframe_interval,
+    "keyframe_max": lambda vid: vid.keyframe_max,
+    "keyframe_p95": lambda vid: vid.keyframe_p95
+}
+FIELDS: Tuple[str, ...] = ("filename", "dirname", "excluded", *(f for f in _FIELD_GETTERS if f != "filename"))
+
+_RULE_PATTERN: re.Pattern = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|==|=|<|>|~)\s*(.*?)\s*$")
+_CRITERIA: Tuple[str, ...] = ("ratio", "bitrate", "keyframe")
+_DEFAULT_BATCH: int = 1000 # scan에서 한 번에 분석을 맡기는 파일 수 (결과를 이 단위로만 메모리에 보관)
+
+
+def parse_rule(text: str) -> Rule:
+    """
+    "필드 연산자 값" 형식의 분류 예외 규칙을 함수로 변환
+    연산자: < <= > >= = != (숫자 또는 문자열 비교), ~ (glob 패턴 일치, 예: filename~*keep_origin*)
+    """
+    import fnmatch
+    import operator
+
+    matched: Optional[re.Match] = _RULE_PATTERN.match(text)
+    if matched is None or matched.group(1) not in _FIELD_GETTERS:
+        raise argparse.ArgumentTypeError(
+            f"규칙 형식이 올바르지 않습니다: {text!r} (예: vid_kbps<500, codec=hevc, filename~*keep_origin*, 필드: {', '.join(_FIELD_GETTERS)})"
+        )
+    field, op, raw = matched.groups()
+    get: Callable[["VideoProps"], Any] = _FIELD_GETTERS[field]
+
+    if op == "~":
+        return lambda vid: fnmatch.fnmatchcase(str(get(vid)), raw)
+
+    compare: Callable[[Any, Any], bool] = {
+        "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+        "=": operator.eq, "==": operator.eq, "!=": operator.ne
+    }[op]
+    try: number: Optional[float] = float(raw)
+    except ValueError: number = None
+
+    def rule(vid: "VideoProps") -> bool:
+        value: Any = get(vid)
+        if value is None: return False
+        if number is not None and isinstance(value, (int, float)): return compare(value, number)
+        return compare(str(value), raw)
+    return rule
+
+
+def _record(vid: "VideoProps", dirname: Optional[str], excluded: bool) -> Dict[str, Any]:
+    return {"filename": vid.filename, "dirname": dirname, "excluded": excluded,
+            **{field: get(vid) for field, get in _FIELD_GETTERS.items() if field != "filename"}}
+
+
+class _RecordWriter:
+    """
+    결과를 한 줄씩 바로 출력 (파이프로 받는 쪽이 곧바로 읽을 수 있도록 줄마다 flush)
+    """
+
+    def __init__(self, out: TextIO, fmt: str) -> None:
+        import csv
+
+        self._out: TextIO = out
+        self._csv: Optional[csv.DictWriter] = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(out, FIELDS, lineterminator="\n")
+            self._csv.writeheader()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        import json
+
+        if self._csv is not None: self._csv.writerow(record)
+        else: self._out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._out.flush()
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    from itertools import islice
+
+    it: Iterator[str] = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def parse_criteria(text: str) -> Tuple[str, ...]:
+    """
+    --by 값 파싱: "ratio" 또는 "keyframe,bitrate,ratio"처럼 쉼표로 이은 분류 기준 목록 (앞 기준의 폴더 아래에 다음 기준의 폴더)
+    """
+    criteria: Tuple[str, ...] = tuple(c.strip().lower() for c in text.split(",") if c.strip())
+    if not criteria or any(c not in _CRITERIA for c in criteria) or len(set(criteria)) != len(criteria):
+        raise argparse.ArgumentTypeError(f"분류 기준은 {', '.join(_CRITERIA)} 중 하나 이상을 중복 없이 쉼표로 지정해야 합니다: {text!r}")
+    return criteria
+
+
+def _classified_dirname(by: Tuple[str, ...]) -> Callable[["VideoProps"], Optional[str]]:
+    """
+    기준 목록대로 분류될 (중첩) 폴더를 구하는 함수 (VideoClassifier.classify(by=[...])와 같은 결과)
+    """
+    import os
+    from src.video_classify.by_bitrate import VideoClassifierByBitrate
+    from src.video_classify.by_ratio import VideoClassifierByRatio
+    from src.video_classify.by_keyframe import VideoClassifierByKeyframe
+
+    strategies: Dict[str, Any] = {"ratio": VideoClassifierByRatio, "bitrate": VideoClassifierByBitrate, "keyframe": VideoClassifierByKeyframe}
+    getters: List[Callable[["VideoProps"], Optional[str]]] = [strategies[c].classified_dirname for c in by]
+
+    def dirname(vid: "VideoProps") -> Optional[str]:
+        names: List[str] = [name for get in getters if (name := get(vid))]
+        return os.path.join(*names) if names else None
+    return dirname
+
+
+def _scan(args: argparse.Namespace, writer: _RecordWriter) -> None:
+    """
+    작업 경로를 순회하며 batch개씩 분석하고, 파일마다 결과가 나오는 즉시 출력
+    분석 결과는 batch 단위로만 보관하므로 파일 수가 많아도 메모리 사용량이 일정함
+    """
+    import os
+    from src.utils.filesys import walk_files
+    from src.utils.load_env import config
+    from src.utils.probe_cache import ProbeCache
+    from src.utils.video_prop import get_video_prop_table
+    from src.video_classify.video_classifier import VideoClassifier
+
+    dirname: Optional[Callable[["VideoProps"], Optional[str]]] = _classified_dirname(args.by) if args.by else None
+    keyframe: bool = args.keyframe or "keyframe" in (args.by or ())
+    rules: List[Rule] = args.skip
+    probe_cache: Optional[ProbeCache] = ProbeCache() if config().probe_cache_enabled else None
+
+    def emit(vid: "VideoProps") -> None:
+        excluded: bool = any(rule(vid) for rule in rules)
+        writer.write(_record(vid, None if dirname is None or excluded else dirname(vid), excluded))
+
+    filenames: Iterator[str] = (os.path.join(rel_dir, name) for rel_dir, name, _, _ in walk_files(args.root, VideoClassifier.scan_options()))
+    try:
+        for batch in _batched(filenames, args.batch):
+            get_video_prop_table(args.root, keyframe, probe_cache, batch, on_complete=emit)
+    finally:
+        if probe_cache is not None: probe_cache.close()
+
+
+def _classify(args: argparse.Namespace, writer: _RecordWriter) -> None:
+    """
+    분류 후 파일별 결과 출력 (dirname: 분류된 폴더, 분류되지 않았거나 예외 규칙에 해당하면 null)
+    """
+    from src.utils.pred import Pred
+    from src.video_classify.video_classifier import VideoClassifier
+
+    if args.pseudo:
+        _scan(args, writer)
+        return
+
+    with VideoClassifier(args.root) as classifier:
+        for rule in args.skip: classifier.add_exception_rule(rule)
+        classifier.include_keyframe_interval(args.keyframe or "keyframe" in args.by)
+        classifier.classify(by=[Pred[c.upper()] for c in args.by])
+        for vid in classifier.video_props():
+            writer.write(_record(vid, vid.moved_dirname, any(rule(vid) for rule in args.skip)))
+
+
+def _unclassify(args: argparse.Namespace) -> None:
+    from src.video_classify.video_classifier import VideoClassifier
+
+    with VideoClassifier(args.root) as classifier:
+        classifier.unclassify_files()
+
+
+def _print(args: argparse.Namespace) -> None:
+    from src.utils.pred import Pred
+    from src.video_classify.video_classifier import VideoClassifier
+
+    if args.queue is not None:
+        VideoClassifier.load_work_queue(args.queue or None, keyframe=args.keyframe or args.by == "keyframe")
+
+    sort_by: List[Tuple[str, bool]] = []
+    for spec in args.sort:
+        column, _, order = spec.rpartition(":") if spec.endswith((":asc", ":desc")) else (spec, "", "asc")
+        sort_by.append((column, order == "desc"))
+
+    with VideoClassifier(args.root) as classifier:
+        classifier.include_keyframe_interval(args.keyframe or args.by == "keyframe")
+        if args.filename_maxlen: classifier.set_filename_max_length(args.filename_maxlen)
+        classifier.print(by=Pred[args.by.upper()], sanitize_emoji=args.sanitize_emoji, sort_by=sort_by or None,
+                         limit=args.limit, offset=args.offset, summary_only=args.summary_only)
+
+
+def _enqueue(args: argparse.Namespace) -> None:
+    from src.utils.work_queue import WorkQueue
+    from src.video_classify.video_classifier import VideoClassifier
+
+    queue: WorkQueue = WorkQueue(args.queue)
+    try:
+        added: int = queue.enqueue(args.roots, VideoClassifier.scan_options(), args.keyframe, args.shard_size)
+        print(f"[INFO] 작업 큐에 {added}개 파일 추가: {queue.db_path}", file=sys.stderr)
+    finally:
+        queue.close()
+
+
+def _work(args: argparse.Namespace) -> None:
+    from src.utils.work_queue import WorkQueue, run_worker
+
+    queue: WorkQueue = WorkQueue(args.queue)
+    try:
+        processed: int = run_worker(queue, args.worker_id, args.max_shards)
+        print(f"[INFO] 묶음 {processed}개 분석 완료")
+    finally:
+        queue.close()
+
+
+def _queue_status(args: argparse.Namespace) -> None:
+    import json
+    from dataclasses import asdict
+    from src.utils.work_queue import WorkQueue
+
+    queue: WorkQueue = WorkQueue(args.queue)
+    try:
+        print(json.dumps({"queue": queue.db_path, **asdict(queue.status()), "roots": queue.roots()}, ensure_ascii=False))
+    finally:
+        queue.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.video_classify", description="비디오 분석/분류 명령줄 도구")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(p: argparse.ArgumentParser) -> None:
+        p.add_argument("root", help="작업 경로")
+        p.add_argument("--keyframe", action="store_true", help="키프레임 간격 포함 (--by keyframe이면 자동 포함)")
+
+    def add_output(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="출력 형식 (기본: ndjson)")
+        p.add_argument("--skip", action="append", type=parse_rule, default=[], metavar="RULE",
+                       help="분류 예외 규칙, 여러 번 지정 가능 (예: vid_kbps<500, codec=hevc, filename~*keep_origin*)")
+        p.add_argument("--quiet", action="store_true", help="진행 상황 로그 출력 안 함")
+
+    scan = commands.add_parser("scan", help="분석 결과를 파일마다 바로 출력 (파일은 이동하지 않음)")
+    add_common(scan)
+    add_output(scan)
+    scan.add_argument("--by", type=parse_criteria, default=None, metavar="CRITERIA",
+                      help="함께 출력할 분류 기준 (ratio, bitrate, keyframe 또는 keyframe,bitrate,ratio처럼 중첩)")
+    scan.add_argument("--batch", type=int, default=_DEFAULT_BATCH, help=f"한 번에 분석을 맡기는 파일 수 (기본: {_DEFAULT_BATCH})")
+
+    classify = commands.add_parser("classify", help="분류 후 파일별 결과 출력")
+    add_common(classify)
+    add_output(classify)
+    classify.add_argument("--by", type=parse_criteria, required=True, metavar="CRITERIA",
+                          help="분류 기준 (ratio, bitrate, keyframe), 쉼표로 이으면 중첩 폴더로 한 번에 분류 (예: keyframe,bitrate,ratio)")
+    classify.add_argument("--pseudo", action="store_true", help="실제로 이동하지 않고 분류 결과만 출력")
+    classify.add_argument("--batch", type=int, default=_DEFAULT_BATCH, help="--pseudo에서 한 번에 분석을 맡기는 파일 수")
+
+    unclassify = commands.add_parser("unclassify", help="분류 기록대로 분류 전 위치로 되돌림")
+    unclassify.add_argument("root", help="작업 경로")
+
+    table = commands.add_parser("print", help="표 형식으로 출력")
+    add_common(table)
+    table.add_argument("--by", choices=("ratio", "bitrate", "keyframe", "all"), default="all", help="출력 기준 (기본: all)")
+    table.add_argument("--sort", action="append", default=[], metavar="COLUMN[:asc|desc]",
+                       help='정렬 열, 여러 번 지정 가능 (예: --sort "b-rate 비율:desc" --sort "윈도우 이름 순")')
+    table.add_argument("--limit", type=int, default=None, help="분류 폴더별 출력 행 수")
+    table.add_argument("--offset", type=int, default=0, help="분류 폴더별로 건너뛸 행 수")
+    table.add_argument("--summary-only", action="store_true", help="분류 폴더별 개수만 출력")
+    table.add_argument("--sanitize-emoji", action="store_true", help="파일 이름의 이모지 등을 ?로 치환")
+    table.add_argument("--filename-maxlen", type=int, default=None, help="파일 이름 열의 너비")
+    table.add_argument("--queue", nargs="?", const="", default=None, metavar="PATH",
+                       help="작업 큐의 분석 결과를 병합해 출력 (경로 생략 시 WORK_QUEUE_PATH)")
+
+    def add_queue(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--queue", default=None, metavar="PATH", help="작업 큐 파일 경로 (기본: WORK_QUEUE_PATH)")
+
+    enqueue = commands.add_parser("enqueue", help="작업 경로들의 분석 대상 파일을 작업 큐에 추가")
+    enqueue.add_argument("roots", nargs="+", metavar="root", help="작업 경로 (여러 개 지정 가능)")
+    enqueue.add_argument("--keyframe", action="store_true", help="키프레임 간격 포함")
+    enqueue.add_argument("--shard-size", type=int, default=None, help="묶음 하나의 파일 수 (기본: WORK_QUEUE_SHARD_SIZE)")
+    add_queue(enqueue)
+
+    work = commands.add_parser("work", help="작업 큐가 빌 때까지 묶음을 가져가 분석")
+    work.add_argument("--worker-id", default=None, help="작업자 이름 (기본: 호스트 이름:프로세스 번호)")
+    work.add_argument("--max-shards", type=int, default=None, help="처리할 최대 묶음 수")
+    work.add_argument("--quiet", action="store_true", help="진행 상황 로그 출력 안 함")
+    add_queue(work)
+
+    status = commands.add_parser("queue-status", help="작업 큐 진행 상황을 json으로 출력")
+    add_queue(status)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import contextlib
+    import os
+
+    args: argparse.Namespace = build_parser().parse_args(argv)
+    for root in getattr(args, "roots", None) or ([args.root] if hasattr(args, "root") else []):
+        if not os.path.isdir(root):
+            print(f"[WARN] 작업 경로를 찾을 수 없습니다: '{root}'", file=sys.stderr)
+            return 2
+
+    if args.command == "enqueue":
+        _enqueue(args)
+        return 0
+    if args.command == "queue-status":
+        _queue_status(args)
+        return 0
+    if args.command == "unclassify":
+        _unclassify(args)
+        return 0
+    if args.command == "print":
+        _print(args)
+        return 0
+
+    # 결과는 stdout으로, 라이브러리의 진행 상황 출력은 stderr(--quiet면 버림)로 보냄
+    out: TextIO = sys.stdout
+    writer: _RecordWriter = _RecordWriter(out, getattr(args, "format", "ndjson")) # work는 결과를 출력하지 않음
+    try:
+        with open(os.devnull, "w", encoding="utf-8") if args.quiet else contextlib.nullcontext(sys.stderr) as log, \
+                contextlib.redirect_stdout(log):
+            if args.command == "work": _work(args)
+            else: {"scan": _scan, "classify": _classify}[args.command](args, writer)
+    except BrokenPipeError:
+        # head 등 출력을 받는 쪽이 먼저 종료된 경우 (종료 시 flush 오류가 나지 않도록 stdout을 devnull로 교체)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,52 +1,36 @@
-from typing import Any, Dict, Callable, Tuple, Optional, List
+from typing import Any, Dict, Callable, Hashable, Tuple, Optional, List
 from src.utils import bitrate_utils as bu
 from src.utils.video_prop import VideoProps
 from src.utils.table_cache import TableCache
+from src.utils.columnar import DerivedColumns, VideoPropColumns
+from src.utils.table_printer import PrintOptions
 
 
 class VideoClassifierByBitrate:
+    SD_DIRNAME: str = "_비트레이트 최적화"
+    HD_DIRNAME: str = "_비트레이트 프리셋컷"
+    dirnames: Tuple[str, ...] = (SD_DIRNAME, HD_DIRNAME) # 분류 폴더 이름 목록
+    columns: Tuple[str, ...] = ("\n이름", "\nW", "\nH", "\n│", "\nb-rate", "\u200b\n│", "최적\nW", "최적\nH", "최적\nb-rate", "b-rate\n비율") # 출력 열 목록
+
     @staticmethod
     def print(cache: TableCache,
               sort_key: Callable[[Dict[str, Any]], Tuple | list] | None, 
               filename_maxlen: int, 
-              sanitize_emoji: bool) -> None:
+              sanitize_emoji: bool,
+              options: PrintOptions = PrintOptions()) -> None:
         from src.utils.table_printer import TablePrinter
         from src.utils.bitrate_utils import BASE_BITRATE
-        from src.utils.filesys import file_exists_in
-        from collections import defaultdict
-        
-        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = defaultdict(list)
+
+        # 최적 해상도/비트레이트, 분류 여부는 테이블 캐시의 파생 열을 사용 (설정값이나 행이 바뀌기 전까지 재사용)
+        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = cache.grouped_rows(VideoClassifierByBitrate.columns)
+        derived: DerivedColumns = cache.derived
         total_filesize: float = 0
         total_reduced_filesize: float = 0
-        for vid in cache.data:
-            pseudo_classified: bool = vid.moved_dirname is not None and file_exists_in(cache.root_dir, vid.filename)
-            tables[(vid.moved_dirname or "", pseudo_classified)].append({
-                "\n이름": vid.filename,
-                "\nW": vid.width,
-                "\nH": vid.height,
-                "\n│": "│",
-                "\nb-rate": (bitrate := vid.vid_kbps),
-                "\u200b\n│": "│",
-                "최적\nW": int((opt_r := bu.optimal_resolution_ratio(vid.width, vid.height)) * vid.width),
-                "최적\nH": int(opt_r * vid.height),
-                "최적\nb-rate": (optimal_val := bu.optimal_bitrate(vid.width, vid.height)),
-                "b-rate\n비율": (bitrate_ratio := bitrate / optimal_val)
-            })
-            total_filesize += vid.vid_size_MB
-            total_reduced_filesize += vid.vid_size_MB / bitrate_ratio \
-                if (bu.is_overencoded_sd_video(bitrate, vid.width, vid.height) or 
-                    bu.is_overbitrate_hd_video(bitrate, vid.width, vid.height)) \
-                else vid.vid_size_MB
-        
-        sorted_items = sorted(tables.items(), key=lambda i: (bool(i[0][0]), i[0][1], i[0][0]))
-        for (dirname, pseudo_classified), table in sorted_items:
-            if not dirname:
-                print(f"\n\n[ 분류되지 않은 비디오 목록 - 총 {len(table)}개 ]")
-            elif pseudo_classified:
-                print(f"\n\n[ '{dirname}' 경로로 모의 분류된 비디오 목록 (실제로 분류되지 않음) - 총 {len(table)}개 ]")
-            else:
-                print(f"\n\n[ '{dirname}' 경로로 분류된 비디오 목록 - 총 {len(table)}개 ]")
-            TablePrinter.print(table, sort_key, filename_maxlen, sanitize_emoji)
+        for size_MB, bitrate_ratio, is_reducible in zip(derived.columns.vid_size_MB.tolist(), derived.bitrate_ratio, derived.reducible):
+            total_filesize += size_MB
+            total_reduced_filesize += size_MB / bitrate_ratio if is_reducible else size_MB
+
+        TablePrinter.print_groups(tables, sort_key, filename_maxlen, sanitize_emoji, options)
         
         print("\n==================================")
         print(f"목표 비트레이트: {BASE_BITRATE} kbps")
@@ -54,11 +38,29 @@ class VideoClassifierByBitrate:
         print(f"예상 절약시 총 용량: {total_reduced_filesize / 1024:.2f} GB")
         print(f"예상 절약 용량: {(total_filesize - total_reduced_filesize) / 1024:.2f} GB")
 
+    @staticmethod
+    def config_key() -> Hashable:
+        """
+        분류 결과가 의존하는 설정값 (값이 바뀌면 캐시된 분류 결과를 다시 계산)
+        """
+        from src.utils.columnar import bitrate_config
+        return bitrate_config()
+
     @staticmethod
     def classified_dirname(vid: VideoProps) -> Optional[str]:
         if bu.is_overencoded_sd_video(vid.vid_kbps, vid.width, vid.height):
-            return "_비트레이트 최적화"
+            return VideoClassifierByBitrate.SD_DIRNAME
         elif bu.is_overbitrate_hd_video(vid.vid_kbps, vid.width, vid.height):
-            return "_비트레이트 프리셋컷"
+            return VideoClassifierByBitrate.HD_DIRNAME
         
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def classified_dirnames(columns: VideoPropColumns) -> List[Optional[str]]:
+        """
+        classified_dirname을 전체 행에 대해 배열 연산으로 계산 (행 순서대로)
+        """
+        import numpy as np
+        overencoded_sd, overbitrate_hd = bu.bitrate_flags_array(columns.vid_kbps, columns.width, columns.height)
+        dirnames: np.ndarray = np.array([None, VideoClassifierByBitrate.HD_DIRNAME, VideoClassifierByBitrate.SD_DIRNAME], dtype=object)
+        return dirnames[np.where(overencoded_sd, 2, np.where(overbitrate_hd, 1, 0))].tolist()
@@ -1,45 +1,49 @@
-from typing import Any, Dict, Callable, Tuple, Optional, List
-from src.utils.video_prop import VideoProps
+from typing import Any, Dict, Callable, Hashable, Tuple, Optional, List
+from src.utils.video_prop import VideoProps, keyframe_statistic
 from src.utils.table_cache import TableCache
-from src.utils.load_env import load_env
+from src.utils.columnar import VideoPropColumns
+from src.utils.table_printer import PrintOptions
+from src.utils.load_env import config
 
 
 class VideoClassifierByKeyframe:
-    _keyframe_interval: float = float(load_env("THRESHOLD_KEYFRAME_INTERVAL"))
+    DIRNAME: str = "_키프레임조정"
+    dirnames: Tuple[str, ...] = (DIRNAME,) # 분류 폴더 이름 목록
+    columns: Tuple[str, ...] = ("\n이름", "\nW", "\nH", "\n│", "키프레임\n간격") # 출력 열 목록
 
     @staticmethod
     def print(cache: TableCache,
               sort_key: Callable[[Dict[str, Any]], Tuple | list] | None, 
               filename_maxlen: int, 
-              sanitize_emoji: bool) -> None:
+              sanitize_emoji: bool,
+              options: PrintOptions = PrintOptions()) -> None:
         from src.utils.table_printer import TablePrinter
-        from src.utils.filesys import file_exists_in
-        from collections import defaultdict
+        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = cache.grouped_rows(VideoClassifierByKeyframe.columns)
+        TablePrinter.print_groups(tables, sort_key, filename_maxlen, sanitize_emoji, options)
 
-        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = defaultdict(list)
-        for vid in cache.data:
-            pseudo_classified: bool = vid.moved_dirname is not None and file_exists_in(cache.root_dir, vid.filename)
-            tables[(vid.moved_dirname or "", pseudo_classified)].append({
-                "\n이름": vid.filename,
-                "\nW": vid.width,
-                "\nH": vid.height,
-                "\n│": "│",
-                "키프레임\n간격": vid.keyframe_interval or -1.0
-            })
-
-        sorted_items = sorted(tables.items(), key=lambda i: (bool(i[0][0]), i[0][1], i[0][0]))
-        for (dirname, pseudo_classified), table in sorted_items:
-            if not dirname:
-                print(f"\n\n[ 분류되지 않은 비디오 목록 - 총 {len(table)}개 ]")
-            elif pseudo_classified:
-                print(f"\n\n[ '{dirname}' 경로로 모의 분류된 비디오 목록 (실제로 분류되지 않음) - 총 {len(table)}개 ]")
-            else:
-                print(f"\n\n[ '{dirname}' 경로로 분류된 비디오 목록 - 총 {len(table)}개 ]")
-            TablePrinter.print(table, sort_key, filename_maxlen, sanitize_emoji)
+    @staticmethod
+    def config_key() -> Hashable:
+        """
+        분류 결과가 의존하는 설정값 (값이 바뀌면 캐시된 분류 결과를 다시 계산)
+        """
+        return (config().threshold_keyframe_interval, config().keyframe_statistic)
 
     @staticmethod
     def classified_dirname(vid: VideoProps) -> Optional[str]:
-        if vid.keyframe_interval is not None and vid.keyframe_interval > VideoClassifierByKeyframe._keyframe_interval:
-            return "_키프레임조정"
+        if (interval := keyframe_statistic(vid)) is not None and interval > config().threshold_keyframe_interval:
+            return VideoClassifierByKeyframe.DIRNAME
 
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def classified_dirnames(columns: VideoPropColumns) -> List[Optional[str]]:
+        """
+        classified_dirname을 전체 행에 대해 배열 연산으로 계산 (행 순서대로)
+        키프레임 정보가 없는 행(NaN)은 비교 결과가 False이므로 분류되지 않음
+        """
+        import numpy as np
+        from src.utils.keyframe_probe import KEYFRAME_STATISTICS
+        intervals: np.ndarray = getattr(columns, KEYFRAME_STATISTICS[config().keyframe_statistic])
+        with np.errstate(invalid="ignore"):
+            matched: np.ndarray = intervals > config().threshold_keyframe_interval
+        return [VideoClassifierByKeyframe.DIRNAME if m else None for m in matched.tolist()]
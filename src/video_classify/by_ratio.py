@@ -1,49 +1,47 @@
-from typing import Any, Dict, List, Callable, Tuple, Optional
+from typing import Any, Dict, Hashable, List, Callable, Tuple, Optional
 from src.utils.video_prop import VideoProps
 from src.utils.table_cache import TableCache
+from src.utils.columnar import VideoPropColumns
+from src.utils.table_printer import PrintOptions
 from src.utils import ratio
-from src.utils.load_env import load_env
+from src.utils.load_env import config
 
 
 class VideoClassifierByRatio:
-    _ratio_diff_cut: float = float(load_env("THRESHOLD_RATIO_DIFF"))
+    CUSTOM_DIRNAME: str = "기타해상도"
+    dirnames: Tuple[str, ...] = tuple(r["dirname"] for r in ratio.ratio_map.values()) + (CUSTOM_DIRNAME,) # 분류 폴더 이름 목록
+    columns: Tuple[str, ...] = ("\n이름", "\nW", "\nH", "\n│", "회전\n각도", "\n비율", "비율\n타입", "비율\n차이") # 출력 열 목록
 
     @staticmethod
     def print(cache: TableCache,
               sort_key: Callable[[Dict[str, Any]], Tuple | list] | None, 
               filename_maxlen: int, 
-              sanitize_emoji: bool) -> None:
+              sanitize_emoji: bool,
+              options: PrintOptions = PrintOptions()) -> None:
         from src.utils.table_printer import TablePrinter
-        from src.utils.filesys import file_exists_in
-        from collections import defaultdict
+        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = cache.grouped_rows(VideoClassifierByRatio.columns)
+        TablePrinter.print_groups(tables, sort_key, filename_maxlen, sanitize_emoji, options)
 
-        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = defaultdict(list)
-        for vid in cache.data:
-            pseudo_classified: bool = vid.moved_dirname is not None and file_exists_in(cache.root_dir, vid.filename)
-            tables[(vid.moved_dirname or "", pseudo_classified)].append({
-                "\n이름": vid.filename,
-                "\nW": vid.width,
-                "\nH": vid.height,
-                "\n│": "│",
-                "회전\n각도": vid.rotate_type,
-                "\n비율": vid.ratio.real_value,
-                "비율\n타입": vid.ratio.type,
-                "비율\n차이": vid.ratio.diff
-            })
-
-        sorted_items = sorted(tables.items(), key=lambda i: (bool(i[0][0]), i[0][1], i[0][0]))
-        for (dirname, pseudo_classified), table in sorted_items:
-            if not dirname:
-                print(f"\n\n[ 분류되지 않은 비디오 목록 - 총 {len(table)}개 ]")
-            elif pseudo_classified:
-                print(f"\n\n[ '{dirname}' 경로로 모의 분류된 비디오 목록 (실제로 분류되지 않음) - 총 {len(table)}개 ]")
-            else:
-                print(f"\n\n[ '{dirname}' 경로로 분류된 비디오 목록 - 총 {len(table)}개 ]")
-            TablePrinter.print(table, sort_key, filename_maxlen, sanitize_emoji)
+    @staticmethod
+    def config_key() -> Hashable:
+        """
+        분류 결과가 의존하는 설정값 (값이 바뀌면 캐시된 분류 결과를 다시 계산)
+        """
+        return (config().threshold_ratio_diff,)
 
     @staticmethod
     def classified_dirname(vid: VideoProps) -> Optional[str]:
-        if vid.ratio.diff <= VideoClassifierByRatio._ratio_diff_cut: 
+        if vid.ratio.diff <= config().threshold_ratio_diff: 
             return ratio.ratio_map[vid.ratio.type]["dirname"]
         else: 
-            return "기타해상도"
\ No newline at end of file
+            return VideoClassifierByRatio.CUSTOM_DIRNAME
+
+    @staticmethod
+    def classified_dirnames(columns: VideoPropColumns) -> List[Optional[str]]:
+        """
+        classified_dirname을 전체 행에 대해 배열 연산으로 계산 (행 순서대로)
+        """
+        import numpy as np
+        dirnames: np.ndarray = np.array([ratio.ratio_map[k]["dirname"] for k in ratio.ratio_keys] + [VideoClassifierByRatio.CUSTOM_DIRNAME], dtype=object)
+        index: np.ndarray = np.where(columns.ratio_diff <= config().threshold_ratio_diff, columns.ratio_index, len(ratio.ratio_keys))
+        return dirnames[index].tolist()
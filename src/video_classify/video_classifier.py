@@ -1,13 +1,22 @@
-from typing import Any, Dict, List, Optional, Callable, Tuple
+from typing import Any, Dict, List, Optional, Callable, Sequence, Set, Tuple, Type
 from src.utils.pred import Pred
+from src.utils.filesys import ScanOptions
 from src.utils.table_cache import TableCache
 from src.utils.video_prop import VideoProps
+from src.utils.columnar import VideoPropColumns
+from src.utils.file_mover import PlannedMove
+from src.utils.table_printer import PrintOptions, SortPass
+from src.utils.metrics import metrics
 from src.video_classify.by_bitrate import VideoClassifierByBitrate
 from src.video_classify.by_ratio import VideoClassifierByRatio
 from src.video_classify.by_keyframe import VideoClassifierByKeyframe
 
 
 desc: bool = True
+asc: bool = False
+WINDOWS_NAME_ORDER: str = "윈도우 이름 순" # sort_by 전용: 이름 열을 윈도우 이름 정렬 방식으로 정렬
+
+SortSpec = Sequence[Tuple[str, bool]] # (열 이름, 내림차순 여부) 목록, 앞쪽 열이 우선
 
 t: Dict[str, str] = {
     "이름": "\n이름",
@@ -44,11 +53,8 @@ def WindowsNameOrder(name: str) -> List[int | str]:
     """
     문자열을 윈도우 이름 정렬 방식으로 정렬
     """
-    import re
-    return [int(t) if t.isdigit() 
-        else t.lower()
-        for t in re.split(r"(\d+)", name)
-    ]
+    from src.utils.table_printer import windows_name_key
+    return list(windows_name_key(name))
 
 
 def _windows_name_order_desc(parts: List[int | str]) -> List[int | str]:
@@ -70,44 +76,152 @@ def _str_desc(s: str) -> str:
 
 
 class VideoClassifier:
-    _table_cache: Optional[TableCache] = None # 테이블 캐시 저장
-
-    def __init__(self) -> None:
+    _table_caches: Dict[str, TableCache] = {} # 작업 경로별 테이블 캐시 저장 (여러 작업 경로의 캐시를 동시에 유지)
+    _STRATEGIES: Dict[Pred, Type[VideoClassifierByRatio | VideoClassifierByBitrate | VideoClassifierByKeyframe]] = { # 기준별 분류 전략
+        Pred.RATIO: VideoClassifierByRatio,
+        Pred.BITRATE: VideoClassifierByBitrate,
+        Pred.KEYFRAME: VideoClassifierByKeyframe
+    }
+    _ALL_COLUMNS: Tuple[str, ...] = ( # Pred.ALL 출력 열 목록
+        "\n이름", "\nW", "\nH", "\n│", "회전\n각도", "\n비율", "비율\n타입", "비율\n차이", "\u200b\n│",
+        "\nb-rate", "최적\nW", "최적\nH", "최적\nb-rate", "b-rate\n비율", "\u200b\u200b\n│", "키프레임\n간격"
+    )
+
+    def __init__(self, root_dir: Optional[str] = None) -> None:
+        """
+        root_dir: 작업 경로 (None이면 .rootdir 파일의 경로 사용)
+        """
         from src.utils.load_env import load_env
         from src.utils.load_env import get_root_dir
         import os
 
-        self._cache: Optional[TableCache] = VideoClassifier._table_cache
-        self._root_dir = get_root_dir()
+        self._root_dir = root_dir if root_dir is not None else get_root_dir()
         if not os.path.isdir(self._root_dir):
             raise FileNotFoundError(f"지정된 루트 디렉터리를 찾을 수 없거나 유효하지 않습니다: '{self._root_dir}'")
 
-        # 작업 경로가 달라지는 경우 캐시 초기화
-        if self._cache and self._cache.root_dir != self._root_dir:
-            self._cache = None
-            VideoClassifier._table_cache = None
+        # 작업 경로를 바꿔도 다른 작업 경로의 캐시는 버리지 않고 유지
+        self._cache: Optional[TableCache] = VideoClassifier._table_caches.get(VideoClassifier._cache_key(self._root_dir))
 
         self._filename_maxlen = int(load_env("TABULATE_FILENAME_MAXLEN"))
         self._keyframe_flag: bool = False # include_keyframe_interval에서 대기 중인 플래그
         self._pseudo_classifiy_mode: bool = False # pseudo_classify_mode에서 대기 중인 플래그
+        self._watch_flag: bool = bool(self._cache and self._cache.watching) # watch에서 대기 중인 플래그
         self.exception_rules: List[Callable[[VideoProps], bool]] = []
 
 
+    def __enter__(self) -> "VideoClassifier":
+        return self
+
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        """
+        분석에 사용한 공유 프로세스 풀과 작업 경로 감시 종료 (테이블 캐시는 유지되며, 다음 분석 시 풀을 다시 생성)
+        인터프리터 종료 시에는 자동으로 종료됨
+        """
+        from src.utils.worker_pool import shutdown_worker_pool
+        if self._cache: self._cache.stop_watch()
+        self._watch_flag = False
+        shutdown_worker_pool()
+
+
+    @staticmethod
+    def scan_options() -> ScanOptions:
+        """
+        .env 설정과 분류 폴더 이름으로 분석 대상 탐색 조건 생성 (분류 폴더는 분석 대상에서 제외)
+        """
+        return ScanOptions.from_env(skip_dirnames=(
+            VideoClassifierByRatio.dirnames + 
+            VideoClassifierByBitrate.dirnames + 
+            VideoClassifierByKeyframe.dirnames
+        ))
+
+
+    @staticmethod
+    def _cache_key(root_dir: str) -> str:
+        import os
+        return os.path.normcase(os.path.abspath(root_dir))
+
+
+    @classmethod
+    def load_work_queue(cls, queue_path: Optional[str] = None, keyframe: bool = False) -> List[str]:
+        """
+        작업 큐(python -m src.video_classify enqueue/work)에 모인 분석 결과를 작업 경로별 테이블 캐시에 병합
+        큐의 결과 중 파일이 그대로인 항목은 다시 분석하지 않으며, 큐에 없거나 바뀐 파일만 새로 분석
+        이후 VideoClassifier(작업 경로)는 병합된 캐시를 그대로 사용
+        병합한 작업 경로 목록 리턴
+        """
+        import os
+        from src.utils.work_queue import WorkQueue
+
+        queue: WorkQueue = WorkQueue(queue_path)
+        try:
+            roots: List[str] = [root for root in queue.roots() if os.path.isdir(root)]
+            for root in roots:
+                key: str = cls._cache_key(root)
+                if (old := cls._table_caches.get(key)) is not None: old.stop_watch()
+                cls._table_caches[key] = TableCache(root, keyframe, scan_options=cls.scan_options(), known=queue.results(root))
+                print(f"[INFO] 작업 큐 결과 병합 완료: {root} ({len(cls._table_caches[key].data)}개)")
+        finally:
+            queue.close()
+        return roots
+
+
     def _prepare_cache(self) -> None:
         """
         캐시를 준비하는 메서드
-        캐시가 없으면 캐시 생성하거나, 키프레임 정보를 업데이트
+        캐시가 없으면 캐시 생성하거나, 변경분 반영 후 키프레임 정보를 업데이트
         """
         # 캐시가 비어 있으면 캐시 생성
         if not self._cache:
-            VideoClassifier._table_cache = TableCache(self._root_dir, self._keyframe_flag)
-            self._cache = VideoClassifier._table_cache
+            self._cache = TableCache(self._root_dir, self._keyframe_flag, scan_options=VideoClassifier.scan_options())
+            VideoClassifier._table_caches[VideoClassifier._cache_key(self._root_dir)] = self._cache
+            if self._watch_flag: self._cache.start_watch()
             return
         
-        # 캐시가 존재하는 경우 테이블 캐시의 키프레임 정보 업데이트
+        # 캐시가 존재하는 경우 작업 경로의 변경분만 반영하고 테이블 캐시의 키프레임 정보 업데이트
+        # (감시 모드에서는 변경이 없으면 작업 경로를 다시 읽지 않음)
+        self._cache.refresh()
         self._cache.update_keyframe(self._keyframe_flag)
+        if self._watch_flag: self._cache.start_watch()
+    
+
+    def video_props(self) -> List[VideoProps]:
+        """
+        현재 작업 경로의 분석 결과 목록 (분류/가분류된 파일은 moved_dirname에 분류 폴더가 기록됨)
+        리턴한 목록은 테이블 캐시와 공유하므로 수정하면 안 됨
+        """
+        self._prepare_cache()
+        assert self._cache is not None, "Table cache was empty."
+        return self._cache.data
     
 
+    def validate_probe_cache(self) -> None:
+        """
+        디스크 캐시에서 실제 파일과 맞지 않는(삭제, 변경된) 항목을 제거
+        """
+        from src.utils.probe_cache import ProbeCache
+
+        cache: ProbeCache = ProbeCache()
+        try: print(f"[INFO] 캐시에서 {cache.validate()}개의 항목을 제거했습니다.")
+        finally: cache.close()
+
+
+    def clear_probe_cache(self, *, only_root_dir: bool = True) -> None:
+        """
+        디스크 캐시를 삭제. only_root_dir가 True면 현재 작업 경로 아래 항목만 삭제
+        다음 분석 시 모든 파일을 다시 분석함
+        """
+        from src.utils.probe_cache import ProbeCache
+
+        cache: ProbeCache = ProbeCache()
+        try: print(f"[INFO] 캐시에서 {cache.clear(self._root_dir if only_root_dir else None)}개의 항목을 삭제했습니다.")
+        finally: cache.close()
+
+
     def set_filename_max_length(self, max_length: int) -> None:
         """
         파일 이름이 출력되는 열의 너비를 지정
@@ -115,6 +229,18 @@ class VideoClassifier:
         self._filename_maxlen = max_length
 
 
+    def watch(self, flag: bool = True) -> None:
+        """
+        작업 경로 감시 모드 설정
+        감시 중에는 새로 복사/다운로드된 파일을 쓰기가 끝난 뒤 백그라운드에서 분석하고, 삭제된 파일은 테이블에서 제거
+        테이블 캐시가 없으면 classify나 print 호출 시점에 감시 시작
+        """
+        self._watch_flag = flag
+        if not self._cache: return
+        if flag: self._cache.start_watch()
+        else: self._cache.stop_watch()
+
+
     def include_keyframe_interval(self, flag: bool = True) -> None:
         """
         영상 분석시 키프레임 정보 포함 여부 설정 (플래그만 저장)
@@ -124,6 +250,30 @@ class VideoClassifier:
         self._keyframe_flag = flag
 
 
+    def instrument(self, flag: bool = True) -> None:
+        """
+        단계별 시간과 파일별 분석 시간 측정 여부 설정 (METRICS_ENABLED 설정보다 우선)
+        측정 결과는 metrics_report로 출력하거나 save_metrics로 저장
+        """
+        metrics.enable(flag)
+
+
+    def metrics_report(self, top_n: Optional[int] = None) -> None:
+        """
+        단계별 시간과 가장 오래 걸린 파일 top_n개(None이면 METRICS_TOP_N개) 출력
+        """
+        metrics.report(top_n)
+
+
+    def save_metrics(self, path: str, *, reset: bool = False) -> None:
+        """
+        측정 결과를 path에 저장 (.prom, .txt는 Prometheus text 형식, 그 외는 json)
+        reset이 True면 저장 후 측정 결과 초기화
+        """
+        metrics.save(path)
+        if reset: metrics.reset()
+
+
     def pseudo_classify_mode(self, flag: bool = True) -> None:
         """
         실제 분류는 안 되고 분류 결과만 얻는 모드 설정
@@ -139,55 +289,229 @@ class VideoClassifier:
         self.exception_rules.append(pred)
 
 
-    def classify(self, *, by: Pred) -> None:
+    def classify(self, *, by: Pred | Sequence[Pred]) -> None:
         # TODO: 가분류 상태, 분류 상태에 대한 처리, classify만의 출력을 생성해야 됨
         """
         지정한 경로의 영상파일들을 조건에 따라 분류
         Pred.ALL은 동작하지 않음
+        by에 기준 목록을 지정하면 앞 기준의 분류 폴더 아래에 다음 기준의 분류 폴더를 두는 중첩 경로로 한 번에 분류
+        (예: [Pred.KEYFRAME, Pred.BITRATE, Pred.RATIO] → '_키프레임조정/16-9', 파일은 최종 폴더로 한 번만 이동)
         """
-        from src.utils.filesys import move_file, file_exists_in
-        if by == Pred.ALL: raise ValueError("[WARN] Pred.ALL 기준으로 분류할 수 없습니다.")
+        preds: Tuple[Pred, ...] = (by,) if isinstance(by, Pred) else tuple(by)
+        if not preds: raise ValueError("[WARN] 분류 기준이 지정되지 않았습니다.")
+        if Pred.ALL in preds: raise ValueError("[WARN] Pred.ALL 기준으로 분류할 수 없습니다.")
+        if len(set(preds)) != len(preds): raise ValueError("[WARN] 같은 분류 기준을 여러 번 지정할 수 없습니다.")
 
         self._prepare_cache()
         assert self._cache is not None, "Table cache was empty."
+        self._warn_interrupted_classify()
+
+        # 감시 모드의 백그라운드 갱신과 겹치지 않도록 잠금
+        with self._cache.lock:
+            with metrics.phase("classify.compute"):
+                classified_dirnames: List[Optional[str]] = self._classified_dirnames(preds)
+            move_targets: List[Tuple[VideoProps, str]] = [] # 실제로 이동할 (비디오, 분류 폴더)
+            for vid, classified_dirname in zip(self._cache.data, classified_dirnames):
+                if not self._cache.file_in_root(vid.filename): 
+                    continue
+                if self._pseudo_classifiy_mode and vid.moved_dirname is not None:
+                    continue
+                if any(rule(vid) for rule in self.exception_rules): 
+                    continue
+                
+                if self._pseudo_classifiy_mode: vid.moved_dirname = classified_dirname
+                elif classified_dirname: move_targets.append((vid, classified_dirname))
+
+            if move_targets: self._move_classified(move_targets)
+
+
+    def _classified_dirnames(self, preds: Tuple[Pred, ...]) -> List[Optional[str]]:
+        """
+        기준별 분류 폴더를 전체 행에 대해 배열 연산으로 한 번에 계산하고, 기준 순서대로 이어 붙여 최종 분류 폴더를 구함 (행 순서대로)
+        계산 결과는 테이블 캐시의 파생 열로 보관해, 행이나 관련 설정값이 바뀌기 전까지 재사용
+        """
+        import os
+        assert self._cache is not None, "Table cache was empty."
 
-        # 분류 전략 선택
-        classify_strategy: Callable[[VideoProps], Optional[str]] = {
-            Pred.RATIO: VideoClassifierByRatio.classified_dirname,
-            Pred.BITRATE: VideoClassifierByBitrate.classified_dirname,
-            Pred.KEYFRAME: VideoClassifierByKeyframe.classified_dirname
-        }[by]
+        columns: VideoPropColumns = self._cache.columns
+        per_pred: List[List[Optional[str]]] = []
+        for pred in preds:
+            strategy: Type[VideoClassifierByRatio | VideoClassifierByBitrate | VideoClassifierByKeyframe] = VideoClassifier._STRATEGIES[pred]
+            per_pred.append(self._cache.derived.memo(
+                ("classified_dirnames", pred), strategy.config_key(), lambda strategy=strategy: strategy.classified_dirnames(columns)
+            ))
+        if len(per_pred) == 1: return per_pred[0]
+
+        def combine() -> List[Optional[str]]:
+            joined: Dict[Tuple[Optional[str], ...], Optional[str]] = {} # 같은 조합은 같은 문자열 공유
+            result: List[Optional[str]] = []
+            for parts in zip(*per_pred):
+                if parts not in joined:
+                    names: List[str] = [d for d in parts if d]
+                    joined[parts] = os.path.join(*names) if names else None
+                result.append(joined[parts])
+            return result
+        return self._cache.derived.memo(
+            ("classified_dirnames", preds), tuple(VideoClassifier._STRATEGIES[pred].config_key() for pred in preds), combine
+        )
+
+
+    def _move_classified(self, move_targets: List[Tuple[VideoProps, str]]) -> None:
+        """
+        분류 결과대로 파일을 한 번에 이동하고, 이동에 성공한 비디오만 moved_dirname 갱신
+        이동 내역은 작업 경로의 기록 파일에 남음
+        """
+        from src.utils.file_mover import FileMover
+        assert self._cache is not None, "Table cache was empty."
+
+        mover: FileMover = FileMover(self._cache.root_dir)
+        moves: List[PlannedMove] = mover.plan((vid.filename, dirname) for vid, dirname in move_targets)
+        with metrics.phase("classify.move"):
+            failed: List[Tuple[PlannedMove, OSError]] = mover.execute(moves)
+        for move, e in failed:
+            print(f"[WARN] 파일 이동 실패: {move.src} -> {move.dst} ({e})")
+
+        moved: Set[str] = {m.src for m in moves} - {m.src for m, _ in failed}
+        for vid, dirname in move_targets:
+            if vid.filename in moved: vid.moved_dirname = dirname
+        print(f"[INFO] 파일 {len(moved)}개를 분류했습니다." + (f" (실패 {len(failed)}개)" if failed else ""))
+
+
+    def _warn_interrupted_classify(self) -> None:
+        """
+        중단된 분류 작업이 기록에 남아 있으면 경고 출력
+        """
+        from src.utils.file_mover import FileMover
+        if FileMover(self._root_dir).interrupted_runs():
+            print("[WARN] 중단된 분류 작업이 있습니다. .resume_classify()로 마저 이동하거나 .rollback_classify()로 되돌릴 수 있습니다.")
+
+
+    def resume_classify(self) -> None:
+        """
+        중단된 분류 작업의 남은 파일 이동을 기록대로 마저 실행
+        """
+        from src.utils.file_mover import FileMover, JournalRun
+        mover: FileMover = FileMover(self._root_dir)
+        runs: List[JournalRun] = mover.interrupted_runs()
+        if not runs:
+            print("[INFO] 중단된 분류 작업이 없습니다.")
+            return
+
+        for run in runs:
+            for move, e in mover.resume(run):
+                print(f"[WARN] 파일 이동 실패: {move.src} -> {move.dst} ({e})")
+        print(f"[INFO] 중단된 분류 작업 {len(runs)}개를 재개했습니다.")
 
-        for vid in self._cache.data:
-            if not file_exists_in(self._cache.root_dir, vid.filename): 
-                continue
-            if self._pseudo_classifiy_mode and vid.moved_dirname is not None:
-                continue
-            if any(rule(vid) for rule in self.exception_rules): 
-                continue
-            
-            prev_moved_dirname: Optional[str] = vid.moved_dirname
-            vid.moved_dirname = classify_strategy(vid)
-            
-            if not self._pseudo_classifiy_mode:
-                if vid.moved_dirname: move_file(self._cache.root_dir, vid.filename, vid.moved_dirname)
-                else: vid.moved_dirname = prev_moved_dirname
 
+    def rollback_classify(self) -> None:
+        """
+        가장 최근의 분류 작업(중단된 작업 포함)을 기록대로 정확히 되돌림
+        해당 작업이 새로 만든 폴더 중 비어 있는 폴더는 삭제
+        """
+        from src.utils.file_mover import FileMover, JournalRun
+        mover: FileMover = FileMover(self._root_dir)
+        runs: List[JournalRun] = [run for run in mover.journal.read().values() if mover.active_moves(run)]
+        if not runs:
+            print("[INFO] 되돌릴 분류 작업이 없습니다.")
+            return
+
+        restored, failed = mover.rollback(runs[-1])
+        for move, e in failed:
+            print(f"[WARN] 파일 되돌리기 실패: {move.dst} -> {move.src} ({e})")
+        self._unmark_restored(restored)
+        print(f"[INFO] 파일 {len(restored)}개를 분류 전 위치로 되돌렸습니다.")
+
+
+    def _unmark_restored(self, restored: List[PlannedMove]) -> None:
+        """
+        원래 위치로 되돌린 파일의 테이블 캐시 분류 상태 초기화
+        """
+        import os
+        if not self._cache: return
+
+        prop_map: Dict[Tuple[Optional[str], str], VideoProps] = {
+            (prop.moved_dirname, os.path.basename(prop.filename)): prop for prop in self._cache.data
+        }
+        for move in restored:
+            if (prop := prop_map.get((os.path.dirname(move.dst), os.path.basename(move.dst)))) is not None:
+                prop.filename = move.src
+                prop.moved_dirname = None
+        self._cache.invalidate_rows() # 파일 이름이 바뀌었으므로 출력용 행을 다시 생성
 
-    def print(self, *, by: Pred, sanitize_emoji: bool, sort_key: Callable[[Dict[str, Any]], Tuple | list] | None = None) -> None:
+
+    def verify_manifest(self) -> bool:
+        """
+        분류 기록과 실제 파일 위치가 일치하는지 빠르게 확인 (파일마다 존재 여부만 확인)
+        일치하면 True 리턴
+        """
+        from src.utils.file_mover import FileMover, ManifestDrift
+
+        drift: ManifestDrift = FileMover(self._root_dir).verify()
+        print(f"[INFO] 분류 기록 확인: {drift.checked}개")
+        problems: List[Tuple[str, List[PlannedMove]]] = [
+            ("분류 폴더와 원래 위치 모두에 없음", drift.missing),
+            ("분류 기록 없이 원래 위치로 돌아감", drift.returned),
+            ("분류 폴더와 원래 위치 모두에 존재", drift.duplicated)
+        ]
+        for label, moves in problems:
+            if not moves: continue
+            print(f"[WARN] {label}: {len(moves)}개")
+            for move in moves[:10]: print(f"    {move.src} -> {move.dst}")
+            if len(moves) > 10: print(f"    ... 외 {len(moves) - 10}개")
+        return drift.ok
+
+
+    def print(self, *, 
+              by: Pred, 
+              sanitize_emoji: bool, 
+              sort_key: Callable[[Dict[str, Any]], Tuple | list] | None = None,
+              sort_by: Optional[SortSpec] = None,
+              limit: Optional[int] = None,
+              offset: int = 0,
+              summary_only: bool = False) -> None:
         """
         지정한 경로의 영상파일들을 조건에 따라 출력
+        sort_by: (열 이름, desc/asc) 목록으로 여러 열 기준 정렬 (예: [(t["b-rate 비율"], desc), (WINDOWS_NAME_ORDER, asc)])
+                 열마다 안정 정렬을 반복하므로 내림차순 문자열 변환이 필요 없고, 이름 정렬 키는 테이블 캐시에서 재사용
+        limit/offset: 분류 폴더별로 정렬 후 offset개를 건너뛰고 limit개만 출력 (전체 정렬 없이 상위 N개 선택)
+        summary_only: 분류 폴더별 개수만 출력
         """
         
+        if sort_key is not None and sort_by is not None:
+            raise ValueError("[WARN] sort_key와 sort_by는 함께 지정할 수 없습니다.")
+
         self._prepare_cache()
         assert self._cache is not None, "video_prop_table was None."
+        options: PrintOptions = PrintOptions(limit, offset, summary_only, self._sort_passes(self._cache, sort_by or ()))
 
         {
             Pred.RATIO: VideoClassifierByRatio.print,
             Pred.BITRATE: VideoClassifierByBitrate.print,
             Pred.KEYFRAME: VideoClassifierByKeyframe.print,
             Pred.ALL: self._print_all_video_prop_table
-        }[by](self._cache, sort_key, self._filename_maxlen, sanitize_emoji)
+        }[by](self._cache, sort_key, self._filename_maxlen, sanitize_emoji, options)
+
+
+    @staticmethod
+    def _sort_passes(cache: TableCache, sort_by: SortSpec) -> Tuple[SortPass, ...]:
+        """
+        sort_by를 TablePrinter의 (정렬 키 함수, 내림차순 여부) 목록으로 변환
+        열 이름은 t의 키(예: "b-rate 비율") 또는 열 머리글(예: t["b-rate 비율"]) 모두 허용
+        """
+        from operator import itemgetter
+        from src.utils.columnar import ROW_GETTERS
+        from src.utils.table_printer import NAME_COL
+
+        passes: List[SortPass] = []
+        for column, descending in sort_by:
+            if column == WINDOWS_NAME_ORDER:
+                passes.append((lambda row: cache.natural_key(row[NAME_COL]), descending))
+                continue
+            header: str = t.get(column, column)
+            if header not in ROW_GETTERS:
+                raise ValueError(f"[WARN] 정렬할 수 없는 열입니다: {column!r}")
+            passes.append((itemgetter(header), descending))
+        return tuple(passes)
     
 
     def _print_all_video_prop_table(
@@ -195,56 +519,61 @@ class VideoClassifier:
             cache: TableCache,
             sort_key: Callable[[Dict[str, Any]], Tuple | list] | None, 
             filename_maxlen: int,
-            sanitize_emoji: bool) -> None:
+            sanitize_emoji: bool,
+            options: PrintOptions = PrintOptions()) -> None:
         """
         video_prop_table의 모든 요소 출력
         """
-        from collections import defaultdict
         from src.utils.table_printer import TablePrinter
-        from src.utils import bitrate_utils as bu
-        from src.utils.filesys import file_exists_in
-
-        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = defaultdict(list)
-        for vid in cache.data:
-            pseudo_classified: bool = vid.moved_dirname is not None and file_exists_in(cache.root_dir, vid.filename)
-            tables[(vid.moved_dirname or "", pseudo_classified)].append({
-                "\n이름": vid.filename,
-                "\nW": vid.width,
-                "\nH": vid.height,
-                "\n│": "│",
-                "회전\n각도": vid.rotate_type,
-                "\n비율": vid.ratio.real_value,
-                "비율\n타입": vid.ratio.type,
-                "비율\n차이": vid.ratio.diff,
-                "\u200b\n│": "│",
-                "\nb-rate": (bitrate := vid.vid_kbps),
-                "최적\nW": int((opt_r := bu.optimal_resolution_ratio(vid.width, vid.height)) * vid.width),
-                "최적\nH": int(opt_r * vid.height),
-                "최적\nb-rate": (optimal_val := bu.optimal_bitrate(vid.width, vid.height)),
-                "b-rate\n비율": bitrate / optimal_val,
-                "\u200b\u200b\n│": "│",
-                "키프레임\n간격": vid.keyframe_interval or -1.0
-            })
-        
-        sorted_items = sorted(tables.items(), key=lambda i: (bool(i[0][0]), i[0][1], i[0][0]))
-        for (dirname, pseudo_classified), table in sorted_items:
-            if not dirname:
-                print(f"\n\n[ 분류되지 않은 비디오 목록 - 총 {len(table)}개 ]")
-            elif pseudo_classified:
-                print(f"\n\n[ '{dirname}' 경로로 모의 분류된 비디오 목록 (실제로 분류되지 않음) - 총 {len(table)}개 ]")
-            else:
-                print(f"\n\n[ '{dirname}' 경로로 분류된 비디오 목록 - 총 {len(table)}개 ]")
-            TablePrinter.print(table, sort_key, filename_maxlen, sanitize_emoji)
+        tables: Dict[Tuple[str, bool], List[Dict[str, Any]]] = cache.grouped_rows(self._ALL_COLUMNS)
+        TablePrinter.print_groups(tables, sort_key, filename_maxlen, sanitize_emoji, options)
 
         
     def unclassify_files(self, *, unmark_pseudo_classified_only: bool = False) -> None:
         """
         분류 또는 가분류 되어 있는 상태를 다시 분류되지 않은 상태로 만듦
+        분류 기록이 있으면 기록된 파일만 원래 위치로 되돌리고 분류 작업이 만든 폴더만 삭제
+        분류 기록이 없으면 캐시가 있는 경로에서만 모든 하위 폴더를 탐색하는 이전 방식으로 동작
+        """
+        from src.utils.filesys import file_exists_in
+        from src.utils.file_mover import FileMover
+
+        # 가분류 상태만 제거
+        if unmark_pseudo_classified_only:
+            if not self._cache:
+                print(f"[WARN] \"{self._root_dir}\" 경로는 분류 또는 가분류 작업을 수행한 경로가 아닙니다.")
+                return
+            for prop in self._cache.data:
+                if file_exists_in(self._root_dir, prop.filename):
+                    prop.moved_dirname = None
+            return
+
+        mover: FileMover = FileMover(self._root_dir)
+        if not mover.journal.read():
+            self._unclassify_by_walk()
+            return
+
+        # 가분류 상태의 논리적 초기화 (원래 위치에 있는 파일)
+        if self._cache:
+            for prop in self._cache.data:
+                if file_exists_in(self._root_dir, prop.filename): prop.moved_dirname = None
+
+        restored, failed = mover.restore_all()
+        for move, e in failed:
+            print(f"[WARN] 파일 되돌리기 실패: {move.dst} -> {move.src} ({e})")
+        self._unmark_restored(restored)
+        if not failed: mover.discard_settled_journal()
+        print(f"[INFO] 파일 {len(restored)}개를 분류 전 위치로 되돌렸습니다." + (f" (실패 {len(failed)}개)" if failed else ""))
+
+
+    def _unclassify_by_walk(self) -> None:
+        """
+        분류 기록이 없는 경로의 분류 해제 (모든 하위 폴더의 파일을 작업 경로로 이동)
         캐시가 없는 곳의 작동은 허용되지 않음
         """
         import os
         import shutil
-        from src.utils.filesys import get_dirnames, file_exists_in
+        from src.utils.filesys import file_exists_in
 
         if not self._cache:
             print(f"[WARN] \"{self._root_dir}\" 경로는 분류 또는 가분류 작업을 수행한 경로가 아닙니다.")
@@ -253,13 +582,6 @@ class VideoClassifier:
         # 빠른 검색 위한 매핑
         prop_map: Dict[str, VideoProps] = {prop.filename: prop for prop in self._cache.data}
 
-        # 가분류 상태만 제거
-        if unmark_pseudo_classified_only:
-            for prop in self._cache.data:
-                if file_exists_in(self._root_dir, prop.filename):
-                    prop.moved_dirname = None
-            return
-
         # 가분류 상태의 논리적 초기화를 위해 moved_dirname 초기화
         for prop in self._cache.data: prop.moved_dirname = None
 
@@ -284,8 +606,8 @@ class VideoClassifier:
                     print(f"[Error] 파일 이동 실패: {file_path} -> {target_path} ({e})")
                     if file in prop_map: prop_map[file].moved_dirname = current_dirname
 
-        # 빈 폴더 삭제(혹시나 동일 이름 충돌이 생긴경우 디렉터리 유지해야 됨)
-        for dirname in get_dirnames(root_dir):
-            dir_path: str = os.path.join(root_dir, dirname)
-            try: os.rmdir(dir_path)
+        # 빈 폴더 삭제(혹시나 동일 이름 충돌이 생긴경우 디렉터리 유지해야 됨), 중첩 분류 폴더도 지우도록 안쪽부터 삭제
+        for current_workdir, _, _ in os.walk(root_dir, topdown=False):
+            if current_workdir == root_dir: continue
+            try: os.rmdir(current_workdir)
             except: pass
\ No newline at end of file
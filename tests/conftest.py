@@ -0,0 +1,62 @@
+import os
+import shutil
+import subprocess
+from typing import Callable, List, Optional
+
+import pytest
+
+from src.utils.load_env import config
+
+# 테스트 중 .env 값 대신 사용할 설정 (환경 변수가 .env보다 우선)
+_TEST_CONFIGS: dict[str, str] = {
+    "PROBE_CACHE_ENABLED": "0",
+    "NATIVE_PROBE_ENABLED": "1",
+    "PROBE_ENGINE": "process",
+    "SCAN_MAX_DEPTH": "0",
+    "SCAN_INCLUDE_GLOBS": "",
+    "SCAN_EXCLUDE_GLOBS": "",
+    "METRICS_ENABLED": "0",
+    "WORKER_POOL_SIZE": "2",
+}
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg가 필요함")
+requires_ffprobe = pytest.mark.skipif(shutil.which("ffprobe") is None, reason="ffprobe가 필요함")
+
+
+@pytest.fixture
+def set_config(monkeypatch: pytest.MonkeyPatch, tmp_path) -> Callable[..., None]:
+    """
+    설정 값을 환경 변수로 덮어쓰고 바로 반영하는 함수 (캐시/큐 DB는 테스트 임시 경로 사용)
+    """
+    def apply(**values: str) -> None:
+        for key, value in values.items(): monkeypatch.setenv(key, value)
+        config(force_check=True)
+
+    apply(
+        **_TEST_CONFIGS,
+        PROBE_CACHE_PATH=str(tmp_path / "probe_cache.sqlite3"),
+        WORK_QUEUE_PATH=str(tmp_path / "work_queue.sqlite3")
+    )
+    yield apply
+    monkeypatch.undo()
+    config(force_check=True)
+
+
+def make_video(path: str,
+               size: str = "320x240",
+               rate: int = 30,
+               seconds: float = 4,
+               gop: int = 30,
+               audio: bool = True,
+               output_args: Optional[List[str]] = None) -> str:
+    """
+    ffmpeg로 고정 GOP(gop 프레임마다 키프레임)의 짧은 테스트 영상 생성
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    args: List[str] = ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", f"testsrc=size={size}:rate={rate}"]
+    if audio: args += ["-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100"]
+    args += ["-t", str(seconds), "-c:v", "libx264", "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0", "-pix_fmt", "yuv420p"]
+    if audio: args += ["-c:a", "aac"]
+    args += [*(output_args or []), path]
+    subprocess.run(args, check=True)
+    return path
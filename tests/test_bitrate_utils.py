@@ -0,0 +1,13 @@
+import warnings
+
+import numpy as np
+
+from src.utils.bitrate_utils import optimal_resolution_ratio_array
+
+
+def test_zero_sized_row_does_not_warn(set_config) -> None:
+    set_config(BASE_RESOLUTION_WIDTH="1280", BASE_RESOLUTION_HEIGHT="720")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        ratio = optimal_resolution_ratio_array(np.array([640, 0]), np.array([360, 0]))
+    assert ratio[0] == 2.0 and np.isinf(ratio[1])
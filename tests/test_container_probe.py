@@ -0,0 +1,128 @@
+import math
+import os
+import re
+import subprocess
+from typing import Dict, List, Tuple
+
+import pytest
+
+from src.utils.container_probe import native_gop_stats, probe_container, read_keyframe_times
+from src.utils.video_prop import VideoProps, _ffprobe_json, _video_props_from_probe
+from tests.conftest import make_video, requires_ffmpeg, requires_ffprobe
+
+pytestmark = requires_ffmpeg
+
+_IRREGULAR_KEYFRAMES: str = "0,1,3,4" # 키프레임 간격 1, 2, 1초 (마지막 GOP는 파일 끝까지 1초)
+
+
+@pytest.fixture(scope="module")
+def media(tmp_path_factory) -> Dict[str, str]:
+    """
+    파일 이름 → 경로, 모두 320x240
+    """
+    d = tmp_path_factory.mktemp("media")
+    base: str = make_video(str(d / "base.mp4"))
+    irregular: str = make_video(str(d / "irregular.mp4"), seconds=5, gop=300, audio=False,
+                                output_args=["-force_key_frames", _IRREGULAR_KEYFRAMES])
+    # 파일 이름 → (원본, 입력 옵션, 출력 옵션), 스트림 복사로 컨테이너/메타데이터만 바꿈
+    remuxed: Dict[str, Tuple[str, List[str], List[str]]] = {
+        "a.mov": (base, [], []),
+        "rot.mp4": (base, ["-display_rotation", "90"], []),
+        "no_bps.mkv": (base, [], []),
+        "bps.mkv": (base, [], ["-metadata:s:v:0", "BPS=123456", "-metadata:s:a:0", "BPS=64000"]),
+        "rot_bps.mkv": (base, ["-display_rotation", "90"], ["-metadata:s:v:0", "BPS=123456"]),
+        "irregular.mkv": (irregular, [], ["-metadata:s:v:0", "BPS=123456"]),
+    }
+    files: Dict[str, str] = {"a.mp4": base, "irregular.mp4": irregular}
+    for name, (src, in_args, out_args) in remuxed.items():
+        files[name] = str(d / name)
+        subprocess.run(["ffmpeg", "-v", "error", "-y", *in_args, "-i", src, "-c", "copy", *out_args, files[name]], check=True)
+    files["gop2.webm"] = make_video(str(d / "gop2.webm"), rate=25, seconds=6, gop=50, audio=False,
+                                    output_args=["-c:v", "libvpx-vp9", "-metadata:s:v:0", "BPS=200000"])
+    return files
+
+
+def _stream_kib(filepath: str, kind: str) -> float:
+    """
+    ffmpeg 스트림 복사 결과의 스트림 크기(KiB), 파서와 독립적인 비트레이트 기준값
+    """
+    proc = subprocess.run(["ffmpeg", "-v", "info", "-i", filepath, "-c", "copy", "-f", "null", "-"],
+                          stderr=subprocess.PIPE, text=True, check=True)
+    return float(re.findall(rf"{kind}:\s*(\d+)\s*(?:KiB|kB)", proc.stderr)[-1])
+
+
+def _native(filepath: str) -> VideoProps:
+    props = probe_container(filepath, os.path.basename(filepath))
+    assert props is not None
+    return props
+
+
+@pytest.mark.parametrize("name", ["a.mp4", "a.mov"])
+def test_mp4_header(media, name) -> None:
+    props: VideoProps = _native(media[name])
+    assert (props.width, props.height, props.rotate_type, props.fps, props.codec) == (320, 240, 0, 30.0, "h264")
+    assert props.ratio.type == "4-3"
+    assert props.duration == pytest.approx(4.0, abs=0.05)
+    assert props.bitrate_method == "stream"
+    for kbps, kind in ((props.vid_kbps, "video"), (props.aud_kbps, "audio")):
+        assert kbps == pytest.approx(_stream_kib(media[name], kind) * 1024 * 8 / 1000 / props.duration, rel=0.05)
+
+
+@pytest.mark.parametrize("name", ["rot.mp4", "rot_bps.mkv"])
+def test_rotation(media, name) -> None:
+    props: VideoProps = _native(media[name])
+    assert (props.width, props.height) == (320, 240)
+    assert abs(props.rotate_type) == 90
+    assert props.ratio.type == "3-4"
+
+
+def test_mkv_bps_tag(media) -> None:
+    props: VideoProps = _native(media["bps.mkv"])
+    assert (props.width, props.height, props.fps, props.codec) == (320, 240, 30.0, "h264")
+    assert (props.vid_kbps, props.aud_kbps, props.bitrate_method) == (123, 64, "tag")
+    assert props.duration == pytest.approx(4.0, abs=0.05)
+
+
+def test_webm_header(media) -> None:
+    props: VideoProps = _native(media["gop2.webm"])
+    assert (props.width, props.height, props.fps, props.codec) == (320, 240, 25.0, "vp9")
+    assert (props.vid_kbps, props.bitrate_method) == (200, "tag")
+
+
+def test_mkv_without_bps_tag_falls_back(media) -> None:
+    assert probe_container(media["no_bps.mkv"], "no_bps.mkv") is None
+
+
+def test_unsupported_file_falls_back(tmp_path) -> None:
+    (path := tmp_path / "notes.mp4").write_bytes(b"not a video at all")
+    assert probe_container(str(path), "notes.mp4") is None
+    assert read_keyframe_times(str(path)) is None
+
+
+@pytest.mark.parametrize("name", ["irregular.mp4", "irregular.mkv"])
+def test_native_gop_stats_irregular(media, name) -> None:
+    assert read_keyframe_times(media[name]) == pytest.approx([0.0, 1.0, 3.0, 4.0], abs=0.002)
+    stats = native_gop_stats(media[name], 5.0)
+    assert stats is not None
+    assert (stats.mean, stats.max, stats.p95) == pytest.approx((4 / 3, 2.0, 2.0), abs=0.002)
+
+
+@pytest.mark.parametrize("name, gop", [("a.mp4", 1.0), ("a.mov", 1.0), ("bps.mkv", 1.0), ("gop2.webm", 2.0)])
+def test_native_gop_stats_constant(media, name, gop) -> None:
+    stats = native_gop_stats(media[name], 4.0)
+    assert stats is not None
+    assert (stats.mean, stats.max, stats.p95) == pytest.approx((gop, gop, gop), abs=0.002)
+
+
+@requires_ffprobe
+@pytest.mark.parametrize("name", ["a.mp4", "a.mov", "rot.mp4", "bps.mkv", "rot_bps.mkv", "gop2.webm"])
+def test_matches_ffprobe(media, name) -> None:
+    native: VideoProps = _native(media[name])
+    probed: VideoProps = _video_props_from_probe(_ffprobe_json(media[name]), media[name], name)
+    assert (native.width, native.height, native.rotate_type, native.codec) == (probed.width, probed.height, probed.rotate_type, probed.codec)
+    assert native.fps == pytest.approx(probed.fps, rel=0.001)
+    assert native.duration == pytest.approx(probed.duration, abs=0.05)
+    assert native.ratio == probed.ratio
+    assert native.vid_kbps == pytest.approx(probed.vid_kbps, rel=0.02, abs=1)
+    assert native.aud_kbps == pytest.approx(probed.aud_kbps, rel=0.02, abs=1)
+    assert math.isclose(native.vid_size_MB, probed.vid_size_MB)
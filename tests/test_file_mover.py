@@ -0,0 +1,145 @@
+import os
+import shutil
+from typing import Callable, List, Set, Tuple
+
+import pytest
+
+from src.utils.file_mover import JOURNAL_FILENAME, FileMover, PlannedMove
+
+# (파일이름, 이동할 폴더), '4-3' 폴더는 작업 전부터 있던 폴더
+_TARGETS: List[Tuple[str, str]] = [
+    ("a.mp4", os.path.join("_키프레임조정", "16-9")),
+    ("b.mp4", "16-9"),
+    ("c.mp4", os.path.join("_키프레임조정", "16-9")),
+    (os.path.join("sub", "d.mp4"), "4-3"),
+]
+
+
+class _Interrupted(BaseException):
+    """
+    프로세스 강제 종료를 흉내 내는 예외 (OSError가 아니므로 이동 실패로 처리되지 않음)
+    """
+
+
+def _layout(root: str) -> Set[str]:
+    """
+    기록 파일을 제외한 작업 경로의 (폴더는 끝에 '/'를 붙인) 상대 경로 목록
+    """
+    found: Set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel: str = os.path.relpath(dirpath, root)
+        found.update(os.path.join(rel, d).removeprefix("./") + "/" for d in dirnames)
+        found.update(os.path.join(rel, f).removeprefix("./") for f in filenames if f != JOURNAL_FILENAME)
+    return found
+
+
+@pytest.fixture
+def root(set_config, tmp_path) -> str:
+    set_config(MOVE_RENAME_WORKERS="1", MOVE_COPY_WORKERS="1")
+    root_dir = tmp_path / "root"
+    for name in ("a.mp4", "b.mp4", "c.mp4", os.path.join("sub", "d.mp4"), os.path.join("4-3", "keep.mp4")):
+        os.makedirs(os.path.dirname(root_dir / name), exist_ok=True)
+        (root_dir / name).write_text(name)
+    return str(root_dir)
+
+
+def _classified_layout(root: str) -> Set[str]:
+    """
+    중단 없이 이동을 마친 경우의 작업 경로
+    """
+    expected_root: str = root + "_expected"
+    shutil.copytree(root, expected_root)
+    mover: FileMover = FileMover(expected_root)
+    assert mover.execute(mover.plan(_TARGETS)) == []
+    return _layout(expected_root)
+
+
+def _interrupt_at(monkeypatch: pytest.MonkeyPatch, stage: str) -> None:
+    """
+    stage 단계에서 중단되도록 설정
+    - plan: 이동 계획 기록 직후 (폴더 생성 전)
+    - dirs: 폴더 생성 직후 (이동 전)
+    - renames: 이름 변경 2개 완료 후 (완료 기록 전)
+    """
+    if stage == "plan":
+        def make_dirs(self, run_id: str, moves: List[PlannedMove]) -> None: raise _Interrupted()
+        monkeypatch.setattr(FileMover, "_make_dirs", make_dirs)
+    elif stage == "dirs":
+        def transfer(self, moves, reverse: bool): raise _Interrupted()
+        monkeypatch.setattr(FileMover, "_transfer", transfer)
+    else:
+        rename: Callable[[str, str], None] = os.rename
+        calls: List[int] = [0]
+
+        def interrupted_rename(src: str, dst: str) -> None:
+            calls[0] += 1
+            if calls[0] > 2: raise _Interrupted()
+            rename(src, dst)
+        monkeypatch.setattr(os, "rename", interrupted_rename)
+
+
+def _run_interrupted(root: str, monkeypatch: pytest.MonkeyPatch, stage: str) -> None:
+    mover: FileMover = FileMover(root)
+    moves: List[PlannedMove] = mover.plan(_TARGETS)
+    with monkeypatch.context() as m:
+        _interrupt_at(m, stage)
+        with pytest.raises(_Interrupted): mover.execute(moves)
+
+
+@pytest.mark.parametrize("stage", ["plan", "dirs", "renames"])
+def test_resume_completes_interrupted_run(root, monkeypatch, stage) -> None:
+    expected: Set[str] = _classified_layout(root)
+    _run_interrupted(root, monkeypatch, stage)
+
+    mover: FileMover = FileMover(root) # 재시작한 프로세스
+    runs = mover.interrupted_runs()
+    assert len(runs) == 1
+    assert mover.resume(runs[0]) == []
+    assert _layout(root) == expected
+    assert mover.interrupted_runs() == []
+    assert mover.verify().ok and mover.verify().checked == len(_TARGETS)
+
+
+@pytest.mark.parametrize("stage", ["plan", "dirs", "renames"])
+def test_rollback_restores_original_layout(root, monkeypatch, stage) -> None:
+    original: Set[str] = _layout(root)
+    _run_interrupted(root, monkeypatch, stage)
+    assert stage != "renames" or _layout(root) != original
+
+    mover: FileMover = FileMover(root)
+    (run,) = mover.interrupted_runs()
+    restored, failed = mover.rollback(run)
+    assert failed == []
+    assert len(restored) == (2 if stage == "renames" else 0)
+    assert _layout(root) == original
+    assert mover.interrupted_runs() == []
+    assert mover.discard_settled_journal()
+
+
+def test_rollback_after_resume_restores_original_layout(root, monkeypatch) -> None:
+    original: Set[str] = _layout(root)
+    _run_interrupted(root, monkeypatch, "renames")
+    mover: FileMover = FileMover(root)
+    mover.resume(mover.interrupted_runs()[0])
+
+    restored, failed = mover.restore_all()
+    assert (len(restored), failed) == (len(_TARGETS), [])
+    assert _layout(root) == original
+    assert mover.verify().checked == 0
+
+
+def test_verify_reports_drift(root) -> None:
+    mover: FileMover = FileMover(root)
+    moves: List[PlannedMove] = mover.plan(_TARGETS)
+    assert mover.execute(moves) == []
+    assert mover.verify().ok
+
+    returned, missing, duplicated = moves[0], moves[1], moves[2]
+    os.rename(os.path.join(root, returned.dst), os.path.join(root, returned.src))
+    os.remove(os.path.join(root, missing.dst))
+    shutil.copy(os.path.join(root, duplicated.dst), os.path.join(root, duplicated.src))
+
+    drift = mover.verify()
+    assert not drift.ok
+    assert drift.checked == len(_TARGETS)
+    assert (drift.returned, drift.missing, drift.duplicated) == ([returned], [missing], [duplicated])
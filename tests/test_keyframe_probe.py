@@ -0,0 +1,60 @@
+from typing import Iterable, List, Sequence, Tuple
+
+import pytest
+
+from src.utils.keyframe_probe import GopProfiler, GopStats, gop_probe_args, profile_windows
+
+
+def _packets(start: float, end: float, keyframes: Iterable[float], fps: int = 10, size: int = 100) -> List[str]:
+    """
+    start~end 구간의 ffprobe 패킷 출력 (pts_time,size,flags)
+    """
+    marked = {round(k * fps) for k in keyframes}
+    return [f"{i / fps:.6f},{size},{'K__' if i in marked else '___'}" for i in range(round(start * fps), round(end * fps))]
+
+
+def _profile(windows: Sequence[Tuple[float, float]], lines: List[str], budget_bytes: int = 1 << 30) -> Tuple[GopStats, bool]:
+    profiler = GopProfiler(windows, budget_bytes)
+    for line in lines:
+        if profiler.feed(line): break
+    return profiler.result(), profiler.exhausted
+
+
+def test_probe_args_read_all_windows_in_one_process() -> None:
+    args = gop_probe_args("a.mp4", ((0.0, 10.0), (55.0, 10.0)))
+    assert args[args.index("-read_intervals") + 1] == "0.0%+10.0,55.0%+10.0"
+
+
+def test_profile_windows() -> None:
+    assert profile_windows(120, 3, 10) == ((0.0, 10), (55.0, 10), (110.0, 10))
+    assert profile_windows(20, 3, 10) == ((0.0, 20),)
+    assert profile_windows(0, 3, 10) == ((0.0, 10),)
+
+
+def test_windows_split_on_pts_jump() -> None:
+    # 구간 경계를 넘는 간격(8→56)은 세지 않음, ffprobe는 시작 전 키프레임부터 출력
+    windows = ((0.0, 10.0), (55.0, 10.0), (110.0, 10.0))
+    lines = (_packets(0, 10, [0, 2, 4, 6, 8])
+             + _packets(54, 65, [54, 56, 58, 60, 62, 64])
+             + _packets(108, 120, [108, 114]))
+    stats, _ = _profile(windows, lines)
+    assert stats.max == pytest.approx(6.0)
+    assert stats.p95 == pytest.approx(6.0)
+    assert stats.mean == pytest.approx((2 * 9 + 6) / 10) # 마지막 구간의 열린 간격(5.9)은 앞 간격보다 짧아 세지 않음
+
+
+def test_window_without_enough_keyframes_records_lower_bound() -> None:
+    windows = ((0.0, 10.0), (55.0, 10.0))
+    stats, _ = _profile(windows, _packets(0, 10, [3]) + _packets(55, 65, []))
+    assert (stats.mean, stats.max) == pytest.approx(((6.9 + 10.0) / 2, 10.0))
+
+
+def test_budget_stops_without_judging_partial_window() -> None:
+    windows = ((0.0, 10.0), (55.0, 10.0))
+    stats, exhausted = _profile(windows, _packets(0, 10, [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]) + _packets(55, 65, []), budget_bytes=100 * 110)
+    assert exhausted
+    assert (stats.mean, stats.max) == pytest.approx((1.0, 1.0))
+
+
+def test_no_packets_falls_back_to_window_length() -> None:
+    assert _profile(((0.0, 10.0),), [])[0] == GopStats.constant(10.0)
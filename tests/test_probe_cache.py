@@ -0,0 +1,35 @@
+import os
+
+from src.utils.probe_cache import ProbeCache, file_stat_key
+from src.utils.table_cache import TableCache
+from tests.conftest import make_video, requires_ffmpeg
+
+
+@requires_ffmpeg
+def test_get_keeps_relative_filename(set_config, tmp_path) -> None:
+    root = tmp_path / "root"
+    filepath: str = make_video(str(root / "sub" / "a.mp4"), audio=False)
+    set_config(SCAN_MAX_DEPTH="1")
+    first = TableCache(str(root), use_probe_cache=False).data[0]
+
+    cache: ProbeCache = ProbeCache(str(tmp_path / "cache.sqlite3"))
+    try:
+        cache.put(filepath, *file_stat_key(filepath)[1:], first)
+        cached = cache.get(*file_stat_key(filepath), os.path.join("sub", "a.mp4"))
+        assert cached is not None and cached.filename == os.path.join("sub", "a.mp4")
+        assert cache.get(*file_stat_key(filepath)).filename == "a.mp4"
+    finally:
+        cache.close()
+
+
+@requires_ffmpeg
+def test_nested_table_is_identical_when_served_from_cache(set_config, tmp_path) -> None:
+    root = tmp_path / "root"
+    make_video(str(root / "b.mp4"), audio=False)
+    make_video(str(root / "sub" / "a.mp4"), audio=False)
+    set_config(SCAN_MAX_DEPTH="1", PROBE_CACHE_ENABLED="1")
+
+    probed = sorted((vid.filename, vid.width, vid.vid_kbps) for vid in TableCache(str(root)).data)
+    cached = sorted((vid.filename, vid.width, vid.vid_kbps) for vid in TableCache(str(root)).data)
+    assert [f for f, _, _ in probed] == ["b.mp4", os.path.join("sub", "a.mp4")]
+    assert cached == probed
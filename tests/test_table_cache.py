@@ -0,0 +1,38 @@
+import os
+from typing import List, Tuple
+
+from src.utils.pred import Pred
+from src.video_classify.video_classifier import VideoClassifier
+from tests.conftest import make_video, requires_ffmpeg
+
+pytestmark = requires_ffmpeg
+
+
+def _rows(classifier: VideoClassifier) -> List[Tuple[str, str, int]]:
+    return sorted((vid.moved_dirname or "", vid.filename, vid.width) for vid in classifier.video_props())
+
+
+def test_new_root_file_does_not_replace_classified_file_with_same_name(set_config, tmp_path) -> None:
+    root = tmp_path / "root"
+    make_video(str(root / "v_1280x720.mp4"), size="1280x720", seconds=1, audio=False)
+    make_video(str(root / "w.mp4"), seconds=1, audio=False)
+    classifier: VideoClassifier = VideoClassifier(str(root))
+    classifier.classify(by=Pred.RATIO)
+    assert _rows(classifier) == [("16-9", "v_1280x720.mp4", 1280), ("4-3", "w.mp4", 320)]
+
+    # 분류된 파일과 이름만 같은 다른 파일을 작업 경로에 추가
+    make_video(str(root / "v_1280x720.mp4"), size="640x480", seconds=1, audio=False)
+    expected = [("", "v_1280x720.mp4", 640), ("16-9", "v_1280x720.mp4", 1280), ("4-3", "w.mp4", 320)]
+    assert _rows(classifier) == expected
+    assert _rows(classifier) == expected # 다시 갱신해도 그대로
+
+
+def test_pseudo_classified_rows_stay_in_root(set_config, tmp_path) -> None:
+    root = tmp_path / "root"
+    make_video(str(root / "v.mp4"), size="1280x720", seconds=1, audio=False)
+    classifier: VideoClassifier = VideoClassifier(str(root))
+    classifier.pseudo_classify_mode()
+    classifier.classify(by=Pred.RATIO)
+    assert _rows(classifier) == [("16-9", "v.mp4", 1280)]
+    assert os.path.isfile(root / "v.mp4") and not os.path.exists(root / "16-9")
+    assert _rows(classifier) == [("16-9", "v.mp4", 1280)]
@@ -0,0 +1,42 @@
+import os
+
+from src.utils.filesys import ScanOptions
+from src.utils.work_queue import WorkQueue, run_worker
+from tests.conftest import make_video, requires_ffmpeg
+
+
+@requires_ffmpeg
+def test_worker_stores_nested_results_served_from_cache(set_config, tmp_path) -> None:
+    root = tmp_path / "root"
+    make_video(str(root / "b.mp4"), audio=False)
+    make_video(str(root / "sub" / "a.mp4"), audio=False)
+    set_config(SCAN_MAX_DEPTH="1", PROBE_CACHE_ENABLED="1")
+    expected = ["b.mp4", os.path.join("sub", "a.mp4")]
+
+    for _ in range(2): # 두 번째 큐는 모든 결과를 디스크 캐시에서 읽음
+        queue: WorkQueue = WorkQueue(str(tmp_path / f"queue{_}.sqlite3"))
+        try:
+            assert queue.enqueue([str(root)], ScanOptions.from_env()) == 2
+            assert run_worker(queue) == 1
+            assert sorted(queue.results(str(root))) == expected
+            assert queue.enqueue([str(root)], ScanOptions.from_env()) == 0
+        finally:
+            queue.close()
+
+
+def test_complete_with_missing_result_fails_shard(set_config, tmp_path) -> None:
+    root = tmp_path / "root"
+    os.makedirs(root)
+    for name in ("a.mp4", "b.mp4"): (root / name).write_bytes(b"\0")
+    queue: WorkQueue = WorkQueue()
+    try:
+        queue.enqueue([str(root)], ScanOptions.from_env())
+        shard = queue.claim("test")
+        assert shard is not None and shard.filenames == ("a.mp4", "b.mp4")
+
+        assert not queue.complete(shard, {})
+        status = queue.status()
+        assert (status.done, status.failed, status.probed) == (0, 1, 0)
+        assert queue.enqueue([str(root)], ScanOptions.from_env()) == 2 # 결과가 없는 파일은 다시 큐에 추가
+    finally:
+        queue.close()
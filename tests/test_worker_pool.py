@@ -0,0 +1,39 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Tuple
+
+import pytest
+
+from src.utils.worker_pool import map_batched, shutdown_worker_pool
+
+
+def _square_or_crash(task: Tuple[int, str, int]) -> int:
+    """
+    x가 crash_at이면 marker 파일이 생기기 전까지(always면 항상) 워커 프로세스를 강제 종료
+    """
+    x, marker, crash_at = task
+    if x == crash_at and (marker == "always" or not os.path.exists(marker)):
+        if marker != "always": open(marker, "w").close()
+        os._exit(1)
+    return x * x
+
+
+@pytest.fixture
+def pool(set_config):
+    set_config(WORKER_POOL_SIZE="2", WORKER_POOL_CHUNKSIZE="1")
+    shutdown_worker_pool()
+    yield
+    shutdown_worker_pool()
+
+
+def test_worker_crash_mid_run_is_retried_once(pool, tmp_path) -> None:
+    marker: str = str(tmp_path / "crashed")
+    results = list(map_batched(_square_or_crash, [(x, marker, 5) for x in range(12)]))
+    assert results == [x * x for x in range(12)]
+    assert os.path.exists(marker)
+    assert list(map_batched(_square_or_crash, [(x, marker, -1) for x in range(3)])) == [0, 1, 4] # 새 풀로 계속 사용
+
+
+def test_repeated_crash_is_raised(pool) -> None:
+    with pytest.raises(BrokenProcessPool):
+        list(map_batched(_square_or_crash, [(x, "always", 5) for x in range(12)]))